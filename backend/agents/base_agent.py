@@ -27,21 +27,240 @@ DESIGN DECISIONS:
     - Graceful failure: If the LLM returns garbage, the agent doesn't crash
 """
 
+import asyncio
+import hashlib
+import logging
+import re
+import sqlite3
 import time
 from abc import ABC, abstractmethod
-from typing import Optional
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, ClassVar, Optional, Union
+
+from pydantic import TypeAdapter, ValidationError
 
 from backend.config import settings
-from backend.models.ollama_client import OllamaClient
+from backend.models.ollama_client import LLMClient
+from backend.utils.diff_chunker import ParsedDiff, estimate_tokens
 from backend.models.schemas import (
     AgentResult,
     AgentType,
+    FINDINGS_JSON_SCHEMA,
     AnalysisStatus,
     Finding,
     Severity,
+    dedupe_findings,
 )
 
 
+# Lazy %-style logging: messages are only formatted if the level is enabled,
+# and the handler (configured once in backend.api.main) decides where they go
+# instead of a blocking print() to stdout on every analysis.
+logger = logging.getLogger("prreview.agents")
+
+# Normalized severity string -> Severity, built once at import.
+# Every canonical value maps to itself, plus the aliases LLMs like to use.
+# A single dict.get() replaces the Severity(...) try/except per finding.
+_SEVERITY_LUT: dict[str, Severity] = {s.value: s for s in Severity} | {
+    "critical!": Severity.CRITICAL,
+    "severe": Severity.HIGH,
+    "moderate": Severity.MEDIUM,
+    "minor": Severity.LOW,
+    "info": Severity.LOW,
+    "informational": Severity.LOW,
+}
+
+# Validator for a whole findings list, built once at import. Pydantic v2
+# compiles the core schema here, so validating N findings is ONE call into
+# pydantic-core instead of N Finding(...) constructions.
+_FINDINGS_ADAPTER = TypeAdapter(list[Finding])
+
+# Ollama runtime options per model tier.
+# num_ctx is pinned below Ollama's default window: diffs rarely need more,
+# and a smaller context means a smaller KV cache to allocate and scan.
+# num_predict caps runaway generations (a findings list is never that long).
+# Agents sharing a model MUST share options - a different num_ctx makes
+# Ollama reload the model.
+BALANCED_MODEL_OPTIONS: dict = {"num_ctx": 4096, "num_predict": 1024, "num_batch": 512}
+FAST_MODEL_OPTIONS: dict = {"num_ctx": 2048, "num_predict": 512}
+
+# Agent class -> estimated tokens of its static prompt text (system prompt +
+# build_prompt without a diff). Filled lazily by BaseAgent._diff_token_budget.
+_STATIC_PROMPT_TOKENS: dict[type, int] = {}
+
+
+class _CallbackError(Exception):
+    """
+    An on_finding/on_progress callback raised (see BaseAgent.analyze).
+
+    That is the caller's failure, not the agent's - typically the WebSocket
+    client is gone - so analyze() re-raises the original error instead of
+    reporting a FAILED result and letting the other agents keep generating
+    for nobody.
+    """
+
+
+def _guard(callback: Optional[Callable[[Any], Awaitable[None]]]) -> Optional[Callable[[Any], Awaitable[None]]]:
+    """Wrap a callback so its errors surface as _CallbackError."""
+    if callback is None:
+        return None
+
+    async def guarded(value):
+        try:
+            await callback(value)
+        except Exception as e:
+            raise _CallbackError() from e
+
+    return guarded
+
+
+class ResponseCache:
+    """
+    Content-addressed TTL + LRU cache of parsed agent findings.
+
+    WHY?
+    CI re-runs, "retry" clicks and force-pushes of the same diff would
+    otherwise repeat a multi-second LLM call to get the same answer.
+    The key is a hash of everything that determines the answer:
+    (model, system prompt, prompt), so a hit is just a dict lookup.
+
+    Only successful analyses are stored - errors are always retried.
+
+    IN-FLIGHT COALESCING:
+    A cache only helps once the first answer is in. Identical requests that
+    arrive while it is still being generated - the same diff from a REST
+    call and a WebSocket session, or two CI jobs - would each send their
+    own request. Ollama cannot merge them (/api/generate takes one prompt),
+    so they are merged here instead: the first caller registers its
+    request (begin), later ones await its answer (join), and Ollama
+    generates it once. If the first caller fails or is cancelled, the
+    waiters send their own requests, as after any error.
+
+    PERSISTENCE (optional):
+    With a `path`, entries are also written to a SQLite file, so they
+    survive a restart of the server - or the next run of an integration
+    test against the same code - instead of starting cold every time.
+    Memory stays the first level; the file is only read on a memory miss,
+    and a hit there is promoted back into memory. Disk entries are stamped
+    with wall-clock time (monotonic time does not survive a restart) and
+    expire with the same TTL. The rows are a few KB of findings JSON, so
+    the blocking sqlite3 calls are short; the file is not size-bounded
+    beyond dropping expired rows on open.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600.0, path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[bytes, tuple[float, list[Finding]]] = OrderedDict()
+
+        # Key -> future of the identical request being generated right now
+        self._inflight: dict[bytes, asyncio.Future[list[Finding]]] = {}
+
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._db = sqlite3.connect(path)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key BLOB PRIMARY KEY, stored_at REAL NOT NULL, findings BLOB NOT NULL)"
+            )
+            self._db.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - ttl,))
+            self._db.commit()
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, prompt: str) -> bytes:
+        """16-byte BLAKE2b digest of the full request."""
+        return hashlib.blake2b(
+            f"{model}\0{system_prompt}\0{prompt}".encode(), digest_size=16
+        ).digest()
+
+    def get(self, key: bytes) -> Optional[list[Finding]]:
+        """Return cached findings, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return self._load(key)
+
+        stored_at, findings = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return list(findings)
+
+    def put(self, key: bytes, findings: list[Finding]):
+        """Store findings, evicting the least recently used entries if full."""
+        self._remember(key, findings)
+        if self._db is not None:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                (key, time.time(), _FINDINGS_ADAPTER.dump_json(findings)),
+            )
+            self._db.commit()
+
+    async def join(self, key: bytes) -> Optional[list[Finding]]:
+        """
+        Wait for an identical request that is already being generated.
+
+        Returns its findings, or None if there is none in flight or it
+        failed - then the caller sends its own request.
+        """
+        pending = self._inflight.get(key)
+        if pending is None:
+            return None
+        try:
+            # shield(): a waiter that is cancelled must not cancel the request
+            return list(await asyncio.shield(pending))
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise  # this caller was cancelled, not the request it awaited
+            return None
+
+    def begin(self, key: bytes) -> asyncio.Future:
+        """Register a request about to be sent, for identical ones to join."""
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        return future
+
+    def end(self, key: bytes, future: asyncio.Future, findings: Optional[list[Finding]]):
+        """Hand a request's findings to its waiters (None = it failed)."""
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.done():
+            if findings is None:
+                future.cancel()  # waiters fall back to their own request
+            else:
+                future.set_result(list(findings))
+
+    def _remember(self, key: bytes, findings: list[Finding]):
+        """Put findings in the in-memory LRU."""
+        self._entries[key] = (time.monotonic(), list(findings))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: bytes) -> Optional[list[Finding]]:
+        """Findings from the SQLite file on a memory miss (None without one)."""
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT stored_at, findings FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or time.time() - row[0] > self.ttl:
+            return None
+        findings = _FINDINGS_ADAPTER.validate_json(row[1])
+        self._remember(key, findings)
+        return list(findings)
+
+    def close(self):
+        """Close the SQLite file, if any."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class BaseAgent(ABC):
     """
     Abstract base class that all review agents inherit from.
@@ -50,15 +269,53 @@ class BaseAgent(ABC):
         1. agent_type: What kind of agent this is
         2. model: Which LLM to use
         3. system_prompt: The agent's expertise/personality
-        4. build_prompt(): How to construct the analysis prompt
-        5. parse_response(): How to interpret the LLM's response
+        4. STATIC_PREFIX: The analysis prompt before the diff (see build_prompt())
+
+    and optionally parse_response() (how to interpret the LLM's response)
+    and MODEL_OPTIONS (Ollama options such as num_ctx).
     """
 
+    # Instances only ever hold these two; agent_type, model, prompts and
+    # options are class-level. Slots make that explicit: no per-instance
+    # __dict__, and a typo like `agent.modle = ...` raises instead of
+    # silently adding an attribute to a long-lived agent.
+    __slots__ = ("client", "cache")
+
     # Subclasses MUST override these
     agent_type: AgentType
     model: str
 
-    def __init__(self, ollama_client: Optional[OllamaClient] = None):
+    # The analysis prompt around the diff (see build_prompt). Subclasses
+    # declare STATIC_PREFIX: their checklist, ending in an open code fence
+    # that STATIC_SUFFIX closes.
+    STATIC_PREFIX: ClassVar[str] = ""
+    STATIC_SUFFIX: ClassVar[str] = "\n```"
+
+    # Ollama runtime options sent with every request (see FAST_MODEL_OPTIONS)
+    MODEL_OPTIONS: ClassVar[dict] = {}
+
+    # Relative cost of one analysis (roughly: model size). The orchestrator
+    # launches the most expensive agents first - see _batch_by_model().
+    cost_weight: ClassVar[int] = 1
+
+    # Optional cheap pre-filter: if the diff has NO match, the agent has
+    # nothing to look for and skips the LLM call (see analyze()).
+    # None = always ask the LLM.
+    PREFILTER: ClassVar[Optional[re.Pattern]] = None
+
+    # agent_type.value ("security", ...), for log messages. Set once per
+    # subclass by __init_subclass__: Enum .value is a descriptor call, and
+    # the log calls below pass it as an argument whether or not the level
+    # is enabled.
+    agent_name: ClassVar[str] = ""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        agent_type = getattr(cls, "agent_type", None)
+        if agent_type is not None:
+            cls.agent_name = agent_type.value
+
+    def __init__(self, ollama_client: LLMClient, cache: Optional[ResponseCache] = None):
         """
         Initialize with an Ollama client.
 
@@ -68,8 +325,15 @@ class BaseAgent(ABC):
         1. Share one client across all agents (efficient)
         2. Inject a mock client in tests (testable)
         3. Configure the client once, use everywhere (clean)
+
+        The client is required: silently building one per agent would give
+        every agent its own connection pool that nobody ever closes.
+
+        The optional ResponseCache is shared the same way - the orchestrator
+        passes one cache to all of its agents.
         """
-        self.client = ollama_client or OllamaClient()
+        self.client = ollama_client
+        self.cache = cache
 
     @property
     @abstractmethod
@@ -87,16 +351,22 @@ class BaseAgent(ABC):
         """
         ...
 
-    @abstractmethod
     def build_prompt(self, diff_text: str) -> str:
         """
         Build the analysis prompt from the code diff.
 
-        Each agent asks different questions about the same code.
-        The Security agent asks "what vulnerabilities exist?"
-        The Performance agent asks "what's slow?"
+        Each agent asks different questions about the same code - the
+        Security agent "what vulnerabilities exist?", the Performance agent
+        "what's slow?" - so each declares its own STATIC_PREFIX: what to
+        look for (reduces hallucination) and severity guidelines (makes
+        ratings consistent). The output format lives in the system prompt.
+
+        Everything that never changes (system prompt, then STATIC_PREFIX)
+        comes BEFORE the diff, and the diff is the very tail, so the LLM
+        server can reuse its prefix KV cache for all of it. Both static
+        parts are built once, at import time.
         """
-        ...
+        return self.STATIC_PREFIX + diff_text + self.STATIC_SUFFIX
 
     def parse_response(self, data: dict) -> list[Finding]:
         """
@@ -116,68 +386,204 @@ class BaseAgent(ABC):
 
         This method normalizes all of that into clean Finding objects.
         """
-        findings = []
         raw_findings = data.get("findings", data.get("issues", []))
 
         if not isinstance(raw_findings, list):
-            return findings
-
-        for item in raw_findings:
-            if not isinstance(item, dict):
-                continue
-
-            try:
-                severity_str = item.get("severity", "medium").lower().strip()
-                try:
-                    severity = Severity(severity_str)
-                except ValueError:
-                    # LLM might say "critical!" or "HIGH" - normalize it
-                    severity_map = {
-                        "critical": Severity.CRITICAL,
-                        "high": Severity.HIGH,
-                        "medium": Severity.MEDIUM,
-                        "low": Severity.LOW,
-                        "info": Severity.LOW,
-                    }
-                    severity = severity_map.get(severity_str, Severity.MEDIUM)
-
-                # Normalize fields that LLMs sometimes return as lists
-                suggestion_raw = item.get("suggestion") or item.get("fix")
-                if isinstance(suggestion_raw, list):
-                    suggestion_raw = "; ".join(str(s) for s in suggestion_raw)
-
-                description_raw = item.get("description", "No description provided")
-                if isinstance(description_raw, list):
-                    description_raw = " ".join(str(s) for s in description_raw)
-
-                finding = Finding(
-                    agent=self.agent_type,
-                    severity=severity,
-                    title=item.get("title", "Untitled Finding"),
-                    description=description_raw,
-                    file_path=item.get("file_path") or item.get("file"),
-                    line_number=item.get("line_number") or item.get("line"),
-                    suggestion=suggestion_raw,
-                    confidence=float(item.get("confidence", 0.8)),
-                )
-                findings.append(finding)
+            return []
 
-            except Exception as e:
-                # If one finding fails to parse, skip it and continue
-                # Don't let one bad finding kill the entire analysis
-                print(f"[{self.agent_type.value}] Failed to parse finding: {e}")
-                continue
+        normalized = [n for n in map(self._normalize_finding, raw_findings) if n is not None]
+
+        try:
+            return _FINDINGS_ADAPTER.validate_python(normalized)
+        except ValidationError:
+            # One bad finding must not kill the others: validate one by one
+            return [f for f in map(self._validate_finding, normalized) if f is not None]
+
+    def _parse_finding(self, item) -> Optional[Finding]:
+        """
+        Normalize and validate ONE raw finding dict (None if unusable).
+
+        Used by the streaming path in analyze(), which parses each finding
+        as soon as the LLM finishes writing it.
+        """
+        normalized = self._normalize_finding(item)
+        return None if normalized is None else self._validate_finding(normalized)
+
+    def _validate_finding(self, normalized: dict) -> Optional[Finding]:
+        """Validate one normalized finding dict (None if invalid)."""
+        try:
+            return Finding.model_validate(normalized)
+        except ValidationError as e:
+            # Expected with small models - keep it out of INFO
+            logger.debug("[%s] failed to parse finding: %s", self.agent_name, e)
+            return None
+
+    def _normalize_finding(self, item) -> Optional[dict]:
+        """
+        Map ONE raw finding dict onto Finding's fields (None if unusable).
+
+        Shared by parse_response() and _parse_finding(). Validation happens
+        afterwards - for a whole list at once where possible.
+        """
+        if not isinstance(item, dict):
+            return None
+
+        try:
+            # LLM might say "critical!" or "HIGH" - normalize it. With the
+            # JSON schema (format=) the model nearly always writes a canonical
+            # value already, so try that as-is first: one dict probe, no
+            # str()/lower()/strip() copies for the common case.
+            raw_severity = item.get("severity", "medium")
+            severity = _SEVERITY_LUT.get(raw_severity) if isinstance(raw_severity, str) else None
+            if severity is None:
+                severity = _SEVERITY_LUT.get(str(raw_severity).lower().strip(), Severity.MEDIUM)
+
+            # Normalize fields that LLMs sometimes return as lists
+            suggestion_raw = item.get("suggestion") or item.get("fix")
+            if isinstance(suggestion_raw, list):
+                suggestion_raw = "; ".join(str(s) for s in suggestion_raw)
+
+            description_raw = item.get("description", "No description provided")
+            if isinstance(description_raw, list):
+                description_raw = " ".join(str(s) for s in description_raw)
+
+            return {
+                "agent": self.agent_type,
+                "severity": severity,
+                "title": item.get("title", "Untitled Finding"),
+                "description": description_raw,
+                "file_path": item.get("file_path") or item.get("file"),
+                "line_number": item.get("line_number") or item.get("line"),
+                "suggestion": suggestion_raw,
+                "confidence": float(item.get("confidence", 0.8)),
+            }
+
+        except Exception as e:
+            # If one finding fails to parse, skip it and continue
+            # Don't let one bad finding kill the entire analysis
+            logger.debug("[%s] failed to parse finding: %s", self.agent_name, e)
+            return None
+
+    async def _stream_findings(
+        self,
+        prompt: str,
+        on_finding: Optional[Callable[[Finding], Awaitable[None]]],
+        on_progress: Optional[Callable[[int], Awaitable[None]]] = None,
+    ) -> list[Finding]:
+        """Stream the LLM response, handing each finding to on_finding as it parses."""
+        findings = []
+
+        async for item in self.client.generate_json_stream(
+            model=self.model,
+            prompt=prompt,
+            system_prompt=self.system_prompt,
+            temperature=0.1,
+            options=self.MODEL_OPTIONS,
+            json_schema=FINDINGS_JSON_SCHEMA,
+            on_progress=on_progress,
+        ):
+            finding = self._parse_finding(item)
+            if finding is not None:
+                findings.append(finding)
+                if on_finding is not None:
+                    await on_finding(finding)
 
         return findings
 
-    async def analyze(self, diff_text: str) -> AgentResult:
+    def _diff_token_budget(self) -> int:
+        """
+        How many diff tokens fit in one request to this agent's model.
+
+        The context window (num_ctx, or settings.max_prompt_tokens if the
+        agent doesn't pin one) must hold the system prompt, the static
+        prompt text and the answer (num_predict) - the rest is for the diff.
+        Without this, Ollama silently truncates the prompt.
+        """
+        options = self.MODEL_OPTIONS
+        context = options.get("num_ctx", settings.max_prompt_tokens)
+
+        # The static prompt text never changes, so it is measured once per
+        # agent class, not on every analyze() call
+        overhead = _STATIC_PROMPT_TOKENS.get(type(self))
+        if overhead is None:
+            overhead = estimate_tokens(self.system_prompt) + estimate_tokens(self.build_prompt(""))
+            _STATIC_PROMPT_TOKENS[type(self)] = overhead
+
+        return max(context - options.get("num_predict", 0) - overhead, 256)
+
+    async def _analyze_chunk(
+        self,
+        diff_text: str,
+        on_finding: Optional[Callable[[Finding], Awaitable[None]]],
+        on_progress: Optional[Callable[[int], Awaitable[None]]] = None,
+    ) -> tuple[list[Finding], bool]:
+        """
+        One LLM round trip for one piece of diff: prompt, cache, call, parse.
+
+        Returns (findings, cache_hit). Errors propagate to analyze().
+        """
+        prompt = self.build_prompt(diff_text)
+
+        cache_key = None
+        inflight = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(self.model, self.system_prompt, prompt)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                if on_finding is not None:
+                    for finding in cached:
+                        await on_finding(finding)
+                return cached, True
+
+            # The same request already on its way to Ollama: share its answer
+            shared = await self.cache.join(cache_key)
+            if shared is not None:
+                if on_finding is not None:
+                    for finding in shared:
+                        await on_finding(finding)
+                return shared, False
+            inflight = self.cache.begin(cache_key)
+
+        findings = None
+        try:
+            if on_finding is None and on_progress is None:
+                result = await self.client.generate_json(
+                    model=self.model,
+                    prompt=prompt,
+                    system_prompt=self.system_prompt,
+                    temperature=0.1,  # Low temperature = consistent, factual analysis
+                    options=self.MODEL_OPTIONS,
+                    json_schema=FINDINGS_JSON_SCHEMA,
+                )
+                findings = self.parse_response(result["data"])
+            else:
+                findings = await self._stream_findings(prompt, on_finding, on_progress)
+
+            if cache_key is not None:
+                self.cache.put(cache_key, findings)
+        finally:
+            if inflight is not None:
+                self.cache.end(cache_key, inflight, findings)
+
+        return findings, False
+
+    async def analyze(
+        self,
+        diff: Union[str, ParsedDiff],
+        on_finding: Optional[Callable[[Finding], Awaitable[None]]] = None,
+        on_progress: Optional[Callable[[int], Awaitable[None]]] = None,
+    ) -> AgentResult:
         """
         Run the full analysis pipeline.
 
         This is the main entry point. The orchestrator calls this method
-        on each agent, passing the same diff_text. Each agent analyzes
+        on each agent, passing the same diff. Each agent analyzes
         it through its own lens and returns its findings.
 
+        `diff` is the diff text or, when several agents review it, one
+        shared ParsedDiff - the file split and chunk packing below are
+        then done once for all of them instead of once per agent.
+
         Pipeline:
             1. Build the prompt (agent-specific)
             2. Call the LLM with JSON output
@@ -185,6 +591,32 @@ class BaseAgent(ABC):
             4. Wrap everything in an AgentResult with metadata
             5. Handle any errors gracefully
 
+        If `on_finding` is given, the LLM response is STREAMED instead and
+        each Finding is passed to the callback as soon as the model finishes
+        writing it (e.g. to push it over a WebSocket) - the first finding
+        shows up long before the full response is done. `on_progress` also
+        streams, and is called with the number of tokens generated so far
+        every few dozen tokens - a sign of life while no finding is complete.
+        An error raised by either callback is not an agent failure: it is
+        re-raised as-is (e.g. the client disconnected), not reported as a
+        FAILED result.
+
+        Diffs that don't fit the agent's context budget (_diff_token_budget)
+        are split per file and packed into chunks that do (DiffSplitter.batch).
+        The chunks are reviewed in parallel - at most
+        settings.max_concurrent_chunks at a time - then their findings are
+        merged with dedupe_findings(). Each chunk is cached on its own.
+        The split and packing come from ParsedDiff.batch().
+
+        Agents with a PREFILTER regex first scan the diff for anything they
+        could report (microseconds); a diff without a single candidate gets
+        an empty COMPLETED result without an LLM call.
+
+        Results are built with model_construct(): every field comes from our
+        own code (Findings were already validated when parsed), so running
+        Pydantic validation again would only re-check the same data. The API
+        boundary still validates what comes in from outside.
+
         Returns AgentResult which includes:
             - The findings themselves
             - How long the analysis took
@@ -192,41 +624,86 @@ class BaseAgent(ABC):
             - Success/failure status
             - Error message if something went wrong
         """
-        start_time = time.time()
+        # perf_counter is monotonic (immune to NTP clock steps), unlike time.time
+        start_time = time.perf_counter()
+        on_finding, on_progress = _guard(on_finding), _guard(on_progress)
 
-        try:
-            prompt = self.build_prompt(diff_text)
+        parsed = diff if isinstance(diff, ParsedDiff) else ParsedDiff(diff)
+        diff_text = parsed.text
 
-            result = await self.client.generate_json(
-                model=self.model,
-                prompt=prompt,
-                system_prompt=self.system_prompt,
-                temperature=0.1,  # Low temperature = consistent, factual analysis
+        if self.PREFILTER is not None and self.PREFILTER.search(diff_text) is None:
+            logger.info("[%s] no candidate patterns, skipped", self.agent_name)
+            return AgentResult.model_construct(
+                agent=self.agent_type,
+                status=AnalysisStatus.COMPLETED,
+                findings=[],
+                execution_time=0.0,
+                model_used=self.model,
             )
 
-            findings = self.parse_response(result["data"])
-            elapsed = time.time() - start_time
+        try:
+            # Big diffs are reviewed in context-sized chunks (map), then merged (reduce)
+            chunks = []
+            budget = self._diff_token_budget()
+            if parsed.tokens > budget:
+                chunks = parsed.batch(budget)
+                # A single hunk, or a pasted snippet without diff headers,
+                # can't be cut further: Ollama will truncate that prompt
+                oversized = sum(1 for c in chunks if estimate_tokens(c) > budget)
+                if oversized:
+                    logger.warning("[%s] %d of %d chunks exceed the %d-token budget and will be truncated",
+                                   self.agent_name, oversized, len(chunks), budget)
+
+            if len(chunks) > 1:
+                semaphore = asyncio.Semaphore(settings.max_concurrent_chunks)
+
+                async def run_chunk(chunk: str) -> tuple[list[Finding], bool]:
+                    async with semaphore:
+                        return await self._analyze_chunk(chunk, on_finding, on_progress)
+
+                chunk_results = await asyncio.gather(*(run_chunk(c) for c in chunks))
+                findings = dedupe_findings(
+                    f for chunk_findings, _ in chunk_results for f in chunk_findings
+                )
+                cache_hit = all(hit for _, hit in chunk_results)
+            else:
+                findings, cache_hit = await self._analyze_chunk(diff_text, on_finding, on_progress)
 
-            print(f"[{self.agent_type.value}] Found {len(findings)} issues "
-                  f"in {elapsed:.1f}s using {self.model}")
+            if cache_hit:
+                logger.info("[%s] cache hit: %d issues", self.agent_name, len(findings))
+                return AgentResult.model_construct(
+                    agent=self.agent_type,
+                    status=AnalysisStatus.COMPLETED,
+                    findings=findings,
+                    execution_time=0.0,
+                    model_used=self.model,
+                    cache_hit=True,
+                )
 
-            return AgentResult(
+            elapsed = time.perf_counter() - start_time
+            logger.info("[%s] found %d issues in %.1fs (%s)",
+                        self.agent_name, len(findings), elapsed, self.model)
+
+            return AgentResult.model_construct(
                 agent=self.agent_type,
                 status=AnalysisStatus.COMPLETED,
                 findings=findings,
-                execution_time=round(elapsed, 2),
+                execution_time=int(elapsed * 100) / 100,  # truncate to 10ms
                 model_used=self.model,
             )
 
+        except _CallbackError as e:
+            raise e.__cause__ from None
+
         except Exception as e:
-            elapsed = time.time() - start_time
-            print(f"[{self.agent_type.value}] FAILED after {elapsed:.1f}s: {e}")
+            elapsed = time.perf_counter() - start_time
+            logger.warning("[%s] failed after %.1fs: %s", self.agent_name, elapsed, e)
 
-            return AgentResult(
+            return AgentResult.model_construct(
                 agent=self.agent_type,
                 status=AnalysisStatus.FAILED,
                 findings=[],
-                execution_time=round(elapsed, 2),
+                execution_time=int(elapsed * 100) / 100,  # truncate to 10ms
                 model_used=self.model,
                 error=str(e),
             )
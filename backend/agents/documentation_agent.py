@@ -16,7 +16,9 @@ WHY llama3.2:3b?
     keeps analysis fast.
 """
 
-from backend.agents.base_agent import BaseAgent
+from typing import ClassVar
+
+from backend.agents.base_agent import FAST_MODEL_OPTIONS, BaseAgent
 from backend.config import settings
 from backend.models.schemas import AgentType
 
@@ -27,12 +29,14 @@ class DocumentationAgent(BaseAgent):
     Uses the 3B model for fast pattern-based checks.
     """
 
+    __slots__ = ()
+
     agent_type = AgentType.DOCUMENTATION
-    model = settings.fast_model  # llama3.2:3b
+    model = settings.fast_model  # llama3.2:3b (Q5_K_M)
+    MODEL_OPTIONS = FAST_MODEL_OPTIONS
+    cost_weight = 3
 
-    @property
-    def system_prompt(self) -> str:
-        return """You are an expert technical writer and code documentation reviewer. Your job is to analyze code changes and identify missing or inadequate documentation.
+    system_prompt: ClassVar[str] = """You are an expert technical writer and code documentation reviewer. Your job is to analyze code changes and identify missing or inadequate documentation.
 
 You have deep knowledge of:
 - Python docstring conventions (Google, NumPy, Sphinx styles)
@@ -46,10 +50,24 @@ IMPORTANT RULES:
 - Focus on public interfaces, complex logic, and non-obvious behavior.
 - Be practical: suggest documentation that helps future developers.
 
-Always respond with valid JSON."""
+Always respond with a JSON object in this EXACT format:
+{
+    "findings": [
+        {
+            "title": "Short description of the documentation gap",
+            "severity": "critical|high|medium|low",
+            "description": "What documentation is missing and why it matters",
+            "file_path": "filename if identifiable",
+            "line_number": null,
+            "suggestion": "What the documentation should say or look like",
+            "confidence": 0.8
+        }
+    ]
+}
+
+If no documentation issues are found, return: {"findings": []}"""
 
-    def build_prompt(self, diff_text: str) -> str:
-        return f"""Analyze the following code for documentation gaps.
+    STATIC_PREFIX: ClassVar[str] = """Analyze the following code for documentation gaps.
 
 CHECK FOR THESE SPECIFIC ISSUES:
 1. **Missing docstrings**: Public functions or classes without any docstring
@@ -67,22 +85,4 @@ SEVERITY GUIDELINES:
 
 CODE TO ANALYZE:
 ```
-{diff_text}
-```
-
-Respond with a JSON object in this EXACT format:
-{{
-    "findings": [
-        {{
-            "title": "Short description of the documentation gap",
-            "severity": "critical|high|medium|low",
-            "description": "What documentation is missing and why it matters",
-            "file_path": "filename if identifiable",
-            "line_number": null,
-            "suggestion": "What the documentation should say or look like",
-            "confidence": 0.8
-        }}
-    ]
-}}
-
-If no documentation issues are found, return: {{"findings": []}}"""
+"""
@@ -45,32 +45,79 @@ DESIGN DECISIONS:
     - State is a TypedDict so LangGraph can track it
     - Each agent node wraps our existing BaseAgent.analyze() method
     - The aggregate node combines all AgentResults into one AnalysisResult
+
+WHEN DOES THE GRAPH PAY FOR ITSELF?
+    With a static set of 5 nodes and no conditional routing, the graph is
+    algorithmically just asyncio.gather() plus per-node scheduling, state
+    merging and list concatenation. So run() only goes through LangGraph
+    when a `triage` callable is configured (i.e. the conditional edge
+    actually picks different agents per diff). Otherwise it takes
+    run_fast(), a flat asyncio.gather() over the agents chosen by the
+    built-in _select_agents() rules.
 """
 
+import asyncio
+import logging
 import operator
+import re
 import time
-import uuid
-from typing import Annotated, Optional
+from secrets import token_hex
+from typing import Annotated, Any, Awaitable, Callable, Optional
 
 from langgraph.graph import END, START, StateGraph
 from langgraph.types import Send
 from typing_extensions import TypedDict
 
+from backend.agents.base_agent import BaseAgent, ResponseCache
 from backend.agents.security_agent import SecurityAgent
 from backend.agents.performance_agent import PerformanceAgent
 from backend.agents.testing_agent import TestingAgent
 from backend.agents.documentation_agent import DocumentationAgent
 from backend.agents.standards_agent import StandardsAgent
-from backend.models.ollama_client import OllamaClient
+from backend.config import settings
+from backend.models.ollama_client import LLMClient, OllamaClient
+from backend.utils.diff_chunker import DiffSplitter, ParsedDiff
 from backend.models.schemas import (
     AgentResult,
     AnalysisResult,
     AnalysisStatus,
-    Severity,
     PRData,
+    dedupe_findings,
+)
+
+
+# ============================================================
+# Triage Rules (compiled once at import)
+# ============================================================
+
+# File paths from unified diff headers: "--- a/path" / "+++ b/path"
+_DIFF_FILE_PATTERN = re.compile(r"^(?:\+\+\+|---) [ab]/(\S+)", re.MULTILINE)
+
+_DOC_EXTENSIONS = (".md", ".rst", ".txt")
+
+# test_foo.py, foo_test.py, foo_test.go, foo.test.ts, foo.spec.jsx, ...
+_TEST_FILE_PATTERN = re.compile(
+    r"(?:^|/)(?:test_[^/]*\.py|[^/]*_test\.(?:py|go)|[^/]*\.(?:test|spec)\.[jt]sx?)$"
+)
+
+# An added/removed line with actual content ("+++"/"---" headers excluded).
+# A unified diff without one (whitespace-only, binary, pure rename) has
+# nothing for an agent to review.
+_CHANGED_LINE_PATTERN = re.compile(r"^(?:\+(?!\+\+ )|-(?!-- ))[ \t]*\S", re.MULTILINE)
+
+# Anything that smells like credentials or auth always gets a security pass
+_SENSITIVE_PATTERN = re.compile(
+    r"password|passwd|secret|token|jwt|api[_-]?key|\bauth", re.IGNORECASE
 )
 
 
+logger = logging.getLogger("prreview.orchestrator")
+
+
+# on_event(event_type, agent_name, payload) - progress callback of run()
+EventCallback = Callable[[str, Optional[str], Any], Awaitable[None]]
+
+
 # ============================================================
 # State Definition
 # ============================================================
@@ -103,9 +150,15 @@ class PRReviewState(TypedDict):
 # ============================================================
 
 class AgentWorkerState(TypedDict):
-    """State passed to each individual agent worker."""
-    diff_text: str
-    agent_name: str
+    """
+    State passed to each individual agent worker.
+
+    `idx` is the agent's position in PRReviewOrchestrator._agent_tuple:
+    a tuple index instead of a name -> dict lookup per dispatched worker.
+    `diff` is the ParsedDiff shared by all workers of one run.
+    """
+    diff: ParsedDiff
+    idx: int
 
 
 # ============================================================
@@ -117,22 +170,67 @@ class PRReviewOrchestrator:
     LangGraph-based orchestrator that runs all agents in parallel.
 
     Usage:
-        orchestrator = PRReviewOrchestrator()
-        result = await orchestrator.run("def login(): ...")
+        async with PRReviewOrchestrator() as orchestrator:
+            result = await orchestrator.run("def login(): ...")
+
+    All agents share ONE OllamaClient (one HTTP connection pool), so the
+    parallel fan-out reuses keep-alive sockets instead of reconnecting.
+    If no client is passed in, the orchestrator creates and owns one, and
+    closes it in aclose() / on leaving the `async with` block.
+
+    Optionally pass `triage`, a callable that takes the diff text and returns
+    the names of the agents to run. Only then is the LangGraph workflow used.
     """
 
-    def __init__(self, ollama_client: Optional[OllamaClient] = None):
+    def __init__(
+        self,
+        ollama_client: Optional[LLMClient] = None,
+        triage: Optional[Callable[[str], list[str]]] = None,
+        cache: Optional[ResponseCache] = None,
+    ):
+        self._owns_client = ollama_client is None
         self.client = ollama_client or OllamaClient()
+        self.triage = triage
+
+        # One response cache shared by all agents: re-analyzing an identical
+        # diff (CI re-run, retry) is served without touching the LLM.
+        # Like the client, it can be passed in to share it between
+        # orchestrators.
+        self._owns_cache = cache is None
+        self.cache = cache or ResponseCache(
+            maxsize=settings.response_cache_size,
+            ttl=settings.response_cache_ttl,
+            path=settings.response_cache_path or None,
+        )
+
+        # Agent runs in flight at once, across ALL concurrent run() calls of
+        # this orchestrator (the API shares one). A single-GPU Ollama serves
+        # a few requests in parallel; past that they queue inside Ollama and
+        # every agent's latency stretches. Waiting here instead keeps the
+        # running agents fast. Tune settings.max_concurrent_agents (env
+        # MAX_CONCURRENT_AGENTS) to the server's OLLAMA_NUM_PARALLEL.
+        self._agent_slots = asyncio.Semaphore(settings.max_concurrent_agents)
 
-        # Initialize all agents with the shared client
+        # Initialize all agents with the shared client and cache
+        shared = {"ollama_client": self.client, "cache": self.cache}
         self.agents = {
-            "security": SecurityAgent(ollama_client=self.client),
-            "performance": PerformanceAgent(ollama_client=self.client),
-            "testing": TestingAgent(ollama_client=self.client),
-            "documentation": DocumentationAgent(ollama_client=self.client),
-            "standards": StandardsAgent(ollama_client=self.client),
+            "security": SecurityAgent(**shared),
+            "performance": PerformanceAgent(**shared),
+            "testing": TestingAgent(**shared),
+            "documentation": DocumentationAgent(**shared),
+            "standards": StandardsAgent(**shared),
         }
 
+        # Frozen views of self.agents for the per-request graph path
+        self._agent_order = tuple(self.agents.keys())
+        self._agent_tuple = tuple(self.agents.values())
+        self._agent_index = {name: i for i, name in enumerate(self._agent_order)}
+        # Launch order for the graph path: most expensive agents first
+        self._by_cost = tuple(sorted(
+            range(len(self._agent_tuple)),
+            key=lambda i: -self._agent_tuple[i].cost_weight,
+        ))
+
         # Build the LangGraph workflow
         self.graph = self._build_graph()
 
@@ -175,6 +273,94 @@ class PRReviewOrchestrator:
 
         return workflow.compile()
 
+    # ============================================================
+    # Triage
+    # ============================================================
+
+    def _select_agents(self, diff_text: str) -> list[str]:
+        """
+        Cheap pre-classifier: pick the agents worth an LLM call for this diff.
+
+        LLM inference dominates the cost of a review, so a few regexes over
+        the diff (microseconds) are worth it if they skip even one agent.
+
+        Rules:
+        - No file headers (raw pasted code)  -> run every agent
+        - Only .md/.rst/.txt files changed   -> documentation + standards
+        - Only test files changed            -> skip the testing agent
+        - .sql files or password/token/jwt   -> always include security
+        """
+        if not settings.enable_triage:
+            return list(self.agents)
+
+        files = set(_DIFF_FILE_PATTERN.findall(diff_text))
+        if not files:
+            return list(self.agents)
+
+        if all(f.lower().endswith(_DOC_EXTENSIONS) for f in files):
+            selected = {"documentation", "standards"}
+        else:
+            selected = set(self.agents)
+            if all(_TEST_FILE_PATTERN.search(f) for f in files):
+                selected.discard("testing")
+
+        if any(f.lower().endswith(".sql") for f in files) or _SENSITIVE_PATTERN.search(diff_text):
+            selected.add("security")
+
+        # Keep the canonical agent order
+        return [name for name in self.agents if name in selected]
+
+    @staticmethod
+    def _has_reviewable_content(diff_text: str) -> bool:
+        """
+        Is there anything for the agents to look at?
+
+        Raw code snippets only need to be non-blank. Unified diffs also need
+        at least one added/removed line with non-whitespace content, so a
+        whitespace-only, binary-only or rename-only PR costs a few string
+        checks instead of 5 LLM calls that all answer {"findings": []}.
+        """
+        if not diff_text or diff_text.isspace():
+            return False
+        is_diff = (
+            _DIFF_FILE_PATTERN.search(diff_text) is not None
+            or DiffSplitter.FILE_HEADER_PATTERN.search(diff_text) is not None
+        )
+        if not is_diff:
+            return True
+        return _CHANGED_LINE_PATTERN.search(diff_text) is not None
+
+    def _batch_by_model(self, names: list[str]) -> list[BaseAgent]:
+        """
+        Order agents so that agents sharing a model are submitted together.
+
+        WHY?
+        Ollama can serve concurrent requests for an already-loaded model in
+        parallel slots, but switching models means unloading/loading weights.
+        If requests arrive interleaved (7B, 3B, 7B, 3B) on a machine that only
+        fits one model, Ollama may swap models back and forth. Submitting each
+        model's requests as one contiguous batch keeps it to one load per model.
+
+        NOTE: sharing a KV prefix ACROSS agents (same diff, different question)
+        doesn't work with Ollama: each agent has its own system prompt, and the
+        system prompt comes first in the model's prompt template. Prefix reuse
+        happens per agent instead (static instructions before the diff).
+
+        Batches are ordered by cost_weight, heaviest first: wall time is the
+        slowest agent's time, so the 7B agents must start at t=0 and the
+        cheap 3B agents run in their shadow. (Set OLLAMA_NUM_PARALLEL on the
+        Ollama server to at least 3 so the 3B requests don't queue.)
+        """
+        batches: dict[str, list[BaseAgent]] = {}
+        for name in names:
+            agent = self.agents[name]
+            batches.setdefault(agent.model, []).append(agent)
+        ordered = sorted(
+            batches.values(),
+            key=lambda batch: -max(agent.cost_weight for agent in batch),
+        )
+        return [agent for batch in ordered for agent in batch]
+
     # ============================================================
     # Graph Nodes
     # ============================================================
@@ -196,19 +382,23 @@ class PRReviewOrchestrator:
         Each Send() creates an independent execution of the agent_worker node
         with its own state — this is how we get parallelism.
 
-        FUTURE ENHANCEMENT:
-        This is where you'd add triage logic:
+        The configured `triage` callable decides which agents are relevant:
         - Small README change? Only run documentation + standards
         - SQL file changed? Prioritize security
         - Test file changed? Skip testing agent
+
+        Workers are sent most expensive first (cost_weight), so the slowest
+        agent starts earliest.
         """
         diff_text = state["diff_text"]
+        if self.triage is None:
+            indices = self._by_cost
+        else:
+            selected = {self._agent_index[name] for name in self.triage(diff_text)}
+            indices = [i for i in self._by_cost if i in selected]
 
-        # Send to ALL agents (Phase 2 - no triage yet)
-        return [
-            Send("agent_worker", {"diff_text": diff_text, "agent_name": name})
-            for name in self.agents.keys()
-        ]
+        parsed = ParsedDiff(diff_text)
+        return [Send("agent_worker", {"diff": parsed, "idx": i}) for i in indices]
 
     async def _agent_worker_node(self, state: AgentWorkerState) -> dict:
         """
@@ -220,11 +410,12 @@ class PRReviewOrchestrator:
         Returns dict with agent_results list (will be appended to state
         via the operator.add annotation).
         """
-        agent_name = state["agent_name"]
-        diff_text = state["diff_text"]
-
-        agent = self.agents[agent_name]
-        result = await agent.analyze(diff_text)
+        agent = self._agent_tuple[state["idx"]]
+        try:
+            result = await self._analyze(agent, state["diff"])
+        except Exception as e:
+            # One broken agent must not fail the whole graph run
+            result = self._failed_result(agent, e)
 
         # Return as a list — operator.add will append to state.agent_results
         return {"agent_results": [result]}
@@ -236,54 +427,166 @@ class PRReviewOrchestrator:
         By this point, state["agent_results"] contains results from
         all 5 agents (appended by operator.add during parallel execution).
         """
-        agent_results = state.get("agent_results", [])
-        pr_data = state.get("pr_data") or PRData(
-            owner="local", repo="paste", pr_number=0,
-            title="Direct diff analysis", raw_diff=state["diff_text"],
+        final_result = self._build_result(
+            state.get("agent_results", []),
+            state["diff_text"],
+            state.get("pr_data"),
         )
+        return {"final_result": final_result}
 
-        # Collect all findings across all agents
-        all_findings = []
-        for ar in agent_results:
-            all_findings.extend(ar.findings)
+    def _build_result(
+        self,
+        agent_results: list[AgentResult],
+        diff_text: str,
+        pr_data: Optional[PRData],
+    ) -> AnalysisResult:
+        """
+        Combine agent results into one AnalysisResult (shared by both run paths).
+
+        Everything here is already-validated data, so the result is built
+        with model_construct() instead of re-running validation. The totals
+        and severity counts are computed fields of AnalysisResult (one
+        Counter pass).
+
+        Findings reported by more than one agent (same file, line and title;
+        see dedupe_findings) are kept once - the most severe copy - and
+        dropped from the other agents' lists. So the UI, which lists every
+        agent's findings, shows each issue once and matches total_findings,
+        and the stored/serialized result carries no duplicate payload.
+        """
+        pr_data = pr_data or PRData.for_paste(diff_text)
 
-        # Calculate total execution time (max of agents, since they run in parallel)
+        # Calculate total execution time (max of agents, since they run in parallel).
+        # Agent times are already truncated to 2 decimals, so no round() needed.
         max_time = max((ar.execution_time for ar in agent_results), default=0)
 
-        final_result = AnalysisResult(
-            id=str(uuid.uuid4())[:8],
+        # Cross-agent dedupe: ids of the findings that survive, then strip the
+        # rest. Agents that lost nothing are passed through as they are.
+        kept = {id(f) for f in dedupe_findings(f for ar in agent_results for f in ar.findings)}
+        agent_results = [
+            ar if all(id(f) in kept for f in ar.findings)
+            else ar.model_copy(update={"findings": [f for f in ar.findings if id(f) in kept]})
+            for ar in agent_results
+        ]
+
+        # 8 hex chars straight from 4 random bytes (str(uuid4())[:8] built a
+        # UUID object and a 36-char string just to cut it down)
+        return AnalysisResult.model_construct(
+            id=token_hex(4),
             pr_data=pr_data,
             agent_results=agent_results,
-            total_findings=len(all_findings),
-            critical_count=sum(1 for f in all_findings if f.severity == Severity.CRITICAL),
-            high_count=sum(1 for f in all_findings if f.severity == Severity.HIGH),
-            medium_count=sum(1 for f in all_findings if f.severity == Severity.MEDIUM),
-            low_count=sum(1 for f in all_findings if f.severity == Severity.LOW),
-            total_execution_time=round(max_time, 2),
+            total_execution_time=max_time,
             status=AnalysisStatus.COMPLETED,
         )
 
-        return {"final_result": final_result}
+    # ============================================================
+    # Lifecycle
+    # ============================================================
+
+    async def warmup(self) -> list[str]:
+        """
+        Load every agent model into Ollama before the first real request.
+
+        The first call to a model pays for loading its weights and a cold
+        prefill of the system prompt - several seconds the first user would
+        otherwise wait for. This sends one tiny request per DISTINCT model
+        (the 3 agents on llama3.2:3b share one load), using that model's
+        first agent's system prompt and generating a single token. The
+        agent's MODEL_OPTIONS are sent too: a different num_ctx would make
+        Ollama reload the model on the first real request.
+
+        Failures are reported, never raised: a missing model or a stopped
+        Ollama must not keep the API from starting.
+
+        Returns the models that were warmed up successfully.
+        """
+        first_agent_per_model: dict[str, BaseAgent] = {}
+        for agent in self.agents.values():
+            first_agent_per_model.setdefault(agent.model, agent)
+
+        async def warm(agent: BaseAgent) -> bool:
+            try:
+                await self.client.generate(
+                    model=agent.model,
+                    prompt="warmup",
+                    system_prompt=agent.system_prompt,
+                    temperature=0.0,
+                    options={**agent.MODEL_OPTIONS, "num_predict": 1},
+                )
+                return True
+            except Exception as e:
+                logger.warning("[warmup] %s not warmed up: %s", agent.model, e)
+                return False
+
+        warmed = await asyncio.gather(*(warm(a) for a in first_agent_per_model.values()))
+        return [model for model, ok in zip(first_agent_per_model, warmed) if ok]
+
+    async def aclose(self):
+        """Close the Ollama client and the response cache, but only if we created them."""
+        if self._owns_cache:
+            self.cache.close()
+        if self._owns_client:
+            await self.client.close()
+
+    async def __aenter__(self) -> "PRReviewOrchestrator":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
 
     # ============================================================
     # Public API
     # ============================================================
 
-    async def run(self, diff_text: str, pr_data: Optional[PRData] = None) -> AnalysisResult:
+    async def run(
+        self,
+        diff_text: str,
+        pr_data: Optional[PRData] = None,
+        on_event: Optional[EventCallback] = None,
+    ) -> AnalysisResult:
         """
         Run the full multi-agent analysis.
 
-        This is the main entry point. It:
+        This is the main entry point. Without a triage callable it simply
+        delegates to run_fast(). With one, it:
         1. Creates the initial state
         2. Executes the LangGraph workflow
         3. Returns the combined AnalysisResult
 
         Under the hood, LangGraph:
-        - Sends diff_text to all 5 agents in parallel
+        - Sends diff_text to the triaged agents in parallel
         - Waits for all to complete
         - Aggregates results
         - Returns final state
+
+        Pass `on_event` to follow the analysis as it happens (the WebSocket
+        endpoint streams these to the browser). It is awaited as
+        on_event(event_type, agent_name, payload) with:
+
+            "analysis_started"   None   [names of the agents that will run]
+            "agent_started"      name   None
+            "agent_thinking"     name   tokens generated so far (int)
+            "agent_finding"      name   Finding, as soon as it is parsed
+            "agent_completed"    name   the agent's AgentResult
+            "analysis_progress"  None   {"completed", "total", "findings"}
+
+        The agents are the same ones run() picks without it (triage, model
+        batching, the concurrency limit) and the result is aggregated the
+        same way - see run_streaming().
+
+        Degenerate input (empty, whitespace-only, or a diff with no changed
+        content lines) returns an empty result without calling any LLM,
+        and without any event.
         """
+        if not self._has_reviewable_content(diff_text):
+            return self._build_result([], diff_text, pr_data)
+
+        if on_event is not None:
+            return await self.run_streaming(diff_text, pr_data, on_event)
+
+        if self.triage is None:
+            return await self.run_fast(diff_text, pr_data=pr_data)
+
         initial_state: PRReviewState = {
             "diff_text": diff_text,
             "pr_data": pr_data,
@@ -295,3 +598,135 @@ class PRReviewOrchestrator:
         final_state = await self.graph.ainvoke(initial_state)
 
         return final_state["final_result"]
+
+    async def run_fast(self, diff_text: str, pr_data: Optional[PRData] = None) -> AnalysisResult:
+        """
+        Run the relevant agents with a flat asyncio.gather(), skipping the graph.
+
+        Agents are picked by the built-in _select_agents() rules and submitted
+        grouped by model, heaviest first (_batch_by_model). Compared to
+        the graph path this avoids LangGraph's node dispatch, state copying
+        and operator.add list concatenation.
+        """
+        agents = self._batch_by_model(self._select_agents(diff_text))
+        parsed = ParsedDiff(diff_text)  # split once, shared by every agent
+
+        # Launch heaviest first, yielding after each launch so the request is
+        # actually on its way to Ollama before the next agent starts
+        tasks = []
+        for agent in agents:
+            tasks.append(asyncio.create_task(self._analyze(agent, parsed)))
+            await asyncio.sleep(0)
+
+        # return_exceptions=True: analyze() reports its own errors as FAILED
+        # results, but anything that still escapes it (a bug) fails only
+        # that agent instead of discarding the other agents' finished work
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        agent_results = []
+        for agent, outcome in zip(agents, outcomes):
+            if isinstance(outcome, BaseException):
+                if not isinstance(outcome, Exception):
+                    raise outcome  # KeyboardInterrupt, SystemExit, ...
+                outcome = self._failed_result(agent, outcome)
+            agent_results.append(outcome)
+        return self._build_result(agent_results, diff_text, pr_data)
+
+    async def run_streaming(
+        self,
+        diff_text: str,
+        pr_data: Optional[PRData],
+        on_event: EventCallback,
+    ) -> AnalysisResult:
+        """
+        Run the relevant agents, reporting every step to on_event (see run()).
+
+        Agents are picked by the triage callable if one is configured, by
+        _select_agents() otherwise, and launched like run_fast() does.
+
+        Findings are streamed: each one is reported the moment the model has
+        finished writing it, instead of after the agent's whole response.
+        In between, agent_thinking reports the tokens generated so far, so a
+        slow agent visibly makes progress.
+
+        TaskGroup instead of gather(): if one task fails (e.g. on_event
+        raises because the client disconnected), the other agents are
+        cancelled instead of generating for nobody. The first failure is
+        re-raised as itself, not as an ExceptionGroup.
+
+        While they run, asyncio.wait(FIRST_COMPLETED) wakes up as each agent
+        finishes and reports a running total ("3 of 5 agents done, 7
+        findings so far"), so the UI is not silent until the slowest agent
+        is done.
+        """
+        names = self.triage(diff_text) if self.triage is not None else self._select_agents(diff_text)
+        agents = self._batch_by_model(names)
+        parsed = ParsedDiff(diff_text)  # split once, shared by every agent
+
+        await on_event("analysis_started", None, [agent.agent_name for agent in agents])
+
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(self._analyze(agent, parsed, on_event)) for agent in agents]
+                pending = set(tasks)
+                finished = []
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    finished.extend(task.result() for task in done)
+                    findings_so_far = len(dedupe_findings(
+                        f for result in finished for f in result.findings
+                    ))
+                    await on_event("analysis_progress", None, {
+                        "completed": len(finished),
+                        "total": len(tasks),
+                        "findings": findings_so_far,
+                    })
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0]
+
+        # In launch order, not completion order
+        return self._build_result([task.result() for task in tasks], diff_text, pr_data)
+
+    async def _analyze(
+        self,
+        agent: BaseAgent,
+        parsed: ParsedDiff,
+        on_event: Optional[EventCallback] = None,
+    ) -> AgentResult:
+        """
+        Run one agent once one of the _agent_slots is free.
+
+        The semaphore is FIFO, so agents still start in launch order
+        (heaviest first) when they have to wait.
+
+        With on_event, the agent's start (once it has a slot), streamed
+        findings, progress and completion are reported - see run().
+        """
+        if on_event is None:
+            async with self._agent_slots:
+                return await agent.analyze(parsed)
+
+        name = agent.agent_name
+
+        async def on_finding(finding):
+            await on_event("agent_finding", name, finding)
+
+        async def on_progress(tokens):
+            await on_event("agent_thinking", name, tokens)
+
+        async with self._agent_slots:
+            await on_event("agent_started", name, None)
+            result = await agent.analyze(parsed, on_finding=on_finding, on_progress=on_progress)
+        await on_event("agent_completed", name, result)
+        return result
+
+    @staticmethod
+    def _failed_result(agent: BaseAgent, error: Exception) -> AgentResult:
+        """A FAILED AgentResult for an agent whose analyze() raised."""
+        return AgentResult.model_construct(
+            agent=agent.agent_type,
+            status=AnalysisStatus.FAILED,
+            findings=[],
+            execution_time=0.0,
+            model_used=agent.model,
+            error=str(error) or type(error).__name__,
+        )
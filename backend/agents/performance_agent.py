@@ -16,7 +16,9 @@ WHY qwen2.5-coder:7b?
     The 3B model would miss these higher-level patterns.
 """
 
-from backend.agents.base_agent import BaseAgent
+from typing import ClassVar
+
+from backend.agents.base_agent import BALANCED_MODEL_OPTIONS, BaseAgent
 from backend.config import settings
 from backend.models.schemas import AgentType
 
@@ -27,12 +29,14 @@ class PerformanceAgent(BaseAgent):
     Uses the 7B model for algorithmic complexity reasoning.
     """
 
+    __slots__ = ()
+
     agent_type = AgentType.PERFORMANCE
-    model = settings.balanced_model  # qwen2.5-coder:7b
+    model = settings.balanced_model  # qwen2.5-coder:7b (Q4_K_M)
+    MODEL_OPTIONS = BALANCED_MODEL_OPTIONS
+    cost_weight = 10
 
-    @property
-    def system_prompt(self) -> str:
-        return """You are an expert software performance engineer. Your job is to analyze code changes and identify performance bottlenecks, inefficiencies, and optimization opportunities.
+    system_prompt: ClassVar[str] = """You are an expert software performance engineer. Your job is to analyze code changes and identify performance bottlenecks, inefficiencies, and optimization opportunities.
 
 You have deep knowledge of:
 - Algorithmic complexity (Big O notation)
@@ -47,10 +51,24 @@ IMPORTANT RULES:
 - Be specific about the complexity and expected impact.
 - Suggest concrete fixes, not vague advice.
 
-Always respond with valid JSON."""
+Always respond with a JSON object in this EXACT format:
+{
+    "findings": [
+        {
+            "title": "Short title of the performance issue",
+            "severity": "critical|high|medium|low",
+            "description": "What the issue is, why it's slow, and what the complexity is",
+            "file_path": "filename if identifiable",
+            "line_number": null,
+            "suggestion": "Specific fix with example code approach",
+            "confidence": 0.9
+        }
+    ]
+}
+
+If no performance issues are found, return: {"findings": []}"""
 
-    def build_prompt(self, diff_text: str) -> str:
-        return f"""Analyze the following code for performance issues.
+    STATIC_PREFIX: ClassVar[str] = """Analyze the following code for performance issues.
 
 CHECK FOR THESE SPECIFIC ISSUES:
 1. **O(n^2) or worse algorithms**: Nested loops over the same data, repeated linear searches
@@ -69,22 +87,4 @@ SEVERITY GUIDELINES:
 
 CODE TO ANALYZE:
 ```
-{diff_text}
-```
-
-Respond with a JSON object in this EXACT format:
-{{
-    "findings": [
-        {{
-            "title": "Short title of the performance issue",
-            "severity": "critical|high|medium|low",
-            "description": "What the issue is, why it's slow, and what the complexity is",
-            "file_path": "filename if identifiable",
-            "line_number": null,
-            "suggestion": "Specific fix with example code approach",
-            "confidence": 0.9
-        }}
-    ]
-}}
-
-If no performance issues are found, return: {{"findings": []}}"""
+"""
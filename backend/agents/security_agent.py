@@ -32,7 +32,10 @@ PROMPT ENGINEERING NOTES:
     5. Severity guidelines (so ratings are consistent)
 """
 
-from backend.agents.base_agent import BaseAgent
+import re
+from typing import ClassVar
+
+from backend.agents.base_agent import BALANCED_MODEL_OPTIONS, BaseAgent
 from backend.config import settings
 from backend.models.schemas import AgentType
 
@@ -45,12 +48,28 @@ class SecurityAgent(BaseAgent):
     data flow and security implications.
     """
 
-    agent_type = AgentType.SECURITY
-    model = settings.balanced_model  # qwen2.5-coder:7b
+    __slots__ = ()
 
-    @property
-    def system_prompt(self) -> str:
-        return """You are an expert code security auditor. Your job is to analyze code changes (diffs) and identify security vulnerabilities.
+    agent_type = AgentType.SECURITY
+    model = settings.balanced_model  # qwen2.5-coder:7b (Q4_K_M)
+    MODEL_OPTIONS = BALANCED_MODEL_OPTIONS
+    cost_weight = 10
+
+    # Pre-filter (see BaseAgent.PREFILTER): the sinks and sources this agent
+    # checks for. A diff that touches none of them - no shell, eval,
+    # deserialization, crypto, secrets, SQL, HTML output, file paths or
+    # request data - skips the 7B call.
+    PREFILTER = re.compile(
+        r"subprocess|os\.(?:system|popen)|shell\s*=\s*True|\beval\(|\bexec\("
+        r"|pickle|marshal|yaml\.load|\bmd5\b|\bsha1\b|\brandom\."
+        r"|password|passwd|secret|token|api[_-]?key|\bauth|credential"
+        r"|\b(?:SELECT|INSERT|UPDATE|DELETE)\b|\.execute\(|\bsql"
+        r"|innerHTML|dangerouslySetInnerHTML|\|\s*safe\b|render_template_string"
+        r"|\bopen\(|os\.path|send_file|\brequest\.|verify\s*=\s*False",
+        re.IGNORECASE,
+    )
+
+    system_prompt: ClassVar[str] = """You are an expert code security auditor. Your job is to analyze code changes (diffs) and identify security vulnerabilities.
 
 You have deep knowledge of:
 - OWASP Top 10 vulnerabilities
@@ -64,19 +83,24 @@ IMPORTANT RULES:
 - Be specific: mention exact function names, variable names, and line patterns.
 - Rate severity accurately based on exploitability and impact.
 
-Always respond with valid JSON."""
+Always respond with a JSON object in this EXACT format:
+{
+    "findings": [
+        {
+            "title": "Short title of the vulnerability",
+            "severity": "critical|high|medium|low",
+            "description": "Detailed explanation of the vulnerability and how it could be exploited",
+            "file_path": "filename if identifiable from the diff",
+            "line_number": null,
+            "suggestion": "Specific code fix or mitigation strategy",
+            "confidence": 0.9
+        }
+    ]
+}
 
-    def build_prompt(self, diff_text: str) -> str:
-        """
-        Build the security analysis prompt.
+If no security issues are found, return: {"findings": []}"""
 
-        PROMPT ENGINEERING KEY CONCEPTS:
-        1. Be specific about what to look for (reduces hallucination)
-        2. Define the output format precisely (makes parsing reliable)
-        3. Include severity guidelines (makes ratings consistent)
-        4. Tell it what NOT to do (prevents false positives)
-        """
-        return f"""Analyze the following code for security vulnerabilities.
+    STATIC_PREFIX: ClassVar[str] = """Analyze the following code for security vulnerabilities.
 
 CHECK FOR THESE SPECIFIC ISSUES:
 1. **SQL Injection**: String formatting/concatenation in SQL queries instead of parameterized queries
@@ -96,22 +120,4 @@ SEVERITY GUIDELINES:
 
 CODE TO ANALYZE:
 ```
-{diff_text}
-```
-
-Respond with a JSON object in this EXACT format:
-{{
-    "findings": [
-        {{
-            "title": "Short title of the vulnerability",
-            "severity": "critical|high|medium|low",
-            "description": "Detailed explanation of the vulnerability and how it could be exploited",
-            "file_path": "filename if identifiable from the diff",
-            "line_number": null,
-            "suggestion": "Specific code fix or mitigation strategy",
-            "confidence": 0.9
-        }}
-    ]
-}}
-
-If no security issues are found, return: {{"findings": []}}"""
+"""
@@ -17,7 +17,10 @@ WHY llama3.2:3b?
     which keeps the overall multi-agent analysis fast.
 """
 
-from backend.agents.base_agent import BaseAgent
+import re
+from typing import ClassVar
+
+from backend.agents.base_agent import FAST_MODEL_OPTIONS, BaseAgent
 from backend.config import settings
 from backend.models.schemas import AgentType
 
@@ -28,12 +31,22 @@ class StandardsAgent(BaseAgent):
     Uses the 3B model for fast pattern-based analysis.
     """
 
+    __slots__ = ()
+
     agent_type = AgentType.STANDARDS
-    model = settings.fast_model  # llama3.2:3b
+    model = settings.fast_model  # llama3.2:3b (Q5_K_M)
+    MODEL_OPTIONS = FAST_MODEL_OPTIONS
+    cost_weight = 3
 
-    @property
-    def system_prompt(self) -> str:
-        return """You are an expert code reviewer focused on code quality, style, and best practices. Your job is to analyze code changes for convention violations and maintainability issues.
+    # Pre-filter (see BaseAgent.PREFILTER): bare excepts, definitions,
+    # imports, camelCase assignments, magic numbers. Prose, config and
+    # data-only changes give this agent nothing to review.
+    PREFILTER = re.compile(
+        r"except\s*:|\bdef\s|\bclass\s|\bfunction\b|=>|\bimport\b"
+        r"|\b[a-z]+[A-Z]\w*\s*=|(?<![\w.])\d{2,}(?![\w.])"
+    )
+
+    system_prompt: ClassVar[str] = """You are an expert code reviewer focused on code quality, style, and best practices. Your job is to analyze code changes for convention violations and maintainability issues.
 
 You have deep knowledge of:
 - PEP 8 (Python style guide)
@@ -47,10 +60,24 @@ IMPORTANT RULES:
 - Be practical: flag issues that would cause confusion or bugs in a team setting.
 - Respect existing project conventions even if they differ from your preference.
 
-Always respond with valid JSON."""
+Always respond with a JSON object in this EXACT format:
+{
+    "findings": [
+        {
+            "title": "Short description of the standards violation",
+            "severity": "critical|high|medium|low",
+            "description": "What the issue is and why it matters for maintainability",
+            "file_path": "filename if identifiable",
+            "line_number": null,
+            "suggestion": "How to fix it with a concrete example",
+            "confidence": 0.8
+        }
+    ]
+}
+
+If no standards issues are found, return: {"findings": []}"""
 
-    def build_prompt(self, diff_text: str) -> str:
-        return f"""Analyze the following code for coding standards and best practice violations.
+    STATIC_PREFIX: ClassVar[str] = """Analyze the following code for coding standards and best practice violations.
 
 CHECK FOR THESE SPECIFIC ISSUES:
 1. **Naming conventions**: Inconsistent style (mixing camelCase and snake_case), unclear variable names
@@ -69,22 +96,4 @@ SEVERITY GUIDELINES:
 
 CODE TO ANALYZE:
 ```
-{diff_text}
-```
-
-Respond with a JSON object in this EXACT format:
-{{
-    "findings": [
-        {{
-            "title": "Short description of the standards violation",
-            "severity": "critical|high|medium|low",
-            "description": "What the issue is and why it matters for maintainability",
-            "file_path": "filename if identifiable",
-            "line_number": null,
-            "suggestion": "How to fix it with a concrete example",
-            "confidence": 0.8
-        }}
-    ]
-}}
-
-If no standards issues are found, return: {{"findings": []}}"""
+"""
@@ -16,7 +16,10 @@ WHY llama3.2:3b?
     accurate enough for this job, keeping overall analysis time low.
 """
 
-from backend.agents.base_agent import BaseAgent
+import re
+from typing import ClassVar
+
+from backend.agents.base_agent import FAST_MODEL_OPTIONS, BaseAgent
 from backend.config import settings
 from backend.models.schemas import AgentType
 
@@ -27,12 +30,18 @@ class TestingAgent(BaseAgent):
     Uses the 3B model for fast pattern-based analysis.
     """
 
+    __slots__ = ()
+
     agent_type = AgentType.TESTING
-    model = settings.fast_model  # llama3.2:3b
+    model = settings.fast_model  # llama3.2:3b (Q5_K_M)
+    MODEL_OPTIONS = FAST_MODEL_OPTIONS
+    cost_weight = 3
 
-    @property
-    def system_prompt(self) -> str:
-        return """You are an expert software testing engineer. Your job is to analyze code changes and identify missing tests, untested edge cases, and test coverage gaps.
+    # Pre-filter (see BaseAgent.PREFILTER): no function or class in the diff,
+    # no code that could be missing a test.
+    PREFILTER = re.compile(r"\b(?:def|class|function)\s+\w+|=>")
+
+    system_prompt: ClassVar[str] = """You are an expert software testing engineer. Your job is to analyze code changes and identify missing tests, untested edge cases, and test coverage gaps.
 
 You have deep knowledge of:
 - Unit testing best practices
@@ -47,10 +56,24 @@ IMPORTANT RULES:
 - Consider error handling paths and boundary conditions.
 - Be practical: suggest tests that catch real bugs, not trivial tests.
 
-Always respond with valid JSON."""
+Always respond with a JSON object in this EXACT format:
+{
+    "findings": [
+        {
+            "title": "Short description of the testing gap",
+            "severity": "critical|high|medium|low",
+            "description": "What is not tested and why it matters",
+            "file_path": "filename if identifiable",
+            "line_number": null,
+            "suggestion": "Specific test cases that should be written",
+            "confidence": 0.8
+        }
+    ]
+}
+
+If no testing gaps are found, return: {"findings": []}"""
 
-    def build_prompt(self, diff_text: str) -> str:
-        return f"""Analyze the following code for testing gaps and missing test coverage.
+    STATIC_PREFIX: ClassVar[str] = """Analyze the following code for testing gaps and missing test coverage.
 
 CHECK FOR THESE SPECIFIC ISSUES:
 1. **Untested public functions**: Functions with complex logic but no apparent test coverage
@@ -68,22 +91,4 @@ SEVERITY GUIDELINES:
 
 CODE TO ANALYZE:
 ```
-{diff_text}
-```
-
-Respond with a JSON object in this EXACT format:
-{{
-    "findings": [
-        {{
-            "title": "Short description of the testing gap",
-            "severity": "critical|high|medium|low",
-            "description": "What is not tested and why it matters",
-            "file_path": "filename if identifiable",
-            "line_number": null,
-            "suggestion": "Specific test cases that should be written",
-            "confidence": 0.8
-        }}
-    ]
-}}
-
-If no testing gaps are found, return: {{"findings": []}}"""
+"""
@@ -26,38 +26,135 @@ TO RUN:
     cd pr-review-ai
     venv/Scripts/python -m uvicorn backend.api.main:app --reload
 
+    or, without auto-reload, on uvloop where available (see the bottom of this file):
+    venv/Scripts/python -m backend.api.main
+
     Then visit: http://localhost:8000/docs (Swagger UI)
+
+    Production (Linux/macOS), no --reload:
+    uvicorn backend.api.main:app --loop uvloop --http httptools --workers 4
+
+    uvloop (libuv event loop) and httptools (C HTTP parser) come with
+    uvicorn[standard]; uvicorn's default "auto" already picks them up when
+    installed, the flags just make a missing one fail loudly. uvloop does
+    not exist on Windows - there uvicorn falls back to asyncio's loop.
+    NOTE: each worker is a separate process with its own in-memory results
+    and caches; run more workers only once the results live in a database.
 """
 
-import uuid
+import asyncio
+import itertools
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
-from backend.api.routes import router
+from backend.api.routes import analysis_service, github_service, router
 from backend.api.websocket import manager, handle_analysis
 from backend.config import settings
 
 
+def _start_logging() -> QueueListener:
+    """
+    Give the application loggers ("prreview.*") their handler; uvicorn keeps its own.
+
+    Records are put on a queue by the logging call and written to stderr by
+    a QueueListener thread, so a slow terminal or log pipe never blocks the
+    event loop that serves every WebSocket session.
+
+    Called from lifespan(), not at import: importing the app (tests, or the
+    second import `python -m backend.api.main` triggers through uvicorn)
+    starts no thread and leaves the root logger alone. Stop the returned
+    listener on shutdown - it flushes what is still queued.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    output = logging.StreamHandler()
+    output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    listener = QueueListener(log_queue, output)
+    listener.start()
+
+    app_logger = logging.getLogger("prreview")
+    app_logger.addHandler(QueueHandler(log_queue))  # layout is `output`'s
+    app_logger.setLevel(logging.INFO)
+    app_logger.propagate = False
+    # httpx logs every request at INFO - one line per Ollama call is just noise
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    return listener
+
+
+def _stop_logging(listener: QueueListener):
+    """Undo _start_logging(): flush the queue, detach the handler."""
+    listener.stop()
+    app_logger = logging.getLogger("prreview")
+    for handler in [h for h in app_logger.handlers if isinstance(h, QueueHandler)]:
+        app_logger.removeHandler(handler)
+    app_logger.propagate = True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup and shutdown of the shared services.
+
+    STARTUP: pre-load the agent models into Ollama (one tiny request per
+    distinct model) so the first analysis does not wait for weights to
+    load. Warmup runs in the background: the API accepts requests right
+    away instead of waiting (up to the client timeout) for a slow Ollama,
+    and every `--reload` restarts instantly. Warmup never raises: a missing
+    model or a stopped Ollama is logged and the API keeps serving.
+
+    SHUTDOWN: stop a warmup that is still running, then close the pooled
+    HTTP clients instead of leaking sockets.
+
+    Logging (see _start_logging) is set up here too, once per running app,
+    and torn down last so shutdown messages still get out.
+    """
+    log_listener = _start_logging()
+    try:
+        # Referenced here until shutdown: the event loop only keeps weak
+        # references to tasks, so an unreferenced one may vanish mid-run
+        warmup_task = (
+            asyncio.create_task(analysis_service.warmup())
+            if settings.warmup_on_startup else None
+        )
+
+        yield
+
+        if warmup_task is not None and not warmup_task.done():
+            warmup_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await warmup_task
+        await analysis_service.aclose()
+        await github_service.close()
+    finally:
+        _stop_logging(log_listener)
+
+
+# ORJSONResponse: responses are serialized by orjson (C) instead of the
+# stdlib json module - noticeably faster for results with many findings.
 app = FastAPI(
+    lifespan=lifespan,
     title="PR Review AI",
     description="Agentic AI system that analyzes Pull Requests for security "
                 "vulnerabilities, performance issues, and more.",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS Middleware
 # WHY? The frontend (React on localhost:5173) needs to call the backend
 # (FastAPI on localhost:8000). Browsers block this by default ("same-origin policy").
 # CORS headers tell the browser "it's OK, I trust this origin."
+# One precompiled regex covers the localhost family:
+#   5173 = Vite dev server (React frontend), 3000 = alternative frontend port
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:5173",   # Vite dev server (React frontend)
-        "http://localhost:3000",   # Alternative frontend port
-        "http://127.0.0.1:5173",
-        "http://127.0.0.1:3000",
-    ],
+    allow_origin_regex=r"https?://(localhost|127\.0\.0\.1):(5173|3000)",
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -66,6 +163,22 @@ app.add_middleware(
 # Register API routes
 app.include_router(router)
 
+# Process-wide clients, shared by the REST routes and every WebSocket
+# session: one keep-alive connection pool to Ollama and one to GitHub
+# (with its ETag cache), and one orchestrator - so one agent response
+# cache and ONE max_concurrent_agents limit for every analysis running in
+# this process, whichever endpoint started it. Closed once, in lifespan()
+# above.
+app.state.ollama_client = analysis_service.client
+app.state.orchestrator = analysis_service.orchestrator
+app.state.github_service = github_service
+
+# WebSocket session IDs: "<pid>-<counter>", hex. They only key the
+# ConnectionManager's dict, so they must be unique within this process -
+# not random: a counter needs no os.urandom() syscall per connection.
+_SESSION_PREFIX = f"{os.getpid():x}-"
+_session_counter = itertools.count(1)
+
 
 @app.get("/")
 async def root():
@@ -99,14 +212,35 @@ async def websocket_analyze(websocket: WebSocket):
         - fetch_started / fetch_completed  (if PR URL)
         - analysis_started
         - agent_started (x5)
+        - agent_thinking (tokens generated so far, every few dozen tokens)
+        - agent_finding (each finding, as soon as the LLM has written it)
         - agent_completed (x5, as each finishes)
+        - analysis_progress (after each agent: agents done, findings so far)
         - analysis_completed (final result)
         - error (if something goes wrong)
     """
-    session_id = str(uuid.uuid4())[:8]
+    session_id = f"{_SESSION_PREFIX}{next(_session_counter):x}"
     await manager.connect(websocket, session_id)
 
     try:
         await handle_analysis(websocket, session_id)
     finally:
         manager.disconnect(session_id)
+
+
+if __name__ == "__main__":
+    # `python -m backend.api.main`: serve on settings.api_host/api_port with
+    # uvloop (libuv event loop in C - cheaper scheduling for the WebSocket
+    # event pump and the agent fan-out) and the httptools parser.
+    # uvloop has no Windows build, so fall back to the asyncio loop there.
+    import importlib.util
+
+    import uvicorn
+
+    uvicorn.run(
+        "backend.api.main:app",
+        host=settings.api_host,
+        port=settings.api_port,
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools",
+    )
@@ -6,9 +6,18 @@ ENDPOINTS:
     GET  /api/analysis/{id}   -> Get results by ID
     GET  /api/history         -> List recent analyses
     GET  /api/health          -> System health check
+
+Results are encoded to JSON by pydantic-core (Rust) in one call and sent
+as-is. FastAPI would otherwise re-validate the returned model against
+response_model, turn it into a dict of plain Python values and only then
+hand it to orjson - or, for a dict holding models like /history, walk it
+with its pure-Python jsonable_encoder. response_model stays on the routes
+for the OpenAPI schema.
 """
 
-from fastapi import APIRouter, HTTPException
+import orjson
+from fastapi import APIRouter, HTTPException, Response
+from pydantic import TypeAdapter
 
 from backend.models.schemas import AnalysisResult, PRInput
 from backend.services.analysis_service import AnalysisService
@@ -19,6 +28,13 @@ router = APIRouter(prefix="/api")
 analysis_service = AnalysisService()
 github_service = GitHubService()
 
+_RESULTS_ADAPTER = TypeAdapter(list[AnalysisResult])
+
+
+def _json_response(body: str | bytes) -> Response:
+    """A response with an already-encoded JSON body."""
+    return Response(content=body, media_type="application/json")
+
 
 @router.post("/analyze", response_model=AnalysisResult)
 async def analyze_pr(pr_input: PRInput):
@@ -55,29 +71,29 @@ async def analyze_pr(pr_input: PRInput):
     else:
         result = await analysis_service.analyze_diff(pr_input.diff_text)
 
-    return result
+    return _json_response(result.model_dump_json())
 
 
 @router.get("/analysis/{analysis_id}", response_model=AnalysisResult)
 async def get_analysis(analysis_id: str):
     """Retrieve a previous analysis by its ID."""
-    result = analysis_service.get_result(analysis_id)
+    result = await analysis_service.get_result(analysis_id)
     if not result:
         raise HTTPException(
             status_code=404,
             detail=f"Analysis '{analysis_id}' not found"
         )
-    return result
+    return _json_response(result.model_dump_json())
 
 
 @router.get("/history")
 async def get_history(limit: int = 20):
     """Get recent analysis results, newest first."""
-    results = analysis_service.get_history(limit=limit)
-    return {
+    results = await analysis_service.get_history(limit=limit)
+    return _json_response(orjson.dumps({
         "count": len(results),
-        "results": results,
-    }
+        "results": orjson.Fragment(_RESULTS_ADAPTER.dump_json(results)),
+    }))
 
 
 @router.get("/health")
@@ -12,6 +12,7 @@ WHY WEBSOCKET instead of plain HTTP?
     WebSocket (persistent connection):
         Client: "Start analysis"
         Server: "Security agent started..."
+        Server: "Security agent: [critical] SQL Injection"  <- streamed finding
         Server: "Security agent found 2 issues..."
         Server: "Performance agent started..."
         Server: "Performance agent found 3 issues..."
@@ -27,14 +28,13 @@ HOW IT WORKS:
 """
 
 import asyncio
-import json
-from datetime import datetime
+import time
 from typing import Optional
 
+import orjson
 from fastapi import WebSocket, WebSocketDisconnect
 
-from backend.models.schemas import PRInput
-from backend.services.github_service import GitHubService
+from backend.models.schemas import AgentType
 
 
 class ConnectionManager:
@@ -49,6 +49,8 @@ class ConnectionManager:
 
     def __init__(self):
         self.active_connections: dict[str, WebSocket] = {}
+        # session_id -> events waiting for the frame that is about to be sent
+        self._pending: dict[str, list[dict]] = {}
 
     async def connect(self, websocket: WebSocket, session_id: str):
         await websocket.accept()
@@ -56,26 +58,79 @@ class ConnectionManager:
 
     def disconnect(self, session_id: str):
         self.active_connections.pop(session_id, None)
+        self._pending.pop(session_id, None)
 
     async def send_event(self, session_id: str, event: dict):
-        """Send a JSON event to a specific client."""
+        """
+        Send a JSON event to a specific client, coalescing with its neighbours.
+
+        Five agents stream concurrently, so events often come in bursts
+        (agents starting together, cached findings replayed at once). The
+        first event of a burst waits ONE event-loop turn; every event other
+        tasks send for this session in that turn joins it, and the whole
+        burst goes out as one frame (see send_events). Order is kept.
+
+        If the collecting task is cancelled during that turn (a TaskGroup
+        cancelling the other agents), its burst is dropped - the session is
+        being torn down - but always unregistered: a list left behind would
+        swallow every later event, the final error/result included.
+        """
+        pending = self._pending.get(session_id)
+        if pending is not None:
+            pending.append(event)  # the frame being collected will carry it
+            return
+
+        self._pending[session_id] = [event]
+        try:
+            await asyncio.sleep(0)
+        finally:
+            events = self._pending.pop(session_id, None)
+        if events:
+            await self.send_events(session_id, events)
+
+    async def send_events(self, session_id: str, events: list[dict]):
+        """
+        Send events to a specific client in ONE WebSocket frame.
+
+        A single event is sent as a JSON object, several as a JSON array
+        (clients accept both) - one encode and one socket write per burst.
+
+        Encoded with orjson instead of send_json()'s stdlib json: several
+        times faster, and it serializes datetimes and enums natively, so
+        event data can be a plain model_dump() without the mode="json" pass.
+        Still sent as a TEXT frame - the browser JSON.parse()s event.data,
+        which would be a Blob for a binary frame.
+        """
         ws = self.active_connections.get(session_id)
         if ws:
-            await ws.send_json(event)
+            payload = events[0] if len(events) == 1 else events
+            await ws.send_text(orjson.dumps(payload).decode())
 
 
 manager = ConnectionManager()
 
+# Agent names as shown in event messages, and the constant messages, built
+# once at import instead of with str.title() and an f-string per event
+_AGENT_TITLES = {agent.value: agent.value.title() for agent in AgentType}
+_STARTED_MESSAGES = {name: f"{title} agent analyzing..." for name, title in _AGENT_TITLES.items()}
+
 
 def make_event(event_type: str, agent: Optional[str] = None,
-               message: str = "", data: Optional[dict] = None) -> dict:
-    """Create a structured WebSocket event."""
+               message: str = "", data: Optional[dict | orjson.Fragment] = None) -> dict:
+    """
+    Create a structured WebSocket event.
+
+    The timestamp is Unix epoch seconds (a float): time.time() is one C
+    call and orjson writes a float directly, where datetime.now().isoformat()
+    builds an object and formats a string for every event - a hot path once
+    findings and progress are streamed. The frontend formats it for display.
+    """
     return {
         "event_type": event_type,
         "agent": agent,
         "message": message,
         "data": data,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": time.time(),
     }
 
 
@@ -89,16 +144,26 @@ async def handle_analysis(websocket: WebSocket, session_id: str):
     3. Run agents via orchestrator (with per-agent events)
     4. Send final result
     """
-    from backend.agents.orchestrator import PRReviewOrchestrator
-    from backend.models.ollama_client import OllamaClient
-    from backend.models.schemas import PRData
-
-    github_service = GitHubService()
+    # The process-wide services (see backend.api.main): sessions share the
+    # connection pools, the agents' response cache and the concurrency
+    # limit with each other and with the REST routes, and never close them
+    github_service = websocket.app.state.github_service
+    orchestrator = websocket.app.state.orchestrator
 
     try:
-        # Step 1: Receive input
-        raw_data = await websocket.receive_text()
-        input_data = json.loads(raw_data)
+        # Step 1: Receive input - one frame, binary or text. A binary frame
+        # reaches orjson as the raw UTF-8 bytes (no str decode of a diff
+        # that can be megabytes); text frames, as browsers and older clients
+        # send, still work. orjson.loads() takes either.
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000))
+        raw_data = message.get("bytes") or message.get("text") or ""
+        input_data = orjson.loads(raw_data)
+        # Drop the raw frame now: the session lives as long as its slowest
+        # agent (minutes), and the frame is a second copy of a diff that
+        # can be megabytes. Everything below uses the parsed strings.
+        del message, raw_data
 
         pr_url = input_data.get("pr_url")
         diff_text = input_data.get("diff_text")
@@ -141,91 +206,69 @@ async def handle_analysis(websocket: WebSocket, session_id: str):
             ))
             return
 
-        # Step 3: Run agents with progress events
-        await manager.send_event(session_id, make_event(
-            "analysis_started",
-            message="Starting multi-agent analysis...",
-            data={"agents": ["security", "performance", "testing", "documentation", "standards"]}
-        ))
-
-        client = OllamaClient()
-        orchestrator = PRReviewOrchestrator(ollama_client=client)
-
-        # Run each agent and stream events as they complete
-        # We run them as individual tasks so we can report progress
-        agents_config = [
-            ("security", orchestrator.agents["security"]),
-            ("performance", orchestrator.agents["performance"]),
-            ("testing", orchestrator.agents["testing"]),
-            ("documentation", orchestrator.agents["documentation"]),
-            ("standards", orchestrator.agents["standards"]),
-        ]
-
-        # Notify all agents starting
-        for name, _ in agents_config:
-            await manager.send_event(session_id, make_event(
-                "agent_started", agent=name,
-                message=f"{name.title()} agent analyzing..."
-            ))
-
-        # Run all agents in parallel, reporting as each completes
-        async def run_and_report(name, agent):
-            result = await agent.analyze(diff_text)
-            await manager.send_event(session_id, make_event(
-                "agent_completed", agent=name,
-                message=f"{name.title()} agent found {len(result.findings)} issues",
-                data={
-                    "findings_count": len(result.findings),
-                    "execution_time": result.execution_time,
-                    "status": result.status.value,
-                }
-            ))
-            return result
-
-        agent_results = await asyncio.gather(
-            *[run_and_report(name, agent) for name, agent in agents_config]
-        )
-
-        # Step 4: Aggregate and send final result
-        from backend.models.schemas import AnalysisResult, AnalysisStatus, Severity
-        import uuid
-
-        all_findings = []
-        for ar in agent_results:
-            all_findings.extend(ar.findings)
-
-        if pr_data is None:
-            pr_data = PRData(
-                owner="local", repo="paste", pr_number=0,
-                title="Direct diff analysis", raw_diff=diff_text,
-            )
-
-        final_result = AnalysisResult(
-            id=str(uuid.uuid4())[:8],
-            pr_data=pr_data,
-            agent_results=list(agent_results),
-            total_findings=len(all_findings),
-            critical_count=sum(1 for f in all_findings if f.severity == Severity.CRITICAL),
-            high_count=sum(1 for f in all_findings if f.severity == Severity.HIGH),
-            medium_count=sum(1 for f in all_findings if f.severity == Severity.MEDIUM),
-            low_count=sum(1 for f in all_findings if f.severity == Severity.LOW),
-            total_execution_time=round(max(
-                (ar.execution_time for ar in agent_results), default=0
-            ), 2),
-            status=AnalysisStatus.COMPLETED,
-        )
-
+        # Step 3: Run the agents - the same triage, model batching and
+        # aggregation as the REST path - and turn every step the
+        # orchestrator reports (see PRReviewOrchestrator.run) into an event
+        async def on_event(event_type, name, payload):
+            if event_type == "agent_finding":
+                event = make_event(
+                    event_type, agent=name,
+                    message=f"[{payload.severity.value}] {payload.title}",
+                    data=payload.model_dump(),
+                )
+            elif event_type == "agent_thinking":
+                event = make_event(
+                    event_type, agent=name,
+                    message=f"{_AGENT_TITLES[name]} agent generated {payload} tokens",
+                    data={"tokens": payload},
+                )
+            elif event_type == "agent_started":
+                event = make_event(event_type, agent=name, message=_STARTED_MESSAGES[name])
+            elif event_type == "agent_completed":
+                event = make_event(
+                    event_type, agent=name,
+                    message=f"{_AGENT_TITLES[name]} agent found {len(payload.findings)} issues",
+                    data={
+                        "findings_count": len(payload.findings),
+                        "execution_time": payload.execution_time,
+                        "status": payload.status.value,
+                    },
+                )
+            elif event_type == "analysis_progress":
+                event = make_event(
+                    event_type,
+                    message=f"{payload['completed']} of {payload['total']} agents done, "
+                            f"{payload['findings']} findings so far",
+                    data=payload,
+                )
+            else:  # analysis_started
+                event = make_event(
+                    event_type, message="Starting multi-agent analysis...",
+                    data={"agents": payload},
+                )
+            await manager.send_event(session_id, event)
+
+        final_result = await orchestrator.run(diff_text, pr_data=pr_data, on_event=on_event)
+
+        # Step 4: Send the final result. No agent results means there was
+        # nothing to review (whitespace-only, binary-only or rename-only
+        # PR): the orchestrator answered without any LLM call or event.
+        if final_result.agent_results:
+            message = f"Analysis complete: {final_result.total_findings} findings"
+        else:
+            message = "Analysis complete: nothing to review"
         await manager.send_event(session_id, make_event(
             "analysis_completed",
-            message=f"Analysis complete: {final_result.total_findings} findings",
-            data=final_result.model_dump(mode="json"),
+            message=message,
+            # Serialized by pydantic-core straight to JSON bytes and spliced
+            # into the event as-is (orjson.Fragment) - no intermediate dict
+            # of the whole result tree that orjson would then walk again
+            data=orjson.Fragment(final_result.model_dump_json()),
         ))
 
-        await client.close()
-
     except WebSocketDisconnect:
         pass
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         await manager.send_event(session_id, make_event(
             "error", message="Invalid JSON input"
         ))
@@ -9,8 +9,14 @@ This makes it easy to:
   3. Have different configs for development vs production
 """
 
+import re
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
+# Quantization suffix of an Ollama tag: "...-q4_K_M", "...-q8_0", "...-fp16"
+_QUANT_SUFFIX = re.compile(r"-(?:q\d\w*|fp16|f16)$", re.IGNORECASE)
+
 
 class Settings(BaseSettings):
     """
@@ -29,15 +35,61 @@ class Settings(BaseSettings):
     # This is the default URL where Ollama listens after installation
     ollama_base_url: str = "http://localhost:11434"
 
+    # NOTE: two settings of the Ollama SERVER (its environment, not ours)
+    # decide whether our concurrent agent requests really run in parallel:
+    #   OLLAMA_NUM_PARALLEL=5       one slot per agent, so none of them queue
+    #   OLLAMA_MAX_LOADED_MODELS=2  keep the 3B and the 7B resident together
+
+    # Connection pool for the shared Ollama HTTP client (app.state.ollama_client).
+    # The whole process shares ONE pool (REST analyses, every WebSocket
+    # session, health checks), so it covers many concurrent analyses of
+    # 5 agents each. Idle sockets are kept for reuse instead of reconnecting,
+    # for 5 minutes - analyses come in bursts, minutes apart.
+    ollama_max_connections: int = 100
+    ollama_max_keepalive_connections: int = 20
+    ollama_keepalive_expiry: float = 300.0  # seconds an idle connection stays open
+
+    # HTTP/2 to Ollama: all concurrent agent requests multiplexed over one
+    # connection. Only takes effect for https:// endpoints (negotiated via
+    # TLS ALPN, e.g. Ollama behind a reverse proxy); `ollama serve` itself
+    # speaks plain HTTP/1.1, where httpx keeps using HTTP/1.1. Needs h2
+    # (httpx[http2] in requirements.txt).
+    ollama_http2: bool = False
+
+    # Optional dedicated Ollama instances per model (default: all on ollama_base_url).
+    # Running one `ollama serve` per model (OLLAMA_HOST=0.0.0.0:11435 ...) keeps
+    # the 3B and 7B from competing for one server's slots. Several URLs for one
+    # model spread its agents across instances (each agent sticks to one).
+    # Example: MODEL_ENDPOINTS='{"llama3.2:3b-instruct-q5_K_M": ["http://localhost:11435"]}'
+    model_endpoints: dict[str, list[str]] = {}
+
     # Model assignments - which model each agent uses
     # Smaller models (3B) = faster but less capable
     # Larger models (7B+) = slower but better reasoning
-    fast_model: str = "llama3.2:3b"           # For simple tasks: triage, standards
-    balanced_model: str = "qwen2.5-coder:7b"  # For code analysis: security, performance
+    #
+    # Both models are pinned to K-quant tags instead of whatever the bare tag
+    # resolves to. Token generation is memory-bandwidth bound (tokens/sec is
+    # roughly bandwidth / model bytes), so 4-5 bits per weight instead of 16
+    # is several times faster than fp16 at >99% of the quality on this kind
+    # of structured review. The 3B gets Q5_K_M: it is small enough that the
+    # extra bit is cheap, and small models lose more to quantization.
+    fast_model: str = "llama3.2:3b-instruct-q5_K_M"  # For simple tasks: triage, standards
+    balanced_model: str = "qwen2.5-coder:7b-instruct-q4_K_M"  # For code analysis: security, performance
     deep_model: str = "deepseek-coder-v2:16b" # For complex analysis (Week 4)
 
+    # Optional quantization override for fast_model and balanced_model,
+    # e.g. MODEL_QUANTIZATION=q8_0 (more VRAM, more quality) or q4_K_M.
+    # Replaces the tag's quantization suffix: "llama3.2:3b-instruct-q8_0".
+    model_quantization: str = ""
+
     # GitHub Configuration
     github_token: str = ""  # Set via GITHUB_TOKEN environment variable
+    # Rate-limited requests (429, or 403 with the limit exhausted) are retried
+    # after GitHub's Retry-After / X-RateLimit-Reset, or exponential backoff -
+    # but only when the wait is at most github_max_retry_wait seconds; an
+    # hour-long reset fails right away instead of hanging the request.
+    github_max_retries: int = 3
+    github_max_retry_wait: float = 60.0
 
     # API Configuration
     api_host: str = "0.0.0.0"
@@ -49,6 +101,38 @@ class Settings(BaseSettings):
     # Agent Configuration
     max_agent_timeout: int = 120  # seconds - max time an agent can take
     max_concurrent_agents: int = 3  # how many agents run in parallel
+    enable_triage: bool = True  # skip agents that are irrelevant to a diff (e.g. docs-only PRs)
+    warmup_on_startup: bool = True  # load each agent model into Ollama when the API starts
+    ollama_keep_alive: str = "30m"  # how long Ollama keeps a model loaded after each request (default 5m)
+
+    # Diff chunking - diffs that don't fit an agent's context window are split
+    # per file and packed into context-sized chunks (see BaseAgent._diff_token_budget)
+    max_prompt_tokens: int = 4096  # context window for agents that don't pin num_ctx
+    max_concurrent_chunks: int = 3  # per agent, so chunks don't swamp Ollama
+
+    # Response cache - identical (model, system prompt, prompt) skips the LLM
+    response_cache_size: int = 1024  # max cached agent responses (LRU eviction)
+    response_cache_ttl: int = 3600   # seconds a cached response stays valid
+    response_cache_path: str = ""    # SQLite file to keep responses across restarts ("" = memory only)
+
+    # Analysis cache - an identical diff gets the previous AnalysisResult
+    # without running any agent (see AnalysisService.analyze_diff)
+    analysis_cache_size: int = 256   # max cached analyses (LRU eviction)
+    analysis_cache_ttl: int = 3600   # seconds a cached analysis stays valid
+
+    # Finished analyses kept for GET /api/analysis/{id} and /api/history
+    # (in memory until Phase 4's database - see services/result_store.py)
+    result_store_size: int = 1000    # max stored analyses, oldest dropped first
+    result_store_ttl: int = 86400    # seconds an analysis stays retrievable
+
+    @model_validator(mode="after")
+    def _apply_model_quantization(self):
+        """Rewrite the agent model tags if MODEL_QUANTIZATION is set."""
+        if self.model_quantization:
+            suffix = f"-{self.model_quantization}"
+            self.fast_model = _QUANT_SUFFIX.sub("", self.fast_model) + suffix
+            self.balanced_model = _QUANT_SUFFIX.sub("", self.balanced_model) + suffix
+        return self
 
     model_config = {
         "env_file": ".env",
@@ -17,15 +17,149 @@ HOW Ollama works under the hood:
 - Models stay loaded in memory for ~5 minutes after last use, then get unloaded
 """
 
-import json
+import asyncio
+import logging
 import time
-from typing import Optional
+import zlib
+from typing import AsyncIterator, Awaitable, Callable, Optional, Protocol, Union
 
 import httpx
+import orjson
 
 from backend.config import settings
 
 
+# One DEBUG line per generation: formatted only when DEBUG is enabled
+# (see the logging setup in backend.api.main) instead of printed to
+# stdout from the event loop on every call
+logger = logging.getLogger("prreview.ollama")
+
+# Streamed generations report progress every this many tokens (see
+# generate_json_stream): often enough to look alive, rare enough that five
+# agents don't flood the WebSocket with one event per token.
+PROGRESS_EVERY = 32
+
+# How long a GET /api/tags listing is reused (seconds). The installed models
+# change when someone runs `ollama pull`, not between two health checks.
+MODELS_CACHE_TTL = 30.0
+
+
+class FindingsStreamParser:
+    """
+    Incrementally extract finding objects from a streamed JSON response.
+
+    Agents answer with {"findings": [{...}, {...}]}. When the response is
+    streamed token by token, each finding object is complete long before
+    the whole document is. feed() scans only the new text, tracking brace
+    depth and string/escape state, and returns every object that closed
+    inside a top-level array - so findings can be handled as they arrive.
+
+    This is deliberately tiny (no ijson dependency): it only needs to find
+    object boundaries; the objects themselves are parsed with orjson.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._item_start: Optional[int] = None
+        self._in_array = False
+
+    def feed(self, chunk: str) -> list[dict]:
+        """Append a chunk of response text and return newly completed items."""
+        self.text += chunk
+        items = []
+
+        for i in range(self._pos, len(self.text)):
+            char = self.text[i]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                # depth 1 = top-level object, 2 = an array field inside it
+                if self._depth == 2:
+                    self._in_array = char == "["
+                elif self._depth == 3 and self._in_array and char == "{":
+                    self._item_start = i
+            elif char in "}]":
+                if self._depth == 3 and self._item_start is not None:
+                    try:
+                        item = orjson.loads(self.text[self._item_start:i + 1])
+                        if isinstance(item, dict):
+                            items.append(item)
+                    except orjson.JSONDecodeError:
+                        pass  # malformed item - skip it like parse_response does
+                    self._item_start = None
+                self._depth -= 1
+
+        self._pos = len(self.text)
+        return items
+
+
+class LLMClient(Protocol):
+    """
+    What agents and the orchestrator need from an LLM client.
+
+    OllamaClient is the implementation; typing agents against this instead
+    lets tests hand them a small fake (tests/test_agents.py's
+    MockOllamaClient) that shares no code with OllamaClient - no
+    httpx.AsyncClient behind it, nothing to forget to bypass in __init__.
+    """
+
+    async def generate(
+        self,
+        model: str,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.1,
+        format_json: Union[bool, dict] = False,
+        options: Optional[dict] = None,
+    ) -> dict:
+        """Plain generation: {"response": text, "elapsed_seconds", ...}."""
+        ...
+
+    async def generate_json(
+        self,
+        model: str,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.1,
+        options: Optional[dict] = None,
+        json_schema: Optional[dict] = None,
+    ) -> dict:
+        """Generation parsed as JSON: {"data": parsed, "elapsed_seconds", ...}."""
+        ...
+
+    def generate_json_stream(
+        self,
+        model: str,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.1,
+        options: Optional[dict] = None,
+        json_schema: Optional[dict] = None,
+        on_progress: Optional[Callable[[int], Awaitable[None]]] = None,
+    ) -> AsyncIterator[dict]:
+        """Yield each item of the response's findings array as it completes."""
+        ...
+
+    async def close(self) -> None:
+        """Release connections."""
+        ...
+
+
 class OllamaClient:
     """
     Client for interacting with the Ollama API.
@@ -36,31 +170,100 @@ class OllamaClient:
         response = await client.generate("qwen2.5-coder:7b", "Explain this code: ...")
     """
 
-    def __init__(self, base_url: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        """
+        Args:
+            base_url: Ollama server URL (default: settings.ollama_base_url)
+            http_client: An existing httpx.AsyncClient to send requests with.
+                Its connection pool is then shared with whoever created it,
+                and close() leaves it open - the creator closes it.
+        """
         self.base_url = base_url or settings.ollama_base_url
+        self._owns_http_client = http_client is None
+
         # httpx is like 'requests' but supports async
         # timeout is high because first model load can take 30+ seconds
-        self.client = httpx.AsyncClient(
+        # One client = one keep-alive connection pool. Share the OllamaClient
+        # across agents so parallel calls reuse sockets instead of reconnecting.
+        self.client = http_client or httpx.AsyncClient(
             base_url=self.base_url,
             timeout=httpx.Timeout(120.0),
+            http2=settings.ollama_http2,
+            limits=httpx.Limits(
+                max_connections=settings.ollama_max_connections,
+                max_keepalive_connections=settings.ollama_max_keepalive_connections,
+                keepalive_expiry=settings.ollama_keepalive_expiry,
+            ),
         )
 
+        # Instance (None = base_url) -> (time.monotonic() of the fetch, models)
+        # of its last /api/tags call
+        self._models_cache: dict[Optional[str], tuple[float, list[dict]]] = {}
+
+    def _generate_url(self, model: str, system_prompt: Optional[str], prompt: str) -> str:
+        """
+        Pick the Ollama instance that serves this request.
+
+        By default everything goes to base_url. settings.model_endpoints can
+        give a model its own instance(s), e.g. the 7B on :11434 and the 3B on
+        :11435, so the two models never compete for one server's slots.
+
+        With several instances for one model, requests are pinned by a hash
+        of the system prompt (i.e. per agent): the same agent always lands on
+        the same instance, whose KV cache already holds its static prefix.
+        crc32 instead of hash(): stable across processes and restarts.
+
+        An absolute URL overrides the client's base_url, so all instances
+        share one httpx connection pool.
+        """
+        endpoints = settings.model_endpoints.get(model)
+        if not endpoints:
+            return "/api/generate"
+        key = (system_prompt or prompt[:512]).encode()
+        endpoint = endpoints[zlib.crc32(key) % len(endpoints)]
+        return f"{endpoint.rstrip('/')}/api/generate"
+
+    @staticmethod
+    def _instances(model: Optional[str] = None) -> list[Optional[str]]:
+        """
+        The Ollama instances to query: None stands for base_url.
+
+        For a model, the instance(s) its requests go to (see _generate_url);
+        without one, every instance the client talks to - base_url plus all
+        of settings.model_endpoints.
+        """
+        if model is not None:
+            return [e.rstrip("/") for e in settings.model_endpoints.get(model, [])] or [None]
+        extra = {e.rstrip("/") for urls in settings.model_endpoints.values() for e in urls}
+        return [None, *sorted(extra)]
+
     async def check_connection(self) -> bool:
         """
         Verify Ollama is running and accessible.
 
+        Every instance is checked (concurrently): base_url and the dedicated
+        ones in settings.model_endpoints.
+
         Returns True if connected, raises an exception with helpful message if not.
         """
-        try:
-            response = await self.client.get("/api/tags")
-            response.raise_for_status()
-            return True
-        except httpx.ConnectError:
-            raise ConnectionError(
-                f"Cannot connect to Ollama at {self.base_url}. "
-                "Make sure Ollama is installed and running. "
-                "You can start it with: ollama serve"
-            )
+        async def check(instance: Optional[str]):
+            url = f"{instance}/api/tags" if instance else "/api/tags"
+            try:
+                response = await self.client.get(url)
+                response.raise_for_status()
+            except httpx.ConnectError:
+                raise ConnectionError(
+                    f"Cannot connect to Ollama at {instance or self.base_url}. "
+                    "Make sure Ollama is installed and running. "
+                    "You can start it with: ollama serve"
+                )
+
+        await asyncio.gather(*(check(i) for i in self._instances()))
+        return True
 
     async def list_models(self) -> list[dict]:
         """
@@ -68,18 +271,80 @@ class OllamaClient:
 
         This calls GET /api/tags which returns info about each model:
         - name, size, modified date, etc.
+
+        With settings.model_endpoints, a model can live on its dedicated
+        instance only, so the listings of every instance (see _instances)
+        are merged, each model once.
+        """
+        listings = await asyncio.gather(*(self._instance_models(i) for i in self._instances()))
+        by_name = {m["name"]: m for listing in listings for m in listing}
+        return list(by_name.values())
+
+    async def _instance_models(self, instance: Optional[str]) -> list[dict]:
+        """
+        One instance's /api/tags listing (None = base_url).
+
+        Each listing is reused for MODELS_CACHE_TTL seconds, so health checks
+        and per-model availability checks in a row cost one request per
+        instance.
         """
-        response = await self.client.get("/api/tags")
+        now = time.monotonic()
+        cached = self._models_cache.get(instance)
+        if cached is not None and now - cached[0] < MODELS_CACHE_TTL:
+            return cached[1]
+
+        response = await self.client.get(f"{instance}/api/tags" if instance else "/api/tags")
         response.raise_for_status()
-        data = response.json()
-        return data.get("models", [])
+        models = orjson.loads(response.content).get("models", [])
+        self._models_cache[instance] = (now, models)
+        return models
 
     async def check_model_available(self, model_name: str) -> bool:
-        """Check if a specific model is downloaded."""
-        models = await self.list_models()
-        available_names = [m["name"] for m in models]
-        # Ollama sometimes adds ":latest" suffix, so check both forms
-        return model_name in available_names or f"{model_name}:latest" in available_names
+        """
+        Check if a specific model is downloaded - on every instance that
+        serves it (its settings.model_endpoints, or base_url).
+        """
+        listings = await asyncio.gather(
+            *(self._instance_models(i) for i in self._instances(model_name))
+        )
+        for models in listings:
+            available_names = {m["name"] for m in models}
+            # Ollama sometimes adds ":latest" suffix, so check both forms
+            if model_name not in available_names and f"{model_name}:latest" not in available_names:
+                return False
+        return True
+
+    def _build_payload(
+        self,
+        model: str,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        format_json: Union[bool, dict],
+        stream: bool = False,
+        options: Optional[dict] = None,
+    ) -> dict:
+        """Build the /api/generate request body."""
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": stream,
+            # Every request renews how long Ollama keeps the model loaded
+            "keep_alive": settings.ollama_keep_alive,
+            "options": {
+                "temperature": temperature,
+                **(options or {}),
+            },
+        }
+
+        if system_prompt:
+            payload["system"] = system_prompt
+
+        if format_json:
+            # A schema dict constrains decoding to that schema; True = any JSON
+            payload["format"] = format_json if isinstance(format_json, dict) else "json"
+
+        return payload
 
     async def generate(
         self,
@@ -87,7 +352,8 @@ class OllamaClient:
         prompt: str,
         system_prompt: Optional[str] = None,
         temperature: float = 0.1,
-        format_json: bool = False,
+        format_json: Union[bool, dict] = False,
+        options: Optional[dict] = None,
     ) -> dict:
         """
         Generate a response from a local LLM.
@@ -101,37 +367,30 @@ class OllamaClient:
                          factual responses - not creative fiction.
             format_json: If True, tells the model to respond in valid JSON.
                          This is crucial for parsing agent outputs reliably.
+                         A JSON Schema dict goes further: Ollama constrains
+                         decoding so the output always matches the schema.
+            options: Extra Ollama model options, e.g. {"num_predict": 1}.
 
         Returns:
             Dict with 'response' (the text), 'model', 'total_duration', etc.
         """
-        start_time = time.time()
-
-        payload = {
-            "model": model,
-            "prompt": prompt,
-            "stream": False,  # Get complete response at once (streaming comes in Week 3)
-            "options": {
-                "temperature": temperature,
-            },
-        }
+        start_time = time.perf_counter()
 
-        if system_prompt:
-            payload["system"] = system_prompt
-
-        if format_json:
-            payload["format"] = "json"
+        payload = self._build_payload(
+            model, prompt, system_prompt, temperature, format_json, options=options
+        )
 
         try:
-            response = await self.client.post("/api/generate", json=payload)
+            url = self._generate_url(model, system_prompt, prompt)
+            response = await self.client.post(url, json=payload)
             response.raise_for_status()
-            result = response.json()
+            result = orjson.loads(response.content)
 
-            elapsed = time.time() - start_time
-            result["elapsed_seconds"] = round(elapsed, 2)
+            elapsed = time.perf_counter() - start_time
+            result["elapsed_seconds"] = int(elapsed * 100) / 100
 
-            print(f"[Ollama] Model: {model} | Time: {elapsed:.1f}s | "
-                  f"Tokens: {result.get('eval_count', '?')}")
+            logger.debug("model=%s time=%.1fs tokens=%s",
+                         model, elapsed, result.get("eval_count", "?"))
 
             return result
 
@@ -154,6 +413,8 @@ class OllamaClient:
         prompt: str,
         system_prompt: Optional[str] = None,
         temperature: float = 0.1,
+        options: Optional[dict] = None,
+        json_schema: Optional[dict] = None,
     ) -> dict:
         """
         Generate a response and parse it as JSON.
@@ -161,7 +422,8 @@ class OllamaClient:
         WHY a separate method?
         Agents need structured output (findings as JSON), not free text.
         This method:
-        1. Tells Ollama to force JSON output format
+        1. Tells Ollama to force JSON output format (or, with json_schema,
+           output that matches that exact schema)
         2. Parses the response string into a Python dict
         3. Handles parsing errors gracefully
 
@@ -173,27 +435,151 @@ class OllamaClient:
             prompt=prompt,
             system_prompt=system_prompt,
             temperature=temperature,
-            format_json=True,
+            format_json=json_schema or True,
+            options=options,
         )
 
         response_text = result.get("response", "")
 
         try:
-            parsed = json.loads(response_text)
-            return {
-                "data": parsed,
-                "model": model,
-                "elapsed_seconds": result.get("elapsed_seconds", 0),
-                "eval_count": result.get("eval_count", 0),
-            }
-        except json.JSONDecodeError as e:
-            # LLMs sometimes produce invalid JSON despite being asked for JSON.
-            # In production, you'd retry or use a JSON repair library.
+            # orjson: C implementation, several times faster than stdlib json
+            parsed = orjson.loads(response_text)
+        except orjson.JSONDecodeError as e:
+            # LLMs sometimes produce invalid JSON despite being asked for JSON -
+            # usually a response cut off by num_predict. Salvage every finding
+            # that was completed before the cut; give up only if there is none.
+            items = FindingsStreamParser().feed(response_text)
+            if not items:
+                raise ValueError(
+                    f"Model returned invalid JSON: {e}\n"
+                    f"Raw response: {response_text[:500]}"
+                )
+            parsed = {"findings": items}
+
+        return {
+            "data": parsed,
+            "model": model,
+            "elapsed_seconds": result.get("elapsed_seconds", 0),
+            "eval_count": result.get("eval_count", 0),
+        }
+
+    async def generate_stream(
+        self,
+        model: str,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.1,
+        format_json: Union[bool, dict] = False,
+        options: Optional[dict] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Stream a response from a local LLM, one chunk at a time.
+
+        Same arguments as generate(). With "stream": true, Ollama sends
+        newline-delimited JSON objects while tokens are generated:
+            {"response": "tok", "done": false}
+            ...
+            {"response": "", "done": true, "eval_count": 123, ...}
+
+        The final (done) chunk also gets 'elapsed_seconds'.
+        """
+        start_time = time.perf_counter()
+
+        payload = self._build_payload(
+            model, prompt, system_prompt, temperature, format_json,
+            stream=True, options=options,
+        )
+
+        try:
+            url = self._generate_url(model, system_prompt, prompt)
+            async with self.client.stream("POST", url, json=payload) as response:
+                response.raise_for_status()
+
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = orjson.loads(line)
+
+                    if chunk.get("done"):
+                        elapsed = time.perf_counter() - start_time
+                        chunk["elapsed_seconds"] = int(elapsed * 100) / 100
+                        logger.debug("model=%s time=%.1fs tokens=%s (streamed)",
+                                     model, elapsed, chunk.get("eval_count", "?"))
+
+                    yield chunk
+
+        except httpx.TimeoutException:
+            raise TimeoutError(
+                f"Model '{model}' timed out after 120 seconds. "
+                "This can happen on first load. Try again - subsequent calls are faster."
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                raise ValueError(
+                    f"Model '{model}' not found. "
+                    f"Pull it with: ollama pull {model}"
+                )
+            raise
+
+    async def generate_json_stream(
+        self,
+        model: str,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.1,
+        options: Optional[dict] = None,
+        json_schema: Optional[dict] = None,
+        on_progress: Optional[Callable[[int], Awaitable[None]]] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Stream a JSON response and yield each finding as soon as it is complete.
+
+        WHY?
+        With generate_json() nothing can happen until the model has written
+        the last token. Here each object in the response's findings array is
+        yielded the moment its closing brace arrives, so callers can process
+        (and show) the first finding while the model is still writing the rest.
+
+        `on_progress` is awaited with the number of tokens generated so far
+        every PROGRESS_EVERY tokens (Ollama streams one token per chunk) - a
+        throttled heartbeat instead of one callback per token.
+
+        Raises ValueError at the end if the full response is not valid JSON
+        and not a single finding could be salvaged, mirroring generate_json().
+        """
+        parser = FindingsStreamParser()
+        salvaged = False
+        tokens = 0
+
+        async for chunk in self.generate_stream(
+            model=model,
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            format_json=json_schema or True,
+            options=options,
+        ):
+            text = chunk.get("response", "")
+            for item in parser.feed(text):
+                salvaged = True
+                yield item
+
+            if on_progress is not None and text:
+                tokens += 1
+                if tokens % PROGRESS_EVERY == 0:
+                    await on_progress(tokens)
+
+        try:
+            orjson.loads(parser.text)
+        except orjson.JSONDecodeError as e:
+            if salvaged:
+                return  # truncated, but every complete finding was yielded
             raise ValueError(
                 f"Model returned invalid JSON: {e}\n"
-                f"Raw response: {response_text[:500]}"
+                f"Raw response: {parser.text[:500]}"
             )
 
     async def close(self):
-        """Clean up the HTTP client."""
-        await self.client.aclose()
+        """Clean up the HTTP client (unless it was injected)."""
+        if self._owns_http_client:
+            await self.client.aclose()
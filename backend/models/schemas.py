@@ -11,11 +11,13 @@ catching errors early with clear messages instead of mysterious crashes later.
 These schemas define the "contract" between all parts of the system.
 """
 
+from collections import Counter
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from functools import cached_property
+from typing import Iterable, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, computed_field
 
 
 # ============================================================
@@ -35,6 +37,10 @@ class Severity(str, Enum):
     CRITICAL = "critical"
 
 
+# Severity -> rank (higher is worse), e.g. to keep the worse of two duplicates
+SEVERITY_RANK = {Severity.LOW: 1, Severity.MEDIUM: 2, Severity.HIGH: 3, Severity.CRITICAL: 4}
+
+
 class AgentType(str, Enum):
     """Each specialized agent in our system."""
     SECURITY = "security"
@@ -63,6 +69,8 @@ class Finding(BaseModel):
     This is the core output unit - every agent produces a list of these.
     The structured format makes it easy to display, filter, and sort in the UI.
     """
+    model_config = ConfigDict(frozen=True)
+
     agent: AgentType = Field(description="Which agent found this issue")
     severity: Severity = Field(description="How serious is this issue")
     title: str = Field(description="Short description, e.g. 'SQL Injection Risk'")
@@ -78,6 +86,70 @@ class Finding(BaseModel):
     )
 
 
+def dedupe_findings(findings: Iterable[Finding]) -> list[Finding]:
+    """
+    Merge findings that were reported more than once for the same spot.
+
+    WHY?
+    The Security and Standards agents often flag the same SQL-injection
+    line twice, and overlapping diff chunks can repeat a finding within one
+    agent. Counting both inflates total_findings and the severity badges.
+    Two findings are duplicates when they share file, line and title (case
+    and surrounding whitespace ignored). The whole title: the prompts ask
+    for "line_number": null, so most findings share line 0, and titles
+    that only differ at the end ("... user_id" / "... order_id") are
+    different issues. Of a duplicate
+    group the most severe one is kept - agents disagree on severity more
+    often than on the issue - and among equally severe ones the most
+    confident. One pass, first-seen order preserved. Takes any iterable, so
+    callers merging several agents' lists can pass a generator instead of
+    first building the concatenated list.
+    """
+    # Keyed on the tuple itself, not its hash(): the dict hashes it anyway,
+    # and compares keys on a hash match, so colliding findings stay apart
+    seen: dict[tuple[str, int, str], Finding] = {}
+    for f in findings:
+        fp = (
+            f.file_path or "",
+            f.line_number or 0,
+            f.title.strip().lower(),
+        )
+        kept = seen.get(fp)
+        if kept is None or (
+            (SEVERITY_RANK[f.severity], f.confidence)
+            > (SEVERITY_RANK[kept.severity], kept.confidence)
+        ):
+            seen[fp] = f
+    return list(seen.values())
+
+
+def _findings_json_schema() -> dict:
+    """
+    JSON Schema of an agent's LLM answer: {"findings": [Finding, ...]}.
+
+    Derived from Finding, minus the "agent" field (we fill that in, the
+    LLM doesn't). Sent as Ollama's `format`, it turns into a grammar that
+    constrains decoding: the model can only emit tokens that keep the
+    output valid, so no malformed JSON, no made-up keys or severities,
+    and a clean diff is answered with {"findings": []} in a few tokens.
+    """
+    finding = Finding.model_json_schema()
+    defs = finding.pop("$defs")
+    defs.pop("AgentType")
+    finding["properties"].pop("agent")
+    finding["required"].remove("agent")
+    return {
+        "$defs": defs,
+        "type": "object",
+        "properties": {"findings": {"type": "array", "items": finding}},
+        "required": ["findings"],
+    }
+
+
+# Built once at import and shared by every agent request
+FINDINGS_JSON_SCHEMA: dict = _findings_json_schema()
+
+
 class FileChange(BaseModel):
     """Represents a single file changed in a PR."""
     filename: str
@@ -103,6 +175,14 @@ class PRData(BaseModel):
     files: list[FileChange] = Field(default_factory=list)
     raw_diff: str = Field(default="", description="The full unified diff text")
 
+    @classmethod
+    def for_paste(cls, diff_text: str) -> "PRData":
+        """Placeholder metadata for a diff pasted directly instead of fetched from GitHub."""
+        return cls(
+            owner="local", repo="paste", pr_number=0,
+            title="Direct diff analysis", raw_diff=diff_text,
+        )
+
 
 # ============================================================
 # API Request/Response Models
@@ -132,12 +212,15 @@ class AgentResult(BaseModel):
     Each agent returns one of these. The orchestrator collects all of them
     and combines them into the final AnalysisResult.
     """
+    model_config = ConfigDict(frozen=True)
+
     agent: AgentType
     status: AnalysisStatus
     findings: list[Finding] = Field(default_factory=list)
     execution_time: float = Field(default=0.0, description="Seconds taken")
     model_used: str = Field(default="", description="Which LLM model was used")
     error: Optional[str] = Field(default=None, description="Error message if failed")
+    cache_hit: bool = Field(default=False, description="Served from the response cache")
 
 
 class AnalysisResult(BaseModel):
@@ -145,19 +228,67 @@ class AnalysisResult(BaseModel):
     The complete analysis result combining all agents.
 
     This is the OUTPUT of our system - what the user sees in the UI.
+
+    The counts are computed fields, derived from agent_results instead of
+    stored next to them: they can't drift from the findings, nobody has to
+    remember to fill them in, and they are still serialized like fields.
+    Frozen (like Finding and AgentResult): results are shared between
+    callers and caches, so nobody may change one in place - use
+    model_copy(update=...) instead.
     """
+    model_config = ConfigDict(frozen=True)
+
     id: str = Field(description="Unique analysis ID")
     pr_data: PRData
     agent_results: list[AgentResult] = Field(default_factory=list)
-    total_findings: int = 0
-    critical_count: int = 0
-    high_count: int = 0
-    medium_count: int = 0
-    low_count: int = 0
     total_execution_time: float = 0.0
     status: AnalysisStatus = AnalysisStatus.PENDING
     created_at: datetime = Field(default_factory=datetime.now)
 
+    @cached_property
+    def severity_counts(self) -> Counter:
+        """Severity -> count over all agents' findings, duplicates merged. One pass, computed once."""
+        return Counter(f.severity for f in dedupe_findings(
+            f for ar in self.agent_results for f in ar.findings
+        ))
+
+    def model_copy(self, *, update: Optional[dict] = None, deep: bool = False) -> "AnalysisResult":
+        """
+        model_copy() that forgets severity_counts.
+
+        The copy starts from this instance's __dict__, where cached_property
+        keeps its value - so a copy with other agent_results would report
+        (and serialize) the original's counts.
+        """
+        copy = super().model_copy(update=update, deep=deep)
+        copy.__dict__.pop("severity_counts", None)
+        return copy
+
+    @computed_field
+    @property
+    def total_findings(self) -> int:
+        return sum(self.severity_counts.values())
+
+    @computed_field
+    @property
+    def critical_count(self) -> int:
+        return self.severity_counts[Severity.CRITICAL]
+
+    @computed_field
+    @property
+    def high_count(self) -> int:
+        return self.severity_counts[Severity.HIGH]
+
+    @computed_field
+    @property
+    def medium_count(self) -> int:
+        return self.severity_counts[Severity.MEDIUM]
+
+    @computed_field
+    @property
+    def low_count(self) -> int:
+        return self.severity_counts[Severity.LOW]
+
 
 # ============================================================
 # WebSocket Event Models (for real-time updates)
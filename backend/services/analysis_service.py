@@ -22,14 +22,23 @@ PHASE 2 UPDATE:
     execution, and aggregation (combining results).
 """
 
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import datetime
+from secrets import token_hex
 from typing import Optional
 
 from backend.agents.orchestrator import PRReviewOrchestrator
+from backend.config import settings
 from backend.models.ollama_client import OllamaClient
 from backend.models.schemas import (
     AnalysisResult,
+    AnalysisStatus,
     PRData,
 )
+from backend.services.result_store import InMemoryResultStore, ResultStore
 
 
 class AnalysisService:
@@ -44,9 +53,26 @@ class AnalysisService:
         self.client = OllamaClient()
         self.orchestrator = PRReviewOrchestrator(ollama_client=self.client)
 
-        # In-memory store for analysis results
-        # Phase 4 will replace this with PostgreSQL
-        self._results: dict[str, AnalysisResult] = {}
+        # Finished analyses, for GET /api/analysis/{id} and /api/history.
+        # Bounded and expiring in memory; Phase 4 swaps in a database
+        # implementation of the same ResultStore interface.
+        self.store: ResultStore = InMemoryResultStore(
+            max_size=settings.result_store_size,
+            ttl=settings.result_store_ttl,
+        )
+
+        # Diff hash -> (time.monotonic() when stored, result of the last
+        # successful analysis of that diff). CI re-runs and re-submitted PRs
+        # skip every LLM call. Bounded: least recently used entries are
+        # evicted past settings.analysis_cache_size, and entries older than
+        # settings.analysis_cache_ttl are re-analyzed (models or prompts
+        # may have changed since).
+        self._cache: OrderedDict[str, tuple[float, AnalysisResult]] = OrderedDict()
+
+        # Diff hash -> the analysis of that diff currently running.
+        # Single-flight: a duplicate submission (webhook + manual retry)
+        # awaits the running analysis instead of starting a second one.
+        self._inflight: dict[str, asyncio.Future[AnalysisResult]] = {}
 
     async def analyze_diff(self, diff_text: str, pr_data: Optional[PRData] = None) -> AnalysisResult:
         """
@@ -59,29 +85,124 @@ class AnalysisService:
         Returns:
             AnalysisResult with combined findings from all 5 agents.
 
+        The agents run concurrently (the orchestrator gathers them), so the
+        wall time is the slowest agent's, not the sum of all five - provided
+        the Ollama server has enough parallel slots (see OLLAMA_NUM_PARALLEL
+        in backend/config.py).
+
         WHAT HAPPENS:
             1. Orchestrator fans out diff_text to all 5 agents in parallel
             2. Each agent analyzes independently (Security, Performance,
                Testing, Documentation, Standards)
             3. Results are aggregated into a single AnalysisResult
             4. Stored in memory for retrieval via GET /api/analysis/{id}
+
+        An identical diff that was already analyzed successfully is answered
+        from memory (keyed by its hash) without running any agent, and an
+        identical diff that is being analyzed right now shares that run.
         """
+        key = self._diff_key(diff_text)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return await self._for_pr(cached, diff_text, pr_data)
+
+        inflight = self._inflight.get(key)
+        started = inflight is None
+        if started:
+            inflight = asyncio.ensure_future(self._run(key, diff_text, pr_data))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # shield(): a caller that disconnects must not cancel the run
+        # the other callers are waiting for
+        result = await asyncio.shield(inflight)
+        # The run's own record (already stored) belongs to the caller that
+        # started it; callers that joined get records of their own
+        return result if started else await self._for_pr(result, diff_text, pr_data)
+
+    async def _run(self, key: str, diff_text: str, pr_data: Optional[PRData]) -> AnalysisResult:
+        """Run the orchestrator once for a diff, then store (and cache) the result."""
         result = await self.orchestrator.run(diff_text, pr_data=pr_data)
 
         # Store for later retrieval
-        self._results[result.id] = result
+        await self.store.put(result)
+
+        # Only cache complete answers - a failed agent should be retried
+        if all(ar.status == AnalysisStatus.COMPLETED for ar in result.agent_results):
+            self._cache_put(key, result)
+
+        return result
+
+    async def _for_pr(
+        self, result: AnalysisResult, diff_text: str, pr_data: Optional[PRData],
+    ) -> AnalysisResult:
+        """
+        Hand a shared result to a caller as a new analysis record.
+
+        Every submission gets its own id and timestamp, and is stored: the
+        diff cache can outlive the result store's copy of the first run
+        (so its id could 404 on GET /api/analysis/{id}), and a re-submission
+        belongs in /api/history. The findings are reused; the PR metadata is
+        the caller's - a pasted diff is labelled like the orchestrator labels
+        it, so a paste that hits a fetched PR's result does not show that PR.
+        """
+        pr_data = pr_data or PRData.for_paste(diff_text)
+        update = {"id": token_hex(4), "created_at": datetime.now()}
+        if pr_data != result.pr_data:
+            update["pr_data"] = pr_data
+        result = result.model_copy(update=update)
+        await self.store.put(result)
+        return result
 
+    def _cache_get(self, key: str) -> Optional[AnalysisResult]:
+        """The cached analysis of a diff, or None if missing or expired."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+
+        stored_at, result = entry
+        if time.monotonic() - stored_at > settings.analysis_cache_ttl:
+            del self._cache[key]
+            return None
+
+        self._cache.move_to_end(key)
         return result
 
-    def get_result(self, analysis_id: str) -> Optional[AnalysisResult]:
+    def _cache_put(self, key: str, result: AnalysisResult):
+        """Cache an analysis, evicting the least recently used ones if full."""
+        self._cache[key] = (time.monotonic(), result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > settings.analysis_cache_size:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _diff_key(diff_text: str) -> str:
+        """Content address of a diff: 16-byte BLAKE2b, hex encoded."""
+        return hashlib.blake2b(diff_text.encode(), digest_size=16).hexdigest()
+
+    async def warmup(self) -> list[str]:
+        """
+        Load every agent model into Ollama (one 1-token request per model).
+
+        Called once from the API lifespan, so the first real analysis does
+        not pay for loading weights. Requests carry keep_alive
+        (settings.ollama_keep_alive), so the models then stay loaded.
+        Returns the models that were warmed up.
+        """
+        return await self.orchestrator.warmup()
+
+    async def aclose(self):
+        """Close the Ollama connection pool and the response cache (called on API shutdown)."""
+        await self.orchestrator.aclose()
+        await self.client.close()
+
+    async def get_result(self, analysis_id: str) -> Optional[AnalysisResult]:
         """Retrieve a previous analysis result by ID."""
-        return self._results.get(analysis_id)
+        return await self.store.get(analysis_id)
 
-    def get_history(self, limit: int = 20) -> list[AnalysisResult]:
-        """Get recent analysis results, newest first."""
-        results = list(self._results.values())
-        results.sort(key=lambda r: r.created_at, reverse=True)
-        return results[:limit]
+    async def get_history(self, limit: int = 20) -> list[AnalysisResult]:
+        """Get recent analysis results, newest first (in storing order - no sort)."""
+        return await self.store.history(limit)
 
     async def check_health(self) -> dict:
         """
@@ -104,10 +225,17 @@ class AnalysisService:
             models = await self.client.list_models()
             health["models_available"] = [m["name"] for m in models]
 
-            # Check which agents have their required models
-            for name, agent in self.orchestrator.agents.items():
-                if await self.client.check_model_available(agent.model):
-                    health["agents_ready"].append(name)
+            # Check which agents have their required models, each on the
+            # instance(s) that serve it (settings.model_endpoints). Listings
+            # are cached by the client: one /api/tags call per instance, not
+            # one per agent, and once per distinct model.
+            agent_models = {agent.model for agent in self.orchestrator.agents.values()}
+            ready = dict(zip(agent_models, await asyncio.gather(
+                *(self.client.check_model_available(m) for m in agent_models)
+            )))
+            health["agents_ready"] = [
+                name for name, agent in self.orchestrator.agents.items() if ready[agent.model]
+            ]
 
         except Exception as e:
             health["status"] = "degraded"
@@ -12,6 +12,12 @@ AUTHENTICATION:
     - With a token: 5,000 requests/hour (needed for real use)
     - Set GITHUB_TOKEN in your .env file
 
+RATE LIMITS:
+    When a limit is hit, GitHub answers 429 (or 403 with
+    X-RateLimit-Remaining: 0) and says when to come back: Retry-After
+    (seconds) or X-RateLimit-Reset (epoch). Short waits are slept through
+    and the request retried (see _send); long ones fail immediately.
+
 DIFF FORMAT:
     GitHub returns diffs in "unified diff" format:
     ```
@@ -27,14 +33,40 @@ DIFF FORMAT:
     Our agents focus on + lines (new code being introduced).
 """
 
+import asyncio
+import importlib.util
+import random
 import re
-from typing import Optional
+import time
+from collections import OrderedDict
+from typing import Any, Optional
 
 import httpx
+import orjson
 
 from backend.config import settings
 from backend.models.schemas import FileChange, PRData
 
+# Files per page of GET .../pulls/{n}/files - GitHub's maximum (default 30)
+FILES_PER_PAGE = 100
+
+# GitHub lists at most 3000 files of a PR, i.e. 30 pages of FILES_PER_PAGE
+MAX_FILE_PAGES = 30
+
+# GitHub PR URLs: https://github.com/owner/repo/pull/123 (optional trailing "/").
+# Used with fullmatch(), so nothing may follow the PR number. re.ASCII: \d and
+# \s only need to know ASCII, not the Unicode tables.
+PR_URL_PATTERN = re.compile(
+    r"https?://github\.com/([^/\s]+)/([^/\s]+)/pull/(\d+)/?", re.ASCII
+)
+
+# HTTP/2 needs the optional h2 package; without it httpx refuses http2=True
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Max API responses kept for ETag revalidation (least recently used evicted).
+# A PR takes two entries (more with several file pages).
+ETAG_CACHE_SIZE = 512
+
 
 class GitHubService:
     """
@@ -45,12 +77,6 @@ class GitHubService:
         pr_data = await service.fetch_pr_from_url("https://github.com/owner/repo/pull/123")
     """
 
-    # Regex to parse GitHub PR URLs
-    # Matches: https://github.com/owner/repo/pull/123
-    PR_URL_PATTERN = re.compile(
-        r"https?://github\.com/([^/]+)/([^/]+)/pull/(\d+)"
-    )
-
     def __init__(self, token: Optional[str] = None):
         self.token = token or settings.github_token
         headers = {
@@ -60,12 +86,30 @@ class GitHubService:
         if self.token:
             headers["Authorization"] = f"Bearer {self.token}"
 
+        # One pooled client for all GitHub calls. api.github.com speaks
+        # HTTP/2, so the concurrent requests of a fetch (metadata, file pages)
+        # share one TLS connection instead of a handshake each - when h2 is
+        # installed (httpx[http2] in requirements.txt), else HTTP/1.1
+        # keep-alive. retries=2 re-attempts failed connects only (never a
+        # request GitHub has answered); connect gets its own short timeout.
         self.client = httpx.AsyncClient(
             base_url="https://api.github.com",
             headers=headers,
-            timeout=30.0,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            transport=httpx.AsyncHTTPTransport(
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+                retries=2,
+            ),
         )
 
+        # API path -> (ETag, parsed JSON, Link header) of its last 200 response.
+        # Re-fetching an unchanged PR revalidates with If-None-Match: GitHub
+        # answers 304 with no body, and 304s don't count against the rate limit.
+        # LRU-bounded to ETAG_CACHE_SIZE entries, so a long-running server
+        # does not keep every PR it ever fetched.
+        self._etags: OrderedDict[str, tuple[str, Any, dict]] = OrderedDict()
+
     def parse_pr_url(self, url: str) -> tuple[str, str, int]:
         """
         Extract owner, repo, and PR number from a GitHub URL.
@@ -73,7 +117,7 @@ class GitHubService:
         "https://github.com/facebook/react/pull/12345"
         -> ("facebook", "react", 12345)
         """
-        match = self.PR_URL_PATTERN.match(url.strip())
+        match = PR_URL_PATTERN.fullmatch(url.strip())
         if not match:
             raise ValueError(
                 f"Invalid GitHub PR URL: {url}\n"
@@ -85,39 +129,48 @@ class GitHubService:
         """
         Fetch complete PR data from GitHub API.
 
-        Makes 2 API calls:
+        Makes 2 API calls, concurrently - neither needs the other's answer,
+        so the fetch takes one round trip instead of two:
         1. GET /repos/{owner}/{repo}/pulls/{pr_number} -> PR metadata
         2. GET /repos/{owner}/{repo}/pulls/{pr_number}/files -> changed files with patches
-        """
-        # Fetch PR metadata
-        pr_response = await self.client.get(
-            f"/repos/{owner}/{repo}/pulls/{pr_number}"
-        )
 
-        if pr_response.status_code == 404:
-            raise ValueError(f"PR not found: {owner}/{repo}#{pr_number}")
-        if pr_response.status_code == 403:
-            raise PermissionError(
-                "GitHub API rate limit exceeded. Set GITHUB_TOKEN in .env for higher limits."
-            )
-        pr_response.raise_for_status()
-        pr_data = pr_response.json()
+        The files list is paginated. Pages ask for per_page=100, GitHub's
+        maximum (default 30). If the first page's Link header points to a
+        rel="last" page, pages 2..last are then fetched concurrently - one
+        more round trip however many pages - and appended in page order.
+        PRs with more than 100 files are no longer cut off after page 1.
 
-        # Fetch changed files (includes the diff patches)
-        files_response = await self.client.get(
-            f"/repos/{owner}/{repo}/pulls/{pr_number}/files"
+        All are conditional requests (see _get_json), so analyzing the same
+        PR again mostly costs 304s.
+        """
+        pr_ref = f"{owner}/{repo}#{pr_number}"
+        path = f"/repos/{owner}/{repo}/pulls/{pr_number}"
+        files_path = f"{path}/files?per_page={FILES_PER_PAGE}"
+        pr_data, (files_data, links) = await asyncio.gather(
+            self._get_json(path, pr_ref),
+            self._get_json_page(files_path, pr_ref),
         )
-        files_response.raise_for_status()
-        files_data = files_response.json()
+
+        last_page = self._last_page(links)
+        if last_page > 1:
+            pages = await asyncio.gather(*(
+                self._get_json(f"{files_path}&page={page}", pr_ref)
+                for page in range(2, last_page + 1)
+            ))
+            files_data = [*files_data, *(f for page in pages for f in page)]
 
         # Parse file changes
         files = []
         raw_diff_parts = []
 
         for file_info in files_data:
-            patch = file_info.get("patch", "")
-            file_change = FileChange(
-                filename=file_info["filename"],
+            filename = file_info["filename"]
+            patch = file_info.get("patch") or ""
+            # model_construct(): GitHub's API guarantees these types, so the
+            # per-field validation of FileChange(...) - hundreds of times for
+            # a big PR - buys nothing. PRData below is still validated.
+            file_change = FileChange.model_construct(
+                filename=filename,
                 status=file_info["status"],
                 additions=file_info.get("additions", 0),
                 deletions=file_info.get("deletions", 0),
@@ -125,15 +178,16 @@ class GitHubService:
             )
             files.append(file_change)
 
-            # Build the full diff text from all file patches
+            # Build the full diff text from all file patches. The pieces go
+            # into one flat list that is joined once at the end: a patch
+            # (the bulk of a big PR) is copied exactly once, into raw_diff,
+            # instead of first into a per-file f-string and then again.
             if patch:
-                raw_diff_parts.append(
-                    f"--- a/{file_info['filename']}\n"
-                    f"+++ b/{file_info['filename']}\n"
-                    f"{patch}"
-                )
+                if raw_diff_parts:
+                    raw_diff_parts.append("\n\n")
+                raw_diff_parts += ("--- a/", filename, "\n+++ b/", filename, "\n", patch)
 
-        raw_diff = "\n\n".join(raw_diff_parts)
+        raw_diff = "".join(raw_diff_parts)
 
         return PRData(
             owner=owner,
@@ -146,6 +200,118 @@ class GitHubService:
             raw_diff=raw_diff,
         )
 
+    async def _get_json(self, path: str, pr_ref: str) -> Any:
+        """GET a JSON resource (see _get_json_page), without its links."""
+        data, _ = await self._get_json_page(path, pr_ref)
+        return data
+
+    async def _get_json_page(self, path: str, pr_ref: str) -> tuple[Any, dict]:
+        """
+        GET a JSON resource, revalidating our cached copy by its ETag.
+
+        Returns the cached JSON on 304 Not Modified, else the fresh body
+        (and remembers its ETag for next time) - together with the parsed
+        Link header (response.links: rel -> {"url": ...}), which tells
+        whether more pages follow. The links are cached with the body, as
+        a 304 need not repeat them.
+
+        The body is parsed by orjson straight from the raw bytes: the files
+        list of a big PR is megabytes of JSON, and response.json() would
+        first decode it to a str and then walk it with the stdlib parser,
+        all on the event loop other fetches are waiting for.
+        """
+        cached = self._etags.get(path)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        response = await self._send(path, headers)
+
+        if response.status_code == 304 and cached:
+            self._etags.move_to_end(path)
+            return cached[1], cached[2]
+        if response.status_code == 404:
+            raise ValueError(f"PR not found: {pr_ref}")
+        if response.status_code in (403, 429):
+            raise PermissionError(
+                "GitHub API rate limit exceeded. Set GITHUB_TOKEN in .env for higher limits."
+            )
+        response.raise_for_status()
+
+        data = orjson.loads(response.content)
+        links = response.links
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etags[path] = (etag, data, links)
+            self._etags.move_to_end(path)
+            if len(self._etags) > ETAG_CACHE_SIZE:
+                self._etags.popitem(last=False)
+        return data, links
+
+    @staticmethod
+    def _last_page(links: dict) -> int:
+        """
+        Number of the last page, from a Link header's rel="last" URL.
+
+        1 when there is no such link (everything fit on one page). Capped at
+        MAX_FILE_PAGES, GitHub's own limit for a PR's file list.
+        """
+        url = links.get("last", {}).get("url")
+        if not url:
+            return 1
+        try:
+            return min(int(httpx.URL(url).params.get("page", 1)), MAX_FILE_PAGES)
+        except ValueError:
+            return 1
+
+    async def _send(self, path: str, headers: Optional[dict]) -> httpx.Response:
+        """
+        GET a path, retrying while GitHub says we are rate limited.
+
+        Up to settings.github_max_retries retries, each after the wait GitHub
+        asks for (_retry_delay). If that wait is longer than
+        settings.github_max_retry_wait - e.g. the hourly quota resets in 40
+        minutes - the rate-limited response is returned at once for the
+        caller to report. So is anything that is not a rate limit.
+        """
+        for attempt in range(settings.github_max_retries + 1):
+            response = await self.client.get(path, headers=headers)
+            if not self._is_rate_limited(response) or attempt == settings.github_max_retries:
+                return response
+
+            delay = self._retry_delay(response, attempt)
+            if delay > settings.github_max_retry_wait:
+                return response
+            await asyncio.sleep(delay)
+        return response
+
+    @staticmethod
+    def _is_rate_limited(response: httpx.Response) -> bool:
+        """429, or a 403 that is a rate limit rather than missing access."""
+        if response.status_code == 429:
+            return True
+        return response.status_code == 403 and (
+            response.headers.get("X-RateLimit-Remaining") == "0"
+            or "Retry-After" in response.headers
+        )
+
+    @staticmethod
+    def _retry_delay(response: httpx.Response, attempt: int) -> float:
+        """
+        Seconds to wait before retrying a rate-limited request.
+
+        Retry-After (secondary limits) wins, then X-RateLimit-Reset (primary
+        limit exhausted); without either, exponential backoff with jitter:
+        ~1s, 2s, 4s...
+        """
+        try:
+            return float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            pass
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            try:
+                return max(0.0, float(response.headers["X-RateLimit-Reset"]) - time.time())
+            except (KeyError, ValueError):
+                pass
+        return 2 ** attempt + random.random()
+
     async def fetch_pr_from_url(self, url: str) -> PRData:
         """
         Convenience method: parse URL and fetch PR data in one call.
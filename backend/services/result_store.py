@@ -0,0 +1,95 @@
+"""
+Result Store - Where finished analyses are kept for GET /api/analysis/{id}.
+
+WHY an interface instead of a plain dict?
+The service only needs three operations: store a result, fetch one by id,
+list the most recent ones. Putting them behind ResultStore means the
+Phase 4 database (PostgreSQL, or Redis) is a new class with the same three
+async methods - AnalysisService and the routes don't change.
+
+Until then, InMemoryResultStore keeps results in this process:
+
+    - BOUNDED: at most max_size results; the oldest is dropped first.
+      A long-running server no longer keeps every analysis it ever made
+      (each one holds its whole PR diff).
+    - TTL: results older than ttl seconds are gone, like an expiring cache.
+
+The methods are async although the dict is not: a database store does I/O
+there, and callers already await. No asyncio.Lock either - none of the
+methods awaits anything, so on the event loop each one runs to completion
+before any other coroutine can touch the dict.
+"""
+
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import Optional, Protocol
+
+from backend.models.schemas import AnalysisResult
+
+
+class ResultStore(Protocol):
+    """What AnalysisService needs from a place to keep results."""
+
+    async def put(self, result: AnalysisResult) -> None:
+        """Store a result under its id."""
+        ...
+
+    async def get(self, analysis_id: str) -> Optional[AnalysisResult]:
+        """The result with this id, or None if unknown or expired."""
+        ...
+
+    async def history(self, limit: int) -> list[AnalysisResult]:
+        """Up to `limit` results, newest first."""
+        ...
+
+
+class InMemoryResultStore:
+    """
+    Bounded, expiring ResultStore in a dict (see the module docstring).
+
+    Entries are kept in insertion order with the time they were stored,
+    so the oldest ones - first to go for both the size bound and the TTL -
+    are always at the front, and history() reads the newest off the end.
+    """
+
+    def __init__(self, max_size: int = 1000, ttl: float = 86400.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, AnalysisResult]] = OrderedDict()
+
+    async def put(self, result: AnalysisResult) -> None:
+        self._entries[result.id] = (time.monotonic(), result)
+        self._entries.move_to_end(result.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        self._evict_expired()
+
+    async def get(self, analysis_id: str) -> Optional[AnalysisResult]:
+        entry = self._entries.get(analysis_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > self.ttl:
+            del self._entries[analysis_id]
+            return None
+        return entry[1]
+
+    async def history(self, limit: int) -> list[AnalysisResult]:
+        self._evict_expired()
+        # Results are stored as they are created, so the newest are at the
+        # end: walk back `limit` entries - O(limit), no sorting at all.
+        # islice() rejects negative counts; a negative limit means none.
+        entries = reversed(self._entries.values())
+        return [result for _, result in islice(entries, max(limit, 0))]
+
+    def _evict_expired(self):
+        """Drop expired entries - all at the front, so stop at the first fresh one."""
+        cutoff = time.monotonic() - self.ttl
+        while self._entries:
+            stored_at, _ = next(iter(self._entries.values()))
+            if stored_at >= cutoff:
+                break
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
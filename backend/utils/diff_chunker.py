@@ -0,0 +1,186 @@
+"""
+Diff chunking - split a unified diff into one piece per file.
+
+WHY?
+Agents embed the diff verbatim in their prompt. A 50-file PR can overflow
+the model's context window (and gets silently truncated), and even when it
+fits, attention cost grows quadratically with prompt length:
+
+    1 prompt  x 10K tokens  ->  ~100M attention ops
+    10 prompts x 1K tokens  ->  ~10M attention ops
+
+Per-file prompts are also independent, so they can run in parallel.
+
+A git diff marks the start of every file with a header line:
+
+    diff --git a/backend/api/main.py b/backend/api/main.py
+
+Diffs rebuilt from GitHub's API (GitHubService.fetch_pr) have no such
+line - each file starts with the bare "--- a/" / "+++ b/" pair instead -
+so that pair is the fallback header. Either way, splitting is a single
+scan for those headers. Small files are then packed back together
+(batch()) so every prompt is as full as the model's context budget
+allows - fewer, fuller requests instead of one per file. A single file
+too big for the budget is cut at its "@@" hunk headers, each piece
+keeping the file's header lines.
+
+All agents review the SAME diff, so ParsedDiff does that work once per
+analysis: the orchestrator wraps the text and every agent reads the
+shared split (and the packing for its budget) instead of re-scanning it.
+"""
+
+import re
+from typing import Optional
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count: ~4 characters per token for code and English.
+
+    Good enough for budgeting prompts without loading each model's
+    tokenizer (Ollama does not expose one).
+    """
+    return (len(text) + 3) // 4
+
+
+class DiffSplitter:
+    """
+    Splits unified diffs at their `diff --git` file headers, or at the
+    `--- a/` + `+++ b/` pairs when there are none (GitHub API format).
+
+    Usage:
+        for file_path, file_diff in DiffSplitter.split(diff_text):
+            ...
+
+        for prompt_diff in DiffSplitter.batch(diff_text, max_tokens=2000):
+            ...
+    """
+
+    # "diff --git a/old/path b/new/path" -> the new path
+    FILE_HEADER_PATTERN = re.compile(r"^diff --git a/\S+ b/(\S+)", re.MULTILINE)
+
+    # "--- a/old/path" followed by "+++ b/new/path" -> the new path. Only
+    # used when there are no `diff --git` lines: inside a git diff the same
+    # pair repeats under every header and would split each file twice.
+    BARE_HEADER_PATTERN = re.compile(r"^--- \S+.*\n\+\+\+ b/(\S+)", re.MULTILINE)
+
+    # "@@ -12,7 +12,9 @@" - where each hunk of a file diff starts
+    HUNK_HEADER_PATTERN = re.compile(r"^@@ ", re.MULTILINE)
+
+    @classmethod
+    def split(cls, diff_text: str) -> list[tuple[str, str]]:
+        """
+        Return (file_path, file_diff) pairs, in diff order.
+
+        Text without any file header (a pasted snippet) comes back as a
+        single ("", diff_text) pair, so callers never get an empty list
+        for non-empty input.
+        """
+        headers = list(cls.FILE_HEADER_PATTERN.finditer(diff_text))
+        if not headers:
+            headers = list(cls.BARE_HEADER_PATTERN.finditer(diff_text))
+        if not headers:
+            return [("", diff_text)] if diff_text else []
+
+        ends = [m.start() for m in headers[1:]] + [len(diff_text)]
+        return [
+            (match.group(1), diff_text[match.start():end])
+            for match, end in zip(headers, ends)
+        ]
+
+    @classmethod
+    def batch(cls, diff_text: str, max_tokens: int) -> list[str]:
+        """
+        Split per file, then pack consecutive files into chunks of at most
+        max_tokens (estimated). A file larger than the budget is split at
+        its hunks instead (see split_hunks); only a single hunk, or text
+        without any headers, larger than the budget still becomes an
+        oversized chunk of its own.
+        """
+        return cls.pack(cls.split(diff_text), max_tokens)
+
+    @classmethod
+    def split_hunks(cls, file_diff: str, max_tokens: int) -> list[str]:
+        """
+        A file diff cut into pieces of at most max_tokens at its "@@" hunk
+        headers - whole hunks only, each piece under a copy of the file's
+        header lines, so every piece is still a valid diff of that file.
+
+        A diff that fits, or has fewer than two hunks, is returned as is.
+        """
+        if estimate_tokens(file_diff) <= max_tokens:
+            return [file_diff]
+        hunks = [m.start() for m in cls.HUNK_HEADER_PATTERN.finditer(file_diff)]
+        if len(hunks) < 2:
+            return [file_diff]
+
+        header = file_diff[:hunks[0]]
+        bodies = [file_diff[start:end] for start, end in zip(hunks, hunks[1:] + [len(file_diff)])]
+        budget = max_tokens - estimate_tokens(header)
+        return [header + "".join(group) for group in cls._group(bodies, budget)]
+
+    @classmethod
+    def pack(cls, files: list[tuple[str, str]], max_tokens: int) -> list[str]:
+        """Pack already split (file_path, file_diff) pairs - see batch()."""
+        pieces = [piece for _, file_diff in files for piece in cls.split_hunks(file_diff, max_tokens)]
+        return ["".join(group) for group in cls._group(pieces, max_tokens)]
+
+    @staticmethod
+    def _group(pieces: list[str], max_tokens: int) -> list[list[str]]:
+        """Consecutive pieces in groups of at most max_tokens; a larger piece stands alone."""
+        groups: list[list[str]] = []
+        current: list[str] = []
+        current_tokens = 0
+
+        for piece in pieces:
+            tokens = estimate_tokens(piece)
+            if current and current_tokens + tokens > max_tokens:
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += tokens
+
+        if current:
+            groups.append(current)
+        return groups
+
+
+class ParsedDiff:
+    """
+    One diff, split once, shared by every agent that reviews it.
+
+    Five agents receive the same diff. With plain text, each one would
+    re-scan it for file headers and re-slice every file to build its
+    chunks - five times the work for identical results. A ParsedDiff is
+    created once per analysis and passed to all of them:
+
+        parsed = ParsedDiff(diff_text)
+        await asyncio.gather(*(agent.analyze(parsed) for agent in agents))
+
+    Everything is computed lazily and kept: the token estimate up front
+    (one len()), the per-file split on first use (small diffs that fit in
+    one prompt never need it), and the packed chunks per token budget
+    (agents sharing a model share a budget, so the second one gets the
+    first one's list). Treat it as read-only - agents run concurrently on
+    the same object.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = estimate_tokens(text)
+        self._files: Optional[list[tuple[str, str]]] = None
+        self._batches: dict[int, list[str]] = {}
+
+    @property
+    def files(self) -> list[tuple[str, str]]:
+        """(file_path, file_diff) pairs, as DiffSplitter.split() returns them."""
+        if self._files is None:
+            self._files = DiffSplitter.split(self.text)
+        return self._files
+
+    def batch(self, max_tokens: int) -> list[str]:
+        """The diff packed into chunks of at most max_tokens - see DiffSplitter.batch()."""
+        chunks = self._batches.get(max_tokens)
+        if chunks is None:
+            chunks = self._batches[max_tokens] = DiffSplitter.pack(self.files, max_tokens)
+        return chunks
@@ -0,0 +1,22 @@
+"""
+Run a script's main() coroutine on the fastest event loop available.
+
+uvloop (libuv, in C - see backend/requirements.txt) where installed; it
+has no Windows build, so the stdlib asyncio loop there. Used by the
+root-level check scripts:
+
+    if __name__ == "__main__":
+        run(main())
+"""
+
+import asyncio
+from typing import Any, Coroutine
+
+
+def run(main: Coroutine[Any, Any, Any]) -> Any:
+    """asyncio.run(), on uvloop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+    return uvloop.run(main)
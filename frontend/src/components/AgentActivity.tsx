@@ -5,6 +5,7 @@
  *   - waiting (gray, not started)
  *   - running (blue, pulsing)
  *   - completed (green, with findings count)
+ *   - skipped (dimmed, triage found nothing for this agent)
  *   - error (red)
  *
  * This is what makes the demo impressive: you see agents
@@ -31,6 +32,7 @@ function StatusDot({ status }: { status: AgentStatus["status"] }) {
     waiting: "bg-gray-600",
     running: "bg-blue-500 animate-pulse",
     completed: "bg-green-500",
+    skipped: "bg-gray-700",
     error: "bg-red-500",
   };
 
@@ -61,7 +63,9 @@ export function AgentActivity({
                   ? "bg-blue-500/10 border border-blue-500/30"
                   : agent.status === "completed"
                     ? "bg-green-500/10 border border-green-500/30"
-                    : "bg-gray-800/50 border border-transparent"
+                    : agent.status === "skipped"
+                      ? "bg-gray-800/50 border border-transparent opacity-50"
+                      : "bg-gray-800/50 border border-transparent"
               }`}
             >
               {/* Agent icon */}
@@ -84,7 +88,9 @@ export function AgentActivity({
                 </div>
                 <div className="text-xs text-gray-400">
                   {agent.status === "waiting" && "Waiting..."}
-                  {agent.status === "running" && "Analyzing..."}
+                  {agent.status === "skipped" && "Skipped - nothing to review"}
+                  {agent.status === "running" &&
+                    (agent.tokens ? `Analyzing... (${agent.tokens} tokens)` : "Analyzing...")}
                   {agent.status === "completed" &&
                     `Found ${agent.findingsCount ?? 0} issues in ${(agent.executionTime ?? 0).toFixed(1)}s`}
                   {agent.status === "error" && "Failed"}
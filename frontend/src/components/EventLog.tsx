@@ -13,9 +13,9 @@ interface EventLogProps {
   events: WSEvent[];
 }
 
-function formatTime(timestamp: string): string {
+function formatTime(timestamp: number): string {
   try {
-    const date = new Date(timestamp);
+    const date = new Date(timestamp * 1000);
     return date.toLocaleTimeString("en-US", {
       hour12: false,
       hour: "2-digit",
@@ -32,7 +32,9 @@ const EVENT_COLORS: Record<string, string> = {
   fetch_completed: "text-green-400",
   analysis_started: "text-blue-400",
   agent_started: "text-cyan-400",
+  agent_finding: "text-orange-400",
   agent_completed: "text-green-400",
+  analysis_progress: "text-blue-300",
   analysis_completed: "text-green-300",
   error: "text-red-400",
 };
@@ -62,7 +62,10 @@ export function useAnalysis() {
 
   const handleEvent = useCallback(
     (event: WSEvent) => {
-      setEvents((prev) => [...prev, event]);
+      // Progress heartbeats only update the agent card, not the event log
+      if (event.event_type !== "agent_thinking") {
+        setEvents((prev) => [...prev, event]);
+      }
 
       switch (event.event_type) {
         case "fetch_started":
@@ -73,13 +76,20 @@ export function useAnalysis() {
           // PR metadata received
           break;
 
-        case "analysis_started":
+        case "analysis_started": {
           setConnectionState("analyzing");
-          // Mark all agents as running
+          // Agents stay "waiting" until their own agent_started: the backend
+          // runs at most max_concurrent_agents at a time. Agents triage left
+          // out of data.agents never start - they are skipped.
+          const selected = (event.data?.agents as AgentType[] | undefined) ?? AGENTS;
           setAgentStatuses(
-            AGENTS.map((name) => ({ name, status: "running" }))
+            AGENTS.map((name): AgentStatus => ({
+              name,
+              status: selected.includes(name) ? "waiting" : "skipped",
+            }))
           );
           break;
+        }
 
         case "agent_started":
           if (event.agent) {
@@ -87,6 +97,26 @@ export function useAnalysis() {
           }
           break;
 
+        case "agent_thinking":
+          if (event.agent && event.data) {
+            updateAgent(event.agent, { tokens: event.data.tokens as number });
+          }
+          break;
+
+        case "agent_finding":
+          // A finding streamed in while the agent is still generating
+          if (event.agent) {
+            const agentName = event.agent;
+            setAgentStatuses((prev) =>
+              prev.map((a) =>
+                a.name === agentName
+                  ? { ...a, findingsCount: (a.findingsCount ?? 0) + 1 }
+                  : a
+              )
+            );
+          }
+          break;
+
         case "agent_completed":
           if (event.agent && event.data) {
             updateAgent(event.agent, {
@@ -100,7 +130,14 @@ export function useAnalysis() {
         case "analysis_completed":
           setConnectionState("completed");
           if (event.data) {
-            setResult(event.data as unknown as AnalysisResult);
+            const final = event.data as unknown as AnalysisResult;
+            setResult(final);
+            // Nothing to review: no agent ran (and no analysis_started came)
+            if (final.agent_results.length === 0) {
+              setAgentStatuses(
+                AGENTS.map((name): AgentStatus => ({ name, status: "skipped" }))
+              );
+            }
           }
           break;
 
@@ -139,13 +176,17 @@ export function useAnalysis() {
       ws.onopen = () => {
         setConnectionState("connected");
         // Send the analysis request
-        ws.send(JSON.stringify(input));
+        // Binary frame: the server hands the UTF-8 bytes straight to its JSON parser
+        ws.send(new TextEncoder().encode(JSON.stringify(input)));
       };
 
       ws.onmessage = (msg) => {
         try {
-          const event: WSEvent = JSON.parse(msg.data);
-          handleEvent(event);
+          // One event, or a burst of events coalesced into one frame
+          const parsed: WSEvent | WSEvent[] = JSON.parse(msg.data);
+          for (const event of Array.isArray(parsed) ? parsed : [parsed]) {
+            handleEvent(event);
+          }
         } catch {
           console.error("Failed to parse WebSocket message:", msg.data);
         }
@@ -33,6 +33,7 @@ export interface AgentResult {
   execution_time: number;
   model_used: string;
   error: string | null;
+  cache_hit: boolean;
 }
 
 export interface PRData {
@@ -73,15 +74,18 @@ export interface WSEvent {
   agent: AgentType | null;
   message: string;
   data: Record<string, unknown> | null;
-  timestamp: string;
+  /** Unix epoch seconds */
+  timestamp: number;
 }
 
 /** State of each agent during real-time analysis */
 export interface AgentStatus {
   name: AgentType;
-  status: "waiting" | "running" | "completed" | "error";
+  /** skipped: triage decided the agent has nothing to review in this diff */
+  status: "waiting" | "running" | "completed" | "skipped" | "error";
   findingsCount?: number;
   executionTime?: number;
+  tokens?: number;
 }
 
 /** Overall connection state */
@@ -0,0 +1,75 @@
+"""
+Sample code with the performance problems FIXED.
+The "after" counterpart of performance_problems.py.
+
+Used to check that the Performance Agent does not flag code that is
+already efficient (false positives). Ideally it reports nothing here,
+or only low-severity remarks.
+"""
+
+import asyncio
+
+import numpy as np
+from numba import njit
+
+
+# Fix for Issue 1: O(n) duplicate search with a set instead of comparing
+# every pair. This is the right fix for arbitrary hashable items.
+def find_duplicates(items: list) -> list:
+    seen = set()
+    duplicates = []
+    for item in items:
+        if item in seen:
+            duplicates.append(item)
+        else:
+            seen.add(item)
+    return duplicates
+
+
+# Numeric variant: when the items are integer IDs in a NumPy array, the loop
+# is compiled to machine code by numba (cache=True keeps the compiled
+# version on disk between runs). Sorting first makes duplicates adjacent,
+# so one O(n log n) sort plus one linear pass replace the O(n^2) pairs.
+@njit(cache=True)
+def find_duplicate_ids(ids: np.ndarray) -> np.ndarray:
+    ordered = np.sort(ids)
+    out = np.empty(ordered.size, dtype=ordered.dtype)
+    count = 0
+    for i in range(1, ordered.size):
+        if ordered[i] == ordered[i - 1] and (count == 0 or out[count - 1] != ordered[i]):
+            out[count] = ordered[i]
+            count += 1
+    return out[:count]
+
+
+# Fix for Issue 2: one query with a JOIN instead of one query per user.
+def get_users_with_orders():
+    return db.query(
+        "SELECT u.*, o.* FROM users u LEFT JOIN orders o ON o.user_id = u.id"
+    )
+
+
+# Fix for Issue 3: build the parts, join once.
+def build_report(items: list) -> str:
+    return "".join(f"Item: {item.name}, Price: {item.price}\n" for item in items)
+
+
+# Fix for Issue 4: iterative, O(n) time and O(1) memory.
+def fibonacci(n: int) -> int:
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+
+
+# Fix for Issue 5: stream the file line by line.
+def count_lines(filepath: str) -> int:
+    with open(filepath) as f:
+        return sum(1 for _ in f)
+
+
+# Fix for Issue 6: asyncio.sleep() yields to the event loop.
+async def process_items(items: list):
+    for item in items:
+        await asyncio.sleep(1)
+        await save_to_db(item)
@@ -12,9 +12,15 @@ import httpx
 import json
 import asyncio
 
+from backend.utils.run import run
+
 
 API_BASE = "http://localhost:8000"
 
+# "[CRITICAL]", "[LOW     ]"... - formatted once, not per printed finding
+# (the API returns severities as their lowercase string values)
+SEV_LABEL = {s: s.upper().ljust(8) for s in ("critical", "high", "medium", "low")}
+
 
 async def main():
     async with httpx.AsyncClient(timeout=120.0) as client:
@@ -69,35 +75,39 @@ def run_command(user_input):
         for i, agent_result in enumerate(result['agent_results']):
             print(f"\n  [{agent_result['agent']}] - {agent_result['status']}")
             for f in agent_result['findings']:
-                print(f"    [{f['severity'].upper():8s}] {f['title']}")
+                print(f"    [{SEV_LABEL[f['severity']]}] {f['title']}")
                 if f['suggestion']:
                     print(f"             Fix: {f['suggestion'][:80]}...")
 
-        # Test 4: Retrieve by ID
+        # Tests 4-7 are independent requests: send them together
         analysis_id = result['id']
+        r4, r5, r6, r7 = await asyncio.gather(
+            client.get(f"{API_BASE}/api/analysis/{analysis_id}"),
+            client.get(f"{API_BASE}/api/history"),
+            client.post(f"{API_BASE}/api/analyze", json={}),
+            client.get(f"{API_BASE}/api/analysis/nonexistent"),
+        )
+
+        # Test 4: Retrieve by ID
         print(f"\n[4] GET /api/analysis/{analysis_id} - Retrieve by ID")
-        r = await client.get(f"{API_BASE}/api/analysis/{analysis_id}")
-        print(f"  Status: {r.status_code}")
-        print(f"  Found: {r.json()['total_findings']} findings (same as before)")
+        print(f"  Status: {r4.status_code}")
+        print(f"  Found: {r4.json()['total_findings']} findings (same as before)")
 
         # Test 5: History
         print("\n[5] GET /api/history - Analysis history")
-        r = await client.get(f"{API_BASE}/api/history")
-        history = r.json()
-        print(f"  Status: {r.status_code}")
+        history = r5.json()
+        print(f"  Status: {r5.status_code}")
         print(f"  Total analyses: {history['count']}")
 
         # Test 6: Error case - no input
         print("\n[6] POST /api/analyze - Error: no input")
-        r = await client.post(f"{API_BASE}/api/analyze", json={})
-        print(f"  Status: {r.status_code} (expected 400)")
-        print(f"  Error: {r.json()['detail']}")
+        print(f"  Status: {r6.status_code} (expected 400)")
+        print(f"  Error: {r6.json()['detail']}")
 
         # Test 7: Not found
         print("\n[7] GET /api/analysis/nonexistent - Error: not found")
-        r = await client.get(f"{API_BASE}/api/analysis/nonexistent")
-        print(f"  Status: {r.status_code} (expected 404)")
-        print(f"  Error: {r.json()['detail']}")
+        print(f"  Status: {r7.status_code} (expected 404)")
+        print(f"  Error: {r7.json()['detail']}")
 
         print("\n" + "=" * 60)
         print("All API tests complete!")
@@ -105,4 +115,4 @@ def run_command(user_input):
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
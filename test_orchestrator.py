@@ -11,7 +11,6 @@ Expected behavior:
 5. Total time should be ~max(agent times), NOT sum
 """
 
-import asyncio
 import sys
 import time
 
@@ -19,6 +18,11 @@ sys.path.insert(0, ".")
 
 from backend.agents.orchestrator import PRReviewOrchestrator
 from backend.models.ollama_client import OllamaClient
+from backend.models.schemas import Severity
+from backend.utils.run import run
+
+# "[CRITICAL]", "[LOW     ]"... - formatted once, not per printed finding
+SEV_LABEL = {s: s.value.upper().ljust(8) for s in Severity}
 
 
 # Code with problems spanning ALL agent specialties
@@ -94,7 +98,7 @@ async def main():
         status = "OK" if ar.status.value == "completed" else "FAIL"
         print(f"\n  [{status}] {ar.agent.value.upper()} AGENT ({ar.model_used}) - {ar.execution_time}s")
         for f in ar.findings:
-            print(f"    [{f.severity.value.upper():8s}] {f.title}")
+            print(f"    [{SEV_LABEL[f.severity]}] {f.title}")
 
     # Summary
     print(f"\n{'=' * 60}")
@@ -120,4 +124,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -11,18 +11,22 @@ This script will:
 2. List available models
 3. Test a simple generation
 4. Test JSON-formatted output (critical for agents)
-5. Compare speed between models (if multiple are available)
+5. Compare speed between models (if multiple are available), and check
+   that Ollama serves concurrent requests in parallel
 """
 
 import asyncio
 import sys
 import time
 
+import orjson
+
 # Add the project root to Python path so imports work
 sys.path.insert(0, ".")
 
 from backend.models.ollama_client import OllamaClient
 from backend.config import settings
+from backend.utils.run import run
 
 
 async def main():
@@ -67,9 +71,10 @@ async def main():
 
     # Check which of our required models are available
     required_models = [settings.fast_model, settings.balanced_model]
+    # Checked concurrently (each check may ask Ollama for its model list)
+    flags = await asyncio.gather(*(client.check_model_available(m) for m in required_models))
     available = []
-    for model_name in required_models:
-        is_available = await client.check_model_available(model_name)
+    for model_name, is_available in zip(required_models, flags):
         status = "READY" if is_available else "MISSING"
         print(f"  {model_name}: {status}")
         if is_available:
@@ -122,9 +127,8 @@ Return a JSON object with:
         system_prompt="You are a code security analyzer. Always respond with valid JSON.",
     )
 
-    import json
     print(f"  Response ({json_result['elapsed_seconds']}s):")
-    print(f"  {json.dumps(json_result['data'], indent=2)[:500]}")
+    print(f"  {orjson.dumps(json_result['data'], option=orjson.OPT_INDENT_2).decode()[:500]}")
 
     # ----------------------------------------------------------
     # Step 5: Speed Comparison (if multiple models available)
@@ -133,12 +137,33 @@ Return a JSON object with:
         print(f"\n[5/5] Speed comparison between models...")
         test_prompt = "List 3 common Python security vulnerabilities. Be brief."
 
-        for model_name in available:
-            start = time.time()
+        async def timed(model_name: str) -> tuple[float, dict]:
+            """One generation, timed from inside (also when run concurrently)."""
+            start = time.perf_counter()
             result = await client.generate(model=model_name, prompt=test_prompt)
-            elapsed = time.time() - start
+            return time.perf_counter() - start, result
+
+        # One after another first: each model's own speed, undisturbed
+        sequential = 0.0
+        for model_name in available:
+            elapsed, result = await timed(model_name)
+            sequential += elapsed
             tokens = result.get("eval_count", "?")
             print(f"  {model_name}: {elapsed:.1f}s ({tokens} tokens)")
+
+        # The agents send their requests at the same time (asyncio.gather in
+        # the orchestrator). Check that the server actually serves them in
+        # parallel: both models loaded at once, and free request slots.
+        start = time.perf_counter()
+        timings = await asyncio.gather(*(timed(model_name) for model_name in available))
+        concurrent = time.perf_counter() - start
+        for model_name, (elapsed, _) in zip(available, timings):
+            print(f"  {model_name} (concurrent): {elapsed:.1f}s")
+        print(f"  All at once: {concurrent:.1f}s (one after another: {sequential:.1f}s)")
+        if concurrent > 0.8 * sequential:
+            print("  Requests were served one at a time. Before starting Ollama, set:")
+            print("    OLLAMA_NUM_PARALLEL=5        one slot per agent, so none of them queue")
+            print("    OLLAMA_MAX_LOADED_MODELS=2   keep the 3B and the 7B resident together")
     else:
         print(f"\n[5/5] Skipping speed comparison (only 1 model available)")
         print(f"  Pull more models to compare: ollama pull {settings.balanced_model}")
@@ -157,4 +182,4 @@ Return a JSON object with:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -12,24 +12,15 @@ RUN:
     2. Run this test:     venv/Scripts/python test_websocket.py
 """
 
-import asyncio
-import json
+import importlib.util
 import sys
 
-sys.path.insert(0, ".")
+import orjson
 
+from backend.utils.run import run
 
-async def main():
-    # websockets library is needed for standalone WS client
-    try:
-        import websockets
-    except ImportError:
-        print("Installing websockets library...")
-        import subprocess
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "websockets"])
-        import websockets
-
-    test_code = '''
+# Code with known issues (security, performance, standards) to analyze
+TEST_CODE = '''
 import os
 
 API_KEY = "sk-secret-12345"
@@ -50,6 +41,49 @@ def calcTotal(x, y, z):
     return x * 1.08 + y * 0.95 - z * 0.1
 '''
 
+# The request frame, encoded once at import: every send (or a loop of them
+# in a load test) reuses the same bytes instead of serializing again
+PAYLOAD = orjson.dumps({"diff_text": TEST_CODE})
+
+# Output prefix per event type. The server sends a fixed set of types, so
+# each one's prefix is worked out once (prefix_for) and then looked up.
+_PREFIX: dict[str, str] = {"error": "  [ERROR]"}
+
+
+def prefix_for(event_type: str) -> str:
+    """Color-code an event: one dict probe after the first event of a type."""
+    prefix = _PREFIX.get(event_type)
+    if prefix is None:
+        if event_type.endswith("_completed"):
+            prefix = "  [DONE] "
+        elif event_type.endswith("_started"):
+            prefix = "  [START]"
+        else:
+            prefix = "  [EVENT]"
+        _PREFIX[event_type] = prefix
+    return prefix
+
+
+def require_websockets():
+    """
+    Import the websockets client library, installing it first if missing.
+
+    Only main() calls this, so importing this module (e.g. during pytest
+    collection) loads neither websockets nor subprocess. find_spec() checks
+    for the package without importing it.
+    """
+    if importlib.util.find_spec("websockets") is None:
+        print("Installing websockets library...")
+        import subprocess
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "websockets"])
+    import websockets
+    return websockets
+
+
+async def main():
+    # websockets library is needed for standalone WS client
+    websockets = require_websockets()
+
     uri = "ws://localhost:8000/ws/analyze"
     print("=" * 60)
     print("  WebSocket End-to-End Test")
@@ -60,43 +94,46 @@ def calcTotal(x, y, z):
         async with websockets.connect(uri) as ws:
             print("  Connected! Sending code for analysis...\n")
 
-            # Send the analysis request
-            await ws.send(json.dumps({"diff_text": test_code}))
+            # Send the analysis request. PAYLOAD is bytes, which go out as a
+            # binary frame - the server accepts both, and reads a binary
+            # frame without decoding it to a str first.
+            await ws.send(PAYLOAD)
 
             # Receive events until the connection closes
             event_count = 0
             async for message in ws:
-                event = json.loads(message)
-                event_count += 1
-                event_type = event.get("event_type", "unknown")
-                agent = event.get("agent", "")
-                msg = event.get("message", "")
-
-                # Color-code events
-                if event_type == "error":
-                    prefix = "  [ERROR]"
-                elif event_type.endswith("_completed"):
-                    prefix = "  [DONE] "
-                elif event_type.endswith("_started"):
-                    prefix = "  [START]"
-                else:
-                    prefix = "  [EVENT]"
-
-                agent_str = f" ({agent})" if agent else ""
-                print(f"{prefix}{agent_str} {msg}")
-
-                # Print summary from final result
-                if event_type == "analysis_completed" and event.get("data"):
-                    data = event["data"]
-                    print(f"\n  {'=' * 50}")
-                    print(f"  FINAL RESULT")
-                    print(f"  {'=' * 50}")
-                    print(f"  Total findings: {data.get('total_findings', '?')}")
-                    print(f"    Critical: {data.get('critical_count', '?')}")
-                    print(f"    High:     {data.get('high_count', '?')}")
-                    print(f"    Medium:   {data.get('medium_count', '?')}")
-                    print(f"    Low:      {data.get('low_count', '?')}")
-                    print(f"  Time:  {data.get('total_execution_time', '?')}s")
+                parsed = orjson.loads(message)
+                # Output lines of this frame, written with ONE write() once
+                # the frame is handled - not a print() per line. Still one
+                # write per frame, so events show up as they arrive.
+                lines = []
+                # The server coalesces bursts of events into one array frame
+                for event in parsed if isinstance(parsed, list) else [parsed]:
+                    event_count += 1
+                    event_type = event.get("event_type", "unknown")
+                    agent = event.get("agent", "")
+                    msg = event.get("message", "")
+
+                    agent_str = f" ({agent})" if agent else ""
+                    lines.append(f"{prefix_for(event_type)}{agent_str} {msg}")
+
+                    # Print summary from final result
+                    if event_type == "analysis_completed" and event.get("data"):
+                        data = event["data"]
+                        lines += (
+                            f"\n  {'=' * 50}",
+                            f"  FINAL RESULT",
+                            f"  {'=' * 50}",
+                            f"  Total findings: {data.get('total_findings', '?')}",
+                            f"    Critical: {data.get('critical_count', '?')}",
+                            f"    High:     {data.get('high_count', '?')}",
+                            f"    Medium:   {data.get('medium_count', '?')}",
+                            f"    Low:      {data.get('low_count', '?')}",
+                            f"  Time:  {data.get('total_execution_time', '?')}s",
+                        )
+
+                sys.stdout.write("\n".join(lines) + "\n")
+                sys.stdout.flush()
 
             print(f"\n  Connection closed. Received {event_count} events.")
             print("  WebSocket test PASSED!")
@@ -110,4 +147,4 @@ def calcTotal(x, y, z):
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
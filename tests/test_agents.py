@@ -16,10 +16,14 @@ We use BOTH approaches:
 - Integration tests run locally to verify Ollama + agents work together
 """
 
+import asyncio
+from dataclasses import dataclass, field
+
 import pytest
 import pytest_asyncio
 
-from backend.agents.base_agent import BaseAgent
+from backend.agents.base_agent import ResponseCache
+from backend.agents.orchestrator import PRReviewOrchestrator
 from backend.agents.security_agent import SecurityAgent
 from backend.models.ollama_client import OllamaClient
 from backend.models.schemas import (
@@ -29,12 +33,17 @@ from backend.models.schemas import (
     Severity,
 )
 
+# Code the SecurityAgent's pre-filter lets through (a SQL query).
+# Placeholder strings like "code" are skipped without an LLM call.
+SAMPLE_CODE = 'query = f"SELECT * FROM users WHERE id = {user_id}"'
+
 
 # ============================================================
 # Mock Ollama Client for deterministic tests
 # ============================================================
 
-class MockOllamaClient(OllamaClient):
+@dataclass(slots=True)
+class MockOllamaClient:
     """
     A fake Ollama client that returns pre-defined responses.
 
@@ -43,14 +52,28 @@ class MockOllamaClient(OllamaClient):
     - Tests are deterministic (same input = same output every time)
     - Tests work without Ollama installed (CI/CD environments)
     - We can test edge cases (malformed responses, errors, etc.)
+
+    It implements the LLMClient protocol without subclassing OllamaClient,
+    so no HTTP client is ever built behind it. A slotted dataclass: just
+    the two fields, no per-instance __dict__.
     """
 
-    def __init__(self, mock_response: dict | None = None, should_fail: bool = False):
-        self.mock_response = mock_response or {}
-        self.should_fail = should_fail
-        # Don't call super().__init__() - we don't need a real HTTP client
+    mock_response: dict = field(default_factory=dict)
+    should_fail: bool = False
 
-    async def generate_json(self, model, prompt, system_prompt=None, temperature=0.1):
+    def set_response(self, mock_response: dict):
+        """Answer every following request with this response."""
+        self.mock_response = mock_response
+
+    async def generate(self, model, prompt, system_prompt=None, temperature=0.1,
+                       format_json=False, options=None):
+        if self.should_fail:
+            raise ConnectionError("Mock connection failure")
+
+        return {"response": "", "model": model, "elapsed_seconds": 0.1, "eval_count": 1}
+
+    async def generate_json(self, model, prompt, system_prompt=None, temperature=0.1,
+                            options=None, json_schema=None):
         if self.should_fail:
             raise ConnectionError("Mock connection failure")
 
@@ -61,6 +84,14 @@ class MockOllamaClient(OllamaClient):
             "eval_count": 100,
         }
 
+    async def generate_json_stream(self, model, prompt, system_prompt=None, temperature=0.1,
+                                   options=None, json_schema=None, on_progress=None):
+        if self.should_fail:
+            raise ConnectionError("Mock connection failure")
+
+        for item in self.mock_response.get("findings", []):
+            yield item
+
     async def close(self):
         pass
 
@@ -69,14 +100,25 @@ class MockOllamaClient(OllamaClient):
 # Test: Response Parsing (deterministic)
 # ============================================================
 
+@pytest.fixture(scope="module")
+def mock_client():
+    """One mock shared by the parsing tests; each sets its own response."""
+    return MockOllamaClient()
+
+
+@pytest.fixture(scope="module")
+def security_agent(mock_client):
+    """One SecurityAgent (no response cache) shared by the parsing tests."""
+    return SecurityAgent(ollama_client=mock_client)
+
+
 class TestSecurityAgentParsing:
     """Test that the agent correctly parses LLM responses into Findings."""
 
     @pytest.mark.asyncio
-    async def test_parses_valid_findings(self):
-        """Agent should convert well-formed JSON into Finding objects."""
-        mock_response = {
-            "findings": [
+    @pytest.mark.parametrize("mock_response, expected", [
+        pytest.param(
+            {"findings": [
                 {
                     "title": "SQL Injection",
                     "severity": "critical",
@@ -91,97 +133,163 @@ class TestSecurityAgentParsing:
                     "suggestion": "Use environment variables",
                     "confidence": 0.9,
                 },
-            ]
-        }
+            ]},
+            [("SQL Injection", Severity.CRITICAL), ("Hardcoded Secret", Severity.HIGH)],
+            id="valid-findings",
+        ),
+        # Clean code (no vulnerabilities) is handled gracefully
+        pytest.param({"findings": []}, [], id="empty-findings"),
+        # LLMs sometimes use 'issues' instead of 'findings' - handle both
+        pytest.param(
+            {"issues": [{"title": "XSS Vulnerability", "severity": "high", "description": "Unescaped output"}]},
+            [("XSS Vulnerability", Severity.HIGH)],
+            id="alternative-key-name",
+        ),
+        # LLMs might return 'HIGH' or 'High' instead of 'high'
+        pytest.param(
+            {"findings": [
+                {"title": "Issue 1", "severity": "HIGH", "description": "test"},
+                {"title": "Issue 2", "severity": "Critical", "description": "test"},
+                {"title": "Issue 3", "severity": "low", "description": "test"},
+            ]},
+            [("Issue 1", Severity.HIGH), ("Issue 2", Severity.CRITICAL), ("Issue 3", Severity.LOW)],
+            id="severity-case",
+        ),
+        # Aliases map to real severities; unknown values fall back to medium
+        pytest.param(
+            {"findings": [
+                {"title": "Issue 1", "severity": " Critical! ", "description": "test"},
+                {"title": "Issue 2", "severity": "info", "description": "test"},
+                {"title": "Issue 3", "severity": "catastrophic", "description": "test"},
+            ]},
+            [("Issue 1", Severity.CRITICAL), ("Issue 2", Severity.LOW), ("Issue 3", Severity.MEDIUM)],
+            id="severity-aliases",
+        ),
+        # If one finding is malformed, skip it but keep the rest
+        pytest.param(
+            {"findings": [
+                {"title": "Good Finding", "severity": "high", "description": "valid"},
+                "this is not a dict - should be skipped",
+                {"title": "Another Good", "severity": "low", "description": "also valid"},
+            ]},
+            [("Good Finding", Severity.HIGH), ("Another Good", Severity.LOW)],
+            id="malformed-finding",
+        ),
+    ])
+    async def test_parses_response(self, mock_client, security_agent, mock_response, expected):
+        mock_client.set_response(mock_response)
 
-        agent = SecurityAgent(ollama_client=MockOllamaClient(mock_response))
-        result = await agent.analyze("some code diff")
+        result = await security_agent.analyze(SAMPLE_CODE)
 
         assert result.status == AnalysisStatus.COMPLETED
-        assert len(result.findings) == 2
-        assert result.findings[0].title == "SQL Injection"
-        assert result.findings[0].severity == Severity.CRITICAL
-        assert result.findings[0].agent == AgentType.SECURITY
-        assert result.findings[1].severity == Severity.HIGH
+        assert [(f.title, f.severity) for f in result.findings] == expected
+        assert all(f.agent == AgentType.SECURITY for f in result.findings)
 
     @pytest.mark.asyncio
-    async def test_handles_empty_findings(self):
-        """Agent should handle clean code (no vulnerabilities) gracefully."""
-        mock_response = {"findings": []}
+    async def test_default_confidence(self, mock_client, security_agent):
+        """Findings without explicit confidence should default to 0.8."""
+        mock_client.set_response({"findings": [
+            {"title": "Test", "severity": "medium", "description": "test"},
+        ]})
 
-        agent = SecurityAgent(ollama_client=MockOllamaClient(mock_response))
-        result = await agent.analyze("clean code with no issues")
+        result = await security_agent.analyze(SAMPLE_CODE)
 
-        assert result.status == AnalysisStatus.COMPLETED
-        assert len(result.findings) == 0
+        assert result.findings[0].confidence == 0.8
 
-    @pytest.mark.asyncio
-    async def test_handles_alternative_key_names(self):
-        """LLMs sometimes use 'issues' instead of 'findings' - handle both."""
-        mock_response = {
-            "issues": [
-                {
-                    "title": "XSS Vulnerability",
-                    "severity": "high",
-                    "description": "Unescaped output",
-                }
-            ]
-        }
 
-        agent = SecurityAgent(ollama_client=MockOllamaClient(mock_response))
-        result = await agent.analyze("some code")
+# ============================================================
+# Test: Streaming
+# ============================================================
 
-        assert len(result.findings) == 1
-        assert result.findings[0].title == "XSS Vulnerability"
+class TestStreamingFindings:
+    """With on_finding, each finding is reported as soon as it is parsed."""
 
     @pytest.mark.asyncio
-    async def test_normalizes_severity_values(self):
-        """LLMs might return 'HIGH' or 'High' instead of 'high'."""
+    async def test_on_finding_receives_each_finding(self):
         mock_response = {
             "findings": [
-                {"title": "Issue 1", "severity": "HIGH", "description": "test"},
-                {"title": "Issue 2", "severity": "Critical", "description": "test"},
-                {"title": "Issue 3", "severity": "low", "description": "test"},
+                {"title": "First", "severity": "high", "description": "test"},
+                "not a dict - skipped",
+                {"title": "Second", "severity": "low", "description": "test"},
             ]
         }
+        streamed = []
+
+        async def on_finding(finding):
+            streamed.append(finding.title)
 
         agent = SecurityAgent(ollama_client=MockOllamaClient(mock_response))
-        result = await agent.analyze("code")
+        result = await agent.analyze(SAMPLE_CODE, on_finding=on_finding)
+
+        assert streamed == ["First", "Second"]
+        assert [f.title for f in result.findings] == streamed
+        assert result.status == AnalysisStatus.COMPLETED
+
+
+# ============================================================
+# Test: Large Diff Chunking
+# ============================================================
+
+class TestDiffChunking:
+    """Diffs over the agent's context budget are reviewed in chunks."""
+
+    @staticmethod
+    def make_diff(*paths: str) -> str:
+        return "".join(f"diff --git a/{p} b/{p}\n+cursor.execute({'x' * 40})\n" for p in paths)
 
-        assert result.findings[0].severity == Severity.HIGH
-        assert result.findings[1].severity == Severity.CRITICAL
-        assert result.findings[2].severity == Severity.LOW
+    @staticmethod
+    def make_github_diff(*paths: str) -> str:
+        # The shape GitHubService.fetch_pr builds: no `diff --git` lines
+        return "\n\n".join(f"--- a/{p}\n+++ b/{p}\n+cursor.execute({'x' * 40})" for p in paths)
 
     @pytest.mark.asyncio
-    async def test_handles_malformed_finding(self):
-        """If one finding is malformed, skip it but keep the rest."""
-        mock_response = {
-            "findings": [
-                {"title": "Good Finding", "severity": "high", "description": "valid"},
-                "this is not a dict - should be skipped",
-                {"title": "Another Good", "severity": "low", "description": "also valid"},
-            ]
-        }
+    async def test_large_diff_is_split_per_file(self, monkeypatch):
+        # Room for exactly one ~20-token file per prompt
+        monkeypatch.setattr(SecurityAgent, "_diff_token_budget", lambda self: 25)
+        prompts = []
+
+        class RecordingClient(MockOllamaClient):
+            async def generate_json(self, model, prompt, **kwargs):
+                prompts.append(prompt)
+                return await super().generate_json(model, prompt, **kwargs)
+
+        client = RecordingClient({"findings": [
+            {"title": "Same issue", "severity": "high", "description": "test"},
+        ]})
+        agent = SecurityAgent(ollama_client=client)
+        result = await agent.analyze(self.make_diff("a.py", "b.py", "c.py"))
+
+        assert len(prompts) == 3
+        assert all(p.count("diff --git") == 1 for p in prompts)
+        assert len(result.findings) == 1  # identical findings are merged
 
-        agent = SecurityAgent(ollama_client=MockOllamaClient(mock_response))
-        result = await agent.analyze("code")
+    @pytest.mark.asyncio
+    async def test_github_diff_is_split_per_file(self, monkeypatch):
+        monkeypatch.setattr(SecurityAgent, "_diff_token_budget", lambda self: 25)
+        client = MockOllamaClient({"findings": []})
+        agent = SecurityAgent(ollama_client=client, cache=ResponseCache())
+
+        await agent.analyze(self.make_github_diff("a.py", "b.py", "c.py"))
 
-        # Should have 2 findings (the malformed one is skipped)
-        assert len(result.findings) == 2
+        assert len(agent.cache) == 3  # one prompt per file
 
     @pytest.mark.asyncio
-    async def test_default_confidence(self):
-        """Findings without explicit confidence should default to 0.8."""
-        mock_response = {
-            "findings": [
-                {"title": "Test", "severity": "medium", "description": "test"},
-            ]
-        }
+    async def test_oversized_chunk_is_logged(self, monkeypatch, caplog):
+        monkeypatch.setattr(SecurityAgent, "_diff_token_budget", lambda self: 25)
+        agent = SecurityAgent(ollama_client=MockOllamaClient({"findings": []}))
 
-        agent = SecurityAgent(ollama_client=MockOllamaClient(mock_response))
-        result = await agent.analyze("code")
+        await agent.analyze(f"cursor.execute({'x' * 200})")  # pasted, no headers to split at
 
-        assert result.findings[0].confidence == 0.8
+        assert "exceed the 25-token budget" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_small_diff_is_one_prompt(self):
+        client = MockOllamaClient({"findings": []})
+        agent = SecurityAgent(ollama_client=client, cache=ResponseCache())
+
+        await agent.analyze(self.make_diff("a.py", "b.py"))
+
+        assert len(agent.cache) == 1
 
 
 # ============================================================
@@ -197,7 +305,7 @@ class TestAgentErrorHandling:
         agent = SecurityAgent(
             ollama_client=MockOllamaClient(should_fail=True)
         )
-        result = await agent.analyze("some code")
+        result = await agent.analyze(SAMPLE_CODE)
 
         assert result.status == AnalysisStatus.FAILED
         assert result.error is not None
@@ -210,13 +318,141 @@ class TestAgentErrorHandling:
         agent = SecurityAgent(
             ollama_client=MockOllamaClient(should_fail=True)
         )
-        result = await agent.analyze("code")
+        result = await agent.analyze(SAMPLE_CODE)
 
         assert result.agent == AgentType.SECURITY
         assert result.execution_time >= 0
         assert result.model_used == agent.model
 
 
+# ============================================================
+# Test: Response Cache
+# ============================================================
+
+class TestResponseCache:
+    """Identical requests are served from the cache instead of the LLM."""
+
+    @pytest.mark.asyncio
+    async def test_second_identical_call_is_cache_hit(self):
+        client = MockOllamaClient({"findings": [
+            {"title": "SQL Injection", "severity": "critical", "description": "test"},
+        ]})
+        agent = SecurityAgent(ollama_client=client, cache=ResponseCache())
+
+        first = await agent.analyze(SAMPLE_CODE)
+        client.set_response({"findings": []})  # LLM would now answer differently
+        second = await agent.analyze(SAMPLE_CODE)
+
+        assert first.cache_hit is False
+        assert second.cache_hit is True
+        assert second.execution_time == 0.0
+        assert [f.title for f in second.findings] == ["SQL Injection"]
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self):
+        cache = ResponseCache()
+        agent = SecurityAgent(ollama_client=MockOllamaClient(should_fail=True), cache=cache)
+
+        await agent.analyze(SAMPLE_CODE)
+
+        assert len(cache) == 0
+
+    def test_lru_eviction_and_ttl(self):
+        cache = ResponseCache(maxsize=2)
+        keys = [ResponseCache.make_key("m", "s", p) for p in ("a", "b", "c")]
+        cache.put(keys[0], [])
+        cache.put(keys[1], [])
+        cache.get(keys[0])  # touch "a" so "b" is the least recently used
+        cache.put(keys[2], [])
+
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) == []
+
+        expired = ResponseCache(ttl=-1)
+        expired.put(keys[0], [])
+        assert expired.get(keys[0]) is None
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_share_one_call(self):
+        calls = []
+        fail_first = False
+
+        class SlowClient(MockOllamaClient):
+            async def generate_json(self, model, prompt, **kwargs):
+                calls.append(prompt)
+                await asyncio.sleep(0.01)
+                if len(calls) == 1 and fail_first:
+                    raise ConnectionError("first request failed")
+                return await MockOllamaClient.generate_json(self, model, prompt, **kwargs)
+
+        client = SlowClient({"findings": [
+            {"title": "SQL Injection", "severity": "critical", "description": "test"},
+        ]})
+        cache = ResponseCache()
+        agents = [SecurityAgent(ollama_client=client, cache=cache) for _ in range(3)]
+
+        results = await asyncio.gather(*(agent.analyze(SAMPLE_CODE) for agent in agents))
+
+        assert len(calls) == 1
+        assert all([f.title for f in r.findings] == ["SQL Injection"] for r in results)
+
+        # A failed request is not shared: the waiters send their own
+        calls.clear()
+        fail_first = True
+        cache = ResponseCache()
+        agents = [SecurityAgent(ollama_client=client, cache=cache) for _ in range(2)]
+
+        results = await asyncio.gather(*(agent.analyze(SAMPLE_CODE) for agent in agents))
+
+        assert [r.status for r in results] == [AnalysisStatus.FAILED, AnalysisStatus.COMPLETED]
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_sqlite_file_survives_a_restart(self, tmp_path):
+        path = str(tmp_path / "responses.db")
+        client = MockOllamaClient({"findings": [
+            {"title": "SQL Injection", "severity": "critical", "description": "test"},
+        ]})
+        cache = ResponseCache(path=path)
+        await SecurityAgent(ollama_client=client, cache=cache).analyze(SAMPLE_CODE)
+        cache.close()
+
+        client.set_response({"findings": []})
+        restarted = ResponseCache(path=path)
+        result = await SecurityAgent(ollama_client=client, cache=restarted).analyze(SAMPLE_CODE)
+        restarted.close()
+
+        assert result.cache_hit is True
+        assert [f.title for f in result.findings] == ["SQL Injection"]
+
+
+# ============================================================
+# Test: Regex Pre-filters
+# ============================================================
+
+class TestPrefilter:
+    """Diffs without a single candidate pattern never reach the LLM."""
+
+    @pytest.mark.asyncio
+    async def test_clean_diff_skips_llm(self):
+        client = MockOllamaClient(should_fail=True)  # any LLM call would fail
+        agent = SecurityAgent(ollama_client=client)
+
+        result = await agent.analyze("+total = price * quantity")
+
+        assert result.status == AnalysisStatus.COMPLETED
+        assert result.findings == []
+
+    @pytest.mark.parametrize("code", [
+        "subprocess.run(cmd, shell=True)",
+        "data = pickle.loads(blob)",
+        'API_KEY = "sk-123"',
+        "el.innerHTML = comment",
+    ])
+    def test_security_triggers(self, code):
+        assert SecurityAgent.PREFILTER.search(code)
+
+
 # ============================================================
 # Test: Agent Identity
 # ============================================================
@@ -227,6 +463,7 @@ class TestAgentIdentity:
     def test_security_agent_type(self):
         agent = SecurityAgent(ollama_client=MockOllamaClient())
         assert agent.agent_type == AgentType.SECURITY
+        assert SecurityAgent.agent_name == "security"
 
     def test_security_agent_model(self):
         agent = SecurityAgent(ollama_client=MockOllamaClient())
@@ -237,27 +474,59 @@ class TestAgentIdentity:
         assert len(agent.system_prompt) > 100
         assert "security" in agent.system_prompt.lower()
 
+    def test_diff_is_the_tail_of_the_prompt(self):
+        """The static output format lives in the system prompt, not after the diff."""
+        agent = SecurityAgent(ollama_client=MockOllamaClient())
+        prompt = agent.build_prompt("DIFF")
+
+        assert prompt.endswith("DIFF\n```")
+        assert '"findings"' in agent.system_prompt
+
 
 # ============================================================
 # Integration Test: Real Ollama (skip if not available)
 # ============================================================
 
-@pytest.mark.asyncio
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def ollama():
+    """
+    One real OllamaClient for every integration test of the session.
+
+    Its connection pool (keep-alive, settings.ollama_max_keepalive_connections)
+    stays open between tests instead of each test connecting from scratch.
+    Session-scoped async fixtures need a session event loop, so tests using
+    it are marked asyncio(loop_scope="session").
+
+    The agent models are loaded (PRReviewOrchestrator.warmup: one 1-token
+    request per model, same num_ctx as the agents) while the connection is
+    checked, so no test pays for loading weights. warmup() never raises;
+    with Ollama down, the connection check skips the tests.
+    """
+    client = OllamaClient()
+    connected, _ = await asyncio.gather(
+        client.check_connection(),
+        PRReviewOrchestrator(ollama_client=client).warmup(),
+        return_exceptions=True,
+    )
+    if isinstance(connected, BaseException):
+        await client.close()
+        if isinstance(connected, ConnectionError):
+            pytest.skip("Ollama not running")
+        raise connected
+    yield client
+    await client.close()
+
+
+@pytest.mark.asyncio(loop_scope="session")
 @pytest.mark.integration
-async def test_security_agent_finds_sql_injection():
+async def test_security_agent_finds_sql_injection(ollama):
     """
     Integration test: Run real SecurityAgent against known vulnerable code.
 
     This test requires Ollama to be running with qwen2.5-coder:7b.
     Skip in CI with: pytest -m "not integration"
     """
-    client = OllamaClient()
-    try:
-        await client.check_connection()
-    except ConnectionError:
-        pytest.skip("Ollama not running")
-
-    agent = SecurityAgent(ollama_client=client)
+    agent = SecurityAgent(ollama_client=ollama)
 
     vulnerable_code = '''
 def login(username, password):
@@ -271,10 +540,9 @@ def login(username, password):
     assert result.status == AnalysisStatus.COMPLETED
     assert len(result.findings) > 0
 
-    # At least one finding should mention SQL injection
-    titles = [f.title.lower() for f in result.findings]
-    descriptions = [f.description.lower() for f in result.findings]
-    all_text = " ".join(titles + descriptions)
-    assert "sql" in all_text or "injection" in all_text
-
-    await client.close()
+    # At least one finding should mention SQL injection (stops at the first)
+    assert any(
+        "sql" in text or "injection" in text
+        for f in result.findings
+        for text in (f.title.lower(), f.description.lower())
+    )
@@ -0,0 +1,180 @@
+"""
+Unit tests for the AnalysisService.
+
+The service is exercised with MockOllamaClient, so no Ollama is needed.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from backend.agents.orchestrator import PRReviewOrchestrator
+from backend.config import settings
+from backend.models.ollama_client import OllamaClient
+from backend.models.schemas import PRData
+from backend.services.analysis_service import AnalysisService
+from tests.test_agents import MockOllamaClient
+
+
+def tags_client(listings: dict[str, list[str]], calls: list) -> OllamaClient:
+    """OllamaClient whose instances (by host) serve fixed /api/tags listings."""
+    def handler(request):
+        calls.append(request.url.host)
+        return httpx.Response(200, json={"models": [{"name": n} for n in listings[request.url.host]]})
+
+    return OllamaClient(http_client=httpx.AsyncClient(
+        base_url="http://ollama.test", transport=httpx.MockTransport(handler)
+    ))
+
+
+class TestHealth:
+
+    @pytest.mark.asyncio
+    async def test_agents_ready_from_one_model_listing(self):
+        service = AnalysisService()
+        fast_model = service.orchestrator.agents["standards"].model
+        calls = []
+        service.client = tags_client({"ollama.test": [f"{fast_model}:latest"]}, calls)
+
+        health = await service.check_health()
+
+        assert health["status"] == "healthy"
+        assert set(health["agents_ready"]) == {"testing", "documentation", "standards"}
+        assert calls == ["ollama.test", "ollama.test"]  # connection check + one listing
+
+    @pytest.mark.asyncio
+    async def test_models_on_dedicated_instances_are_found(self, monkeypatch):
+        service = AnalysisService()
+        fast_model = service.orchestrator.agents["standards"].model
+        balanced_model = service.orchestrator.agents["security"].model
+        monkeypatch.setattr(settings, "model_endpoints", {fast_model: ["http://ollama-fast/"]})
+        service.client = tags_client({"ollama.test": [balanced_model], "ollama-fast": [fast_model]}, [])
+
+        health = await service.check_health()
+
+        assert health["status"] == "healthy"
+        assert set(health["models_available"]) == {fast_model, balanced_model}
+        assert len(health["agents_ready"]) == 5
+
+
+class CountingClient(MockOllamaClient):
+    """Mock client that counts LLM calls."""
+
+    def __init__(self, mock_response=None, should_fail=False):
+        super().__init__(mock_response, should_fail)
+        self.calls = 0
+
+    async def generate_json_stream(self, *args, **kwargs):
+        self.calls += 1
+        async for item in super().generate_json_stream(*args, **kwargs):
+            yield item
+
+    async def generate_json(self, *args, **kwargs):
+        self.calls += 1
+        return await super().generate_json(*args, **kwargs)
+
+
+def make_service(client) -> AnalysisService:
+    service = AnalysisService()
+    service.orchestrator = PRReviewOrchestrator(ollama_client=client)
+    return service
+
+
+class TestDiffCache:
+
+    @pytest.mark.asyncio
+    async def test_identical_diff_skips_agents(self):
+        client = CountingClient({"findings": []})
+        service = make_service(client)
+
+        first = await service.analyze_diff("def f(): pass")
+        calls = client.calls
+        second = await service.analyze_diff("def f(): pass")
+
+        assert calls > 0
+        assert client.calls == calls
+        # A new record with the cached findings, retrievable and in history
+        assert second.id != first.id
+        assert second.agent_results == first.agent_results
+        assert second.pr_data == first.pr_data
+        assert await service.get_result(second.id) is second
+        assert [r.id for r in await service.get_history(limit=2)] == [second.id, first.id]
+
+    @pytest.mark.asyncio
+    async def test_failed_analysis_is_not_cached(self):
+        client = CountingClient(should_fail=True)
+        service = make_service(client)
+
+        await service.analyze_diff("def f(): pass")
+        calls = client.calls
+        await service.analyze_diff("def f(): pass")
+
+        assert client.calls == 2 * calls
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_diffs_share_one_run(self):
+        baseline = CountingClient({"findings": []})
+        await make_service(baseline).analyze_diff("def f(): pass")
+
+        client = CountingClient({"findings": []})
+        service = make_service(client)
+        first, second = await asyncio.gather(
+            service.analyze_diff("def f(): pass"),
+            service.analyze_diff("def f(): pass"),
+        )
+
+        assert second.id != first.id
+        assert second.agent_results == first.agent_results
+        assert client.calls == baseline.calls
+        assert service._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_paste_of_a_fetched_diff_is_relabelled(self):
+        service = make_service(CountingClient({"findings": []}))
+        fetched = await service.analyze_diff(
+            "def f(): pass", PRData(owner="o", repo="r", pr_number=7, title="Fix"),
+        )
+
+        pasted = await service.analyze_diff("def f(): pass")
+
+        assert pasted.pr_data == PRData.for_paste("def f(): pass")
+        assert pasted.id != fetched.id
+        assert await service.get_result(pasted.id) is pasted
+
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded_lru(self, monkeypatch):
+        monkeypatch.setattr(settings, "analysis_cache_size", 2)
+        service = make_service(CountingClient({"findings": []}))
+
+        await service.analyze_diff("def a(): pass")
+        await service.analyze_diff("def b(): pass")
+        await service.analyze_diff("def a(): pass")  # a is now the most recent
+        await service.analyze_diff("def c(): pass")
+
+        assert list(service._cache) == [service._diff_key("def a(): pass"), service._diff_key("def c(): pass")]
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_analyzed_again(self, monkeypatch):
+        service = make_service(CountingClient({"findings": []}))
+        first = await service.analyze_diff("def f(): pass")
+
+        monkeypatch.setattr(settings, "analysis_cache_ttl", -1)
+        second = await service.analyze_diff("def f(): pass")
+
+        assert second is not first
+
+
+class TestHistory:
+
+    @pytest.mark.asyncio
+    async def test_newest_first_and_limited(self):
+        service = make_service(CountingClient({"findings": []}))
+        for code in ("def a(): pass", "def b(): pass", "def c(): pass"):
+            await service.analyze_diff(code)
+
+        history = await service.get_history(limit=2)
+
+        assert len(history) == 2
+        assert history[0].created_at >= history[1].created_at
+        assert await service.get_result(history[0].id) is history[0]
@@ -0,0 +1,20 @@
+"""
+Unit tests for the application settings.
+"""
+
+from backend.config import Settings
+
+
+class TestModelQuantization:
+
+    def test_default_tags_are_pinned(self):
+        settings = Settings(_env_file=None)
+
+        assert settings.fast_model.endswith("-q5_K_M")
+        assert settings.balanced_model.endswith("-q4_K_M")
+
+    def test_override_replaces_quantization_suffix(self):
+        settings = Settings(_env_file=None, model_quantization="q8_0")
+
+        assert settings.fast_model == "llama3.2:3b-instruct-q8_0"
+        assert settings.balanced_model == "qwen2.5-coder:7b-instruct-q8_0"
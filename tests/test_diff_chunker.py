@@ -0,0 +1,102 @@
+"""Unit tests for splitting unified diffs per file."""
+
+from backend.utils.diff_chunker import DiffSplitter, ParsedDiff, estimate_tokens
+
+
+def make_file_diff(path: str, body: str = "+x = 1") -> str:
+    return f"diff --git a/{path} b/{path}\n--- a/{path}\n+++ b/{path}\n@@ -1 +1 @@\n{body}\n"
+
+
+class TestDiffSplitter:
+
+    def test_splits_at_file_headers(self):
+        diff = make_file_diff("app/main.py") + make_file_diff("README.md", "+docs")
+
+        chunks = DiffSplitter.split(diff)
+
+        assert [path for path, _ in chunks] == ["app/main.py", "README.md"]
+        assert "".join(text for _, text in chunks) == diff
+        assert chunks[1][1].startswith("diff --git a/README.md")
+
+    def test_renamed_file_uses_new_path(self):
+        diff = "diff --git a/old.py b/new.py\nsimilarity index 100%\n"
+        assert DiffSplitter.split(diff) == [("new.py", diff)]
+
+    def test_splits_github_api_format(self):
+        # GitHubService.fetch_pr joins patches under bare ---/+++ headers
+        diff = "\n\n".join(
+            f"--- a/{path}\n+++ b/{path}\n@@ -1 +1 @@\n+x = 1" for path in ("a.py", "b/c.py")
+        )
+
+        chunks = DiffSplitter.split(diff)
+
+        assert [path for path, _ in chunks] == ["a.py", "b/c.py"]
+        assert "".join(text for _, text in chunks) == diff
+
+    def test_git_diff_is_not_split_twice(self):
+        # The ---/+++ pair under each `diff --git` header is not a new file
+        diff = make_file_diff("a.py") + make_file_diff("b.py")
+        assert len(DiffSplitter.split(diff)) == 2
+
+    def test_text_without_headers_is_one_chunk(self):
+        assert DiffSplitter.split("def f(): pass") == [("", "def f(): pass")]
+        assert DiffSplitter.split("") == []
+
+    def test_batch_packs_files_up_to_the_budget(self):
+        files = [make_file_diff(f"f{i}.py") for i in range(5)]
+        per_file = estimate_tokens(files[0])
+
+        chunks = DiffSplitter.batch("".join(files), max_tokens=2 * per_file)
+
+        assert chunks == [files[0] + files[1], files[2] + files[3], files[4]]
+
+    def test_oversized_file_is_its_own_chunk(self):
+        big, small = make_file_diff("big.py", "+" + "x" * 400), make_file_diff("s.py")
+
+        assert DiffSplitter.batch(small + big + small, max_tokens=50) == [small, big, small]
+
+
+class TestHunkSplitting:
+
+    @staticmethod
+    def make_hunks(n: int) -> tuple[str, list[str]]:
+        header = "diff --git a/big.py b/big.py\n--- a/big.py\n+++ b/big.py\n"
+        hunks = [f"@@ -{i} +{i} @@\n+{'x' * 80}\n" for i in range(n)]
+        return header, hunks
+
+    def test_oversized_file_is_cut_at_hunks(self):
+        header, hunks = self.make_hunks(4)
+        budget = estimate_tokens(header) + 2 * estimate_tokens(hunks[0])
+
+        pieces = DiffSplitter.batch(header + "".join(hunks), max_tokens=budget)
+
+        assert pieces == [header + hunks[0] + hunks[1], header + hunks[2] + hunks[3]]
+
+    def test_single_hunk_stays_whole(self):
+        header, hunks = self.make_hunks(1)
+        assert DiffSplitter.split_hunks(header + hunks[0], max_tokens=10) == [header + hunks[0]]
+
+
+class TestParsedDiff:
+
+    def test_matches_the_splitter(self):
+        diff = "".join(make_file_diff(f"f{i}.py") for i in range(5))
+        parsed = ParsedDiff(diff)
+
+        assert parsed.tokens == estimate_tokens(diff)
+        assert parsed.files == DiffSplitter.split(diff)
+        assert parsed.batch(20) == DiffSplitter.batch(diff, 20)
+
+    def test_split_and_batches_are_computed_once(self, monkeypatch):
+        calls = []
+        real_split = DiffSplitter.split.__func__
+        monkeypatch.setattr(DiffSplitter, "split", classmethod(
+            lambda cls, text: calls.append(text) or real_split(cls, text)
+        ))
+        parsed = ParsedDiff(make_file_diff("a.py") + make_file_diff("b.py"))
+
+        first = parsed.batch(20)
+
+        assert parsed.batch(20) is first  # same budget -> same list
+        parsed.batch(1000)
+        assert len(calls) == 1
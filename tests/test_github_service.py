@@ -0,0 +1,233 @@
+"""
+Unit tests for the GitHubService.
+
+GitHub is replaced with httpx.MockTransport, so these run offline.
+"""
+
+import time
+
+import httpx
+import pytest
+
+import backend.services.github_service as github_service_module
+from backend.config import settings
+from backend.services.github_service import GitHubService
+
+PR = {"title": "Fix login", "body": "", "user": {"login": "octocat"}}
+FILES = [{"filename": "app.py", "status": "modified", "patch": "@@ -1 +1 @@\n-a\n+b"}]
+
+
+async def make_service(handler) -> GitHubService:
+    """GitHubService whose API calls go to `handler` instead of the network."""
+    service = GitHubService(token="test")
+    await service.client.aclose()
+    service.client = httpx.AsyncClient(
+        base_url="https://api.github.com", transport=httpx.MockTransport(handler)
+    )
+    return service
+
+
+class TestParsePrUrl:
+
+    @pytest.mark.parametrize("url", [
+        "https://github.com/octo/repo/pull/42",
+        "  https://github.com/octo/repo/pull/42/\n",
+    ])
+    def test_valid_urls(self, url):
+        assert GitHubService(token="test").parse_pr_url(url) == ("octo", "repo", 42)
+
+    @pytest.mark.parametrize("url", [
+        "https://github.com/octo/repo/pull/42?foo=bar/evil",
+        "https://github.com/octo/repo/pull/42/files",
+        "https://github.com/octo/repo/issues/42",
+        "https://gitlab.com/octo/repo/pull/42",
+    ])
+    def test_anything_else_is_rejected(self, url):
+        with pytest.raises(ValueError, match="Invalid GitHub PR URL"):
+            GitHubService(token="test").parse_pr_url(url)
+
+
+class TestConditionalRequests:
+
+    @pytest.mark.asyncio
+    async def test_unchanged_pr_is_served_from_etag_cache(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if request.headers.get("If-None-Match"):
+                return httpx.Response(304)
+            body = FILES if request.url.path.endswith("/files") else PR
+            return httpx.Response(200, json=body, headers={"ETag": f'"{request.url.path}"'})
+
+        service = await make_service(handler)
+        first = await service.fetch_pr("o", "r", 1)
+        second = await service.fetch_pr("o", "r", 1)
+        await service.close()
+
+        assert second == first
+        assert second.title == "Fix login"
+        assert "+b" in second.raw_diff
+        assert [r.headers.get("If-None-Match") for r in requests[2:]] == [
+            '"/repos/o/r/pulls/1"', '"/repos/o/r/pulls/1/files"',
+        ]
+
+    @pytest.mark.asyncio
+    async def test_etag_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(github_service_module, "ETAG_CACHE_SIZE", 2)
+
+        def handler(request):
+            return httpx.Response(200, json=PR, headers={"ETag": f'"{request.url.path}"'})
+
+        service = await make_service(handler)
+        for path in ("/a", "/b", "/a", "/c"):
+            await service._get_json(path, "o/r#1")
+        await service.close()
+
+        assert list(service._etags) == ["/a", "/c"]
+
+    @pytest.mark.asyncio
+    async def test_files_are_requested_in_full_pages(self):
+        queries = {}
+
+        def handler(request):
+            queries[request.url.path] = dict(request.url.params)
+            body = FILES if request.url.path.endswith("/files") else PR
+            return httpx.Response(200, json=body)
+
+        service = await make_service(handler)
+        await service.fetch_pr("o", "r", 1)
+        await service.close()
+
+        assert queries["/repos/o/r/pulls/1/files"] == {"per_page": "100"}
+
+    @pytest.mark.asyncio
+    async def test_all_file_pages_are_fetched(self):
+        def handler(request):
+            if not request.url.path.endswith("/files"):
+                return httpx.Response(200, json=PR)
+            page = int(request.url.params.get("page", 1))
+            headers = {}
+            if page == 1:
+                headers["Link"] = (
+                    '<https://api.github.com/repos/o/r/pulls/1/files?per_page=100&page=2>; rel="next", '
+                    '<https://api.github.com/repos/o/r/pulls/1/files?per_page=100&page=3>; rel="last"'
+                )
+            files = [{"filename": f"p{page}_{i}.py", "status": "added"} for i in range(2)]
+            return httpx.Response(200, json=files, headers=headers)
+
+        service = await make_service(handler)
+        pr = await service.fetch_pr("o", "r", 1)
+        await service.close()
+
+        assert [f.filename for f in pr.files] == [
+            "p1_0.py", "p1_1.py", "p2_0.py", "p2_1.py", "p3_0.py", "p3_1.py",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_missing_pr_raises_value_error(self):
+        service = await make_service(lambda request: httpx.Response(404))
+
+        with pytest.raises(ValueError, match="o/r#1"):
+            await service.fetch_pr("o", "r", 1)
+        await service.close()
+
+
+class TestDiffAssembly:
+
+    @pytest.mark.asyncio
+    async def test_patches_are_joined_with_file_headers(self):
+        files = [
+            {"filename": "a.py", "status": "modified", "patch": "@@ -1 +1 @@\n-a\n+b"},
+            {"filename": "logo.png", "status": "added"},  # binary: no patch
+            {"filename": "c.py", "status": "added", "patch": "@@ -0,0 +1 @@\n+c"},
+        ]
+
+        def handler(request):
+            return httpx.Response(200, json=files if request.url.path.endswith("/files") else PR)
+
+        service = await make_service(handler)
+        pr = await service.fetch_pr("o", "r", 1)
+        await service.close()
+
+        assert len(pr.files) == 3
+        assert pr.raw_diff == (
+            "--- a/a.py\n+++ b/a.py\n@@ -1 +1 @@\n-a\n+b"
+            "\n\n"
+            "--- a/c.py\n+++ b/c.py\n@@ -0,0 +1 @@\n+c"
+        )
+
+
+class TestRateLimits:
+
+    @pytest.fixture(autouse=True)
+    def no_sleep(self, monkeypatch):
+        self.sleeps = []
+
+        async def fake_sleep(seconds):
+            self.sleeps.append(seconds)
+
+        monkeypatch.setattr(github_service_module.asyncio, "sleep", fake_sleep)
+
+    @pytest.mark.asyncio
+    async def test_retries_after_retry_after(self):
+        attempts = []
+
+        def handler(request):
+            attempts.append(request.url.path)
+            if len(attempts) == 1:
+                return httpx.Response(429, headers={"Retry-After": "2"})
+            return httpx.Response(200, json=PR)
+
+        service = await make_service(handler)
+        data = await service._get_json("/repos/o/r/pulls/1", "o/r#1")
+        await service.close()
+
+        assert data == PR
+        assert len(attempts) == 2
+        assert self.sleeps == [2.0]
+
+    @pytest.mark.asyncio
+    async def test_long_reset_fails_without_waiting(self):
+        reset = str(int(time.time()) + 3600)
+        service = await make_service(lambda request: httpx.Response(
+            403, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset},
+        ))
+
+        with pytest.raises(PermissionError):
+            await service.fetch_pr("o", "r", 1)
+        await service.close()
+
+        assert self.sleeps == []
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, monkeypatch):
+        monkeypatch.setattr(settings, "github_max_retries", 2)
+        attempts = []
+
+        def handler(request):
+            attempts.append(request)
+            return httpx.Response(429)
+
+        service = await make_service(handler)
+        with pytest.raises(PermissionError):
+            await service._get_json("/repos/o/r/pulls/1", "o/r#1")
+        await service.close()
+
+        assert len(attempts) == 3
+        assert len(self.sleeps) == 2
+
+    @pytest.mark.asyncio
+    async def test_forbidden_is_not_retried(self):
+        attempts = []
+
+        def handler(request):
+            attempts.append(request)
+            return httpx.Response(403, headers={"X-RateLimit-Remaining": "4999"})
+
+        service = await make_service(handler)
+        with pytest.raises(PermissionError):
+            await service._get_json("/repos/o/r/pulls/1", "o/r#1")
+        await service.close()
+
+        assert len(attempts) == 1
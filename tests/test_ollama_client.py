@@ -0,0 +1,231 @@
+"""
+Unit tests for the OllamaClient.
+
+The HTTP layer is replaced with httpx.MockTransport, so these run without
+Ollama while still exercising the real request/response handling.
+"""
+
+import json
+
+import httpx
+import pytest
+
+import backend.models.ollama_client as ollama_client_module
+from backend.config import settings
+from backend.models.ollama_client import PROGRESS_EVERY, FindingsStreamParser, OllamaClient
+from backend.models.schemas import FINDINGS_JSON_SCHEMA
+
+
+def make_client(handler) -> OllamaClient:
+    """OllamaClient whose HTTP calls go to `handler` instead of the network."""
+    return OllamaClient(http_client=httpx.AsyncClient(
+        base_url="http://ollama.test", transport=httpx.MockTransport(handler)
+    ))
+
+
+def ndjson_stream(text: str, chunk_size: int = 7) -> bytes:
+    """Simulate Ollama's streamed response: one JSON line per few characters."""
+    lines = [
+        json.dumps({"response": text[i:i + chunk_size], "done": False})
+        for i in range(0, len(text), chunk_size)
+    ]
+    lines.append(json.dumps({"response": "", "done": True, "eval_count": 42}))
+    return "\n".join(lines).encode()
+
+
+class TestFindingsStreamParser:
+    """Findings are extracted as soon as their closing brace arrives."""
+
+    def test_yields_items_incrementally(self):
+        parser = FindingsStreamParser()
+
+        assert parser.feed('{"findings": [{"title": "a"}, {"ti') == [{"title": "a"}]
+        assert parser.feed('tle": "b"}]}') == [{"title": "b"}]
+
+    def test_ignores_braces_inside_strings_and_nested_values(self):
+        parser = FindingsStreamParser()
+        text = json.dumps({"findings": [
+            {"title": 'uses "{" and "}"', "suggestion": ["x", {"y": 1}]},
+        ]})
+
+        items = [item for char in text for item in parser.feed(char)]
+
+        assert items == [{"title": 'uses "{" and "}"', "suggestion": ["x", {"y": 1}]}]
+
+
+class TestGenerateJsonStream:
+
+    @pytest.mark.asyncio
+    async def test_streams_findings(self):
+        body = json.dumps({"findings": [{"title": "one"}, {"title": "two"}]})
+
+        def handler(request):
+            assert json.loads(request.content)["stream"] is True
+            return httpx.Response(200, content=ndjson_stream(body))
+
+        client = make_client(handler)
+        items = [item async for item in client.generate_json_stream("m", "prompt")]
+        await client.close()
+
+        assert items == [{"title": "one"}, {"title": "two"}]
+
+    @pytest.mark.asyncio
+    async def test_progress_is_reported_every_n_tokens(self):
+        body = json.dumps({"findings": [{"title": "x" * 300}]})
+        client = make_client(lambda request: httpx.Response(200, content=ndjson_stream(body, chunk_size=1)))
+        reported = []
+
+        async def on_progress(tokens):
+            reported.append(tokens)
+
+        async for _ in client.generate_json_stream("m", "prompt", on_progress=on_progress):
+            pass
+        await client.close()
+
+        assert reported == list(range(PROGRESS_EVERY, len(body) + 1, PROGRESS_EVERY))
+
+    @pytest.mark.asyncio
+    async def test_invalid_json_raises_value_error(self):
+        client = make_client(lambda request: httpx.Response(200, content=ndjson_stream('{"findings": [')))
+
+        with pytest.raises(ValueError, match="invalid JSON"):
+            async for _ in client.generate_json_stream("m", "prompt"):
+                pass
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_missing_model_raises_value_error(self):
+        client = make_client(lambda request: httpx.Response(404))
+
+        with pytest.raises(ValueError, match="ollama pull m"):
+            async for _ in client.generate_json_stream("m", "prompt"):
+                pass
+        await client.close()
+
+
+class TestGenerateJson:
+
+    @pytest.mark.asyncio
+    async def test_parses_json_response(self):
+        def handler(request):
+            body = {"response": '{"findings": [{"title": "x"}]}', "eval_count": 5}
+            return httpx.Response(200, json=body)
+
+        client = make_client(handler)
+        result = await client.generate_json("m", "prompt")
+        await client.close()
+
+        assert result["data"] == {"findings": [{"title": "x"}]}
+        assert result["eval_count"] == 5
+
+    @pytest.mark.asyncio
+    async def test_invalid_json_raises_value_error(self):
+        client = make_client(lambda request: httpx.Response(200, json={"response": "not json"}))
+
+        with pytest.raises(ValueError, match="invalid JSON"):
+            await client.generate_json("m", "prompt")
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_truncated_response_keeps_complete_findings(self):
+        truncated = '{"findings": [{"title": "x"}, {"title": "cut o'
+        client = make_client(lambda request: httpx.Response(200, json={"response": truncated}))
+
+        result = await client.generate_json("m", "prompt")
+        await client.close()
+
+        assert result["data"] == {"findings": [{"title": "x"}]}
+
+    @pytest.mark.asyncio
+    async def test_options_are_merged_into_payload(self):
+        sent = []
+
+        def handler(request):
+            sent.append(json.loads(request.content))
+            return httpx.Response(200, json={"response": "{}"})
+
+        client = make_client(handler)
+        await client.generate_json("m", "prompt", options={"num_ctx": 2048})
+        await client.close()
+
+        assert sent[0]["options"]["num_ctx"] == 2048
+        assert sent[0]["options"]["temperature"] == 0.1
+        assert sent[0]["keep_alive"] == settings.ollama_keep_alive
+
+
+    @pytest.mark.asyncio
+    async def test_json_schema_is_sent_as_format(self):
+        sent = []
+
+        def handler(request):
+            sent.append(json.loads(request.content))
+            return httpx.Response(200, json={"response": '{"findings": []}'})
+
+        client = make_client(handler)
+        await client.generate_json("m", "prompt", json_schema=FINDINGS_JSON_SCHEMA)
+        await client.generate_json("m", "prompt")
+        await client.close()
+
+        assert sent[0]["format"] == FINDINGS_JSON_SCHEMA
+        assert sent[1]["format"] == "json"
+
+
+class TestSharedHttpClient:
+
+    @pytest.mark.asyncio
+    async def test_close_leaves_injected_client_open(self):
+        http = httpx.AsyncClient()
+        client = OllamaClient(http_client=http)
+
+        await client.close()
+
+        assert client.client is http
+        assert not http.is_closed
+        await http.aclose()
+
+
+class TestModelEndpoints:
+    """settings.model_endpoints routes a model to its own Ollama instance(s)."""
+
+    @pytest.mark.asyncio
+    async def test_routes_by_model_and_pins_by_system_prompt(self, monkeypatch):
+        monkeypatch.setattr(settings, "model_endpoints", {
+            "small": ["http://ollama-a:11435", "http://ollama-b:11436"],
+        })
+        hosts = []
+
+        def handler(request):
+            hosts.append(request.url.host)
+            return httpx.Response(200, json={"response": "{}"})
+
+        client = make_client(handler)
+        await client.generate("big", "p1")
+        for prompt in ("p1", "p2", "p3"):
+            await client.generate("small", prompt, system_prompt="security agent")
+        await client.close()
+
+        assert hosts[0] == "ollama.test"
+        assert len(set(hosts[1:])) == 1
+        assert hosts[1] in ("ollama-a", "ollama-b")
+
+
+class TestListModels:
+
+    @pytest.mark.asyncio
+    async def test_listing_is_reused_until_the_ttl_expires(self, monkeypatch):
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            return httpx.Response(200, json={"models": [{"name": "llama3.2:latest"}]})
+
+        client = make_client(handler)
+        assert await client.check_model_available("llama3.2")
+        assert not await client.check_model_available("qwen2.5-coder:7b")
+        assert calls == ["/api/tags"]
+
+        monkeypatch.setattr(ollama_client_module, "MODELS_CACHE_TTL", 0.0)
+        await client.list_models()
+        await client.close()
+
+        assert len(calls) == 2
@@ -0,0 +1,389 @@
+"""
+Unit tests for the PRReviewOrchestrator.
+
+These use the same MockOllamaClient as the agent tests, so they check the
+fan-out / aggregation logic without needing a running Ollama.
+"""
+
+import asyncio
+
+import pydantic
+import pytest
+
+from backend.agents.orchestrator import PRReviewOrchestrator
+from backend.config import settings
+from backend.models.schemas import (
+    AgentResult,
+    AgentType,
+    AnalysisResult,
+    AnalysisStatus,
+    Finding,
+    PRData,
+    Severity,
+    dedupe_findings,
+)
+from tests.test_agents import MockOllamaClient
+
+
+MOCK_RESPONSE = {
+    "findings": [
+        {"title": "Issue", "severity": "high", "description": "test"},
+    ]
+}
+
+
+class TestOrchestratorRun:
+    """Test both execution paths produce the same aggregated result."""
+
+    @pytest.mark.asyncio
+    async def test_run_without_triage_runs_all_agents(self):
+        orchestrator = PRReviewOrchestrator(ollama_client=MockOllamaClient(MOCK_RESPONSE))
+        result = await orchestrator.run("def f(): pass")
+
+        assert result.status == AnalysisStatus.COMPLETED
+        assert len(result.agent_results) == 5
+        # Every agent reports the same finding, so it is counted once
+        assert result.total_findings == 1
+        assert result.high_count == 1
+
+    @pytest.mark.asyncio
+    async def test_triage_runs_selected_agents_through_graph(self):
+        orchestrator = PRReviewOrchestrator(
+            ollama_client=MockOllamaClient(MOCK_RESPONSE),
+            triage=lambda diff: ["security", "standards"],
+        )
+        result = await orchestrator.run("def f(): pass")
+
+        agents = {ar.agent for ar in result.agent_results}
+        assert agents == {AgentType.SECURITY, AgentType.STANDARDS}
+        assert result.total_findings == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("triage", [None, lambda diff: ["security", "standards"]])
+    async def test_agent_that_raises_fails_alone(self, monkeypatch, triage):
+        orchestrator = PRReviewOrchestrator(ollama_client=MockOllamaClient(MOCK_RESPONSE), triage=triage)
+
+        async def broken(*args, **kwargs):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(type(orchestrator.agents["security"]), "analyze", broken)
+        result = await orchestrator.run("def f(): pass")
+
+        by_agent = {ar.agent: ar for ar in result.agent_results}
+        assert by_agent[AgentType.SECURITY].status == AnalysisStatus.FAILED
+        assert by_agent[AgentType.SECURITY].error == "boom"
+        assert by_agent[AgentType.STANDARDS].status == AnalysisStatus.COMPLETED
+        assert result.total_findings == 1
+
+
+class SlowClient(MockOllamaClient):
+    """Mock client that records how many requests are in flight at once."""
+
+    def __init__(self):
+        super().__init__(MOCK_RESPONSE)
+        self.active = self.peak = 0
+
+    async def generate_json(self, *args, **kwargs):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return await super().generate_json(*args, **kwargs)
+
+
+class TestConcurrencyLimit:
+    """At most settings.max_concurrent_agents agents call Ollama at once."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("triage", [None, lambda diff: ["security", "standards", "testing"]])
+    async def test_agents_are_bounded(self, monkeypatch, triage):
+        monkeypatch.setattr(settings, "max_concurrent_agents", 2)
+        client = SlowClient()
+        orchestrator = PRReviewOrchestrator(ollama_client=client, triage=triage)
+
+        result = await orchestrator.run("def f(): pass")
+
+        assert client.peak == 2
+        assert all(ar.status == AnalysisStatus.COMPLETED for ar in result.agent_results)
+
+    @pytest.mark.asyncio
+    async def test_limit_is_shared_across_runs(self, monkeypatch):
+        monkeypatch.setattr(settings, "max_concurrent_agents", 3)
+        client = SlowClient()
+        orchestrator = PRReviewOrchestrator(ollama_client=client)
+
+        await asyncio.gather(orchestrator.run("def f(): pass"), orchestrator.run("def g(): pass"))
+
+        assert client.peak == 3
+
+
+class HangingClient(MockOllamaClient):
+    """Mock client whose streams yield one finding, then never finish."""
+
+    def __init__(self):
+        super().__init__({"findings": [{"title": "Issue", "severity": "low", "description": "d"}]})
+        self.cancelled = 0
+
+    async def generate_json_stream(self, *args, **kwargs):
+        async for item in super().generate_json_stream(*args, **kwargs):
+            yield item
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+
+class TestStreaming:
+    """run(on_event=...) reports each step, and stops when reporting fails."""
+
+    @pytest.mark.asyncio
+    async def test_failing_callback_cancels_the_other_agents(self):
+        client = HangingClient()
+        orchestrator = PRReviewOrchestrator(ollama_client=client)
+        findings_sent = 0
+
+        async def on_event(event_type, agent, payload):
+            nonlocal findings_sent
+            if event_type == "agent_finding":
+                findings_sent += 1
+                if findings_sent == 2:  # the client went away
+                    raise ConnectionError("client disconnected")
+
+        with pytest.raises(ConnectionError):
+            await asyncio.wait_for(orchestrator.run("def f(): pass", on_event=on_event), timeout=5)
+
+        assert client.cancelled >= 1
+
+
+class TestEmptyDiff:
+    """Diffs with nothing to review never reach the LLM."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("diff_text", [
+        "",
+        "  \n\t\n",
+        "diff --git a/logo.png b/logo.png\nBinary files a/logo.png and b/logo.png differ\n",
+        "--- a/app.py\n+++ b/app.py\n@@ -1,2 +1,2 @@\n-   \n+\t\n",
+    ])
+    async def test_returns_empty_result_without_llm_calls(self, diff_text):
+        orchestrator = PRReviewOrchestrator(ollama_client=MockOllamaClient(should_fail=True))
+
+        result = await orchestrator.run(diff_text)
+
+        assert result.status == AnalysisStatus.COMPLETED
+        assert result.agent_results == []
+        assert result.total_findings == 0
+
+
+class TestDeduplication:
+    """The same issue reported by several agents is counted once."""
+
+    @staticmethod
+    def make_finding(agent, title="SQL Injection", confidence=0.8, line=10,
+                     severity=Severity.CRITICAL):
+        return Finding(
+            agent=agent, severity=severity, title=title,
+            description="test", file_path="app/db.py", line_number=line,
+            confidence=confidence,
+        )
+
+    def test_keeps_most_confident_duplicate(self):
+        findings = [
+            self.make_finding(AgentType.SECURITY, confidence=0.7),
+            self.make_finding(AgentType.STANDARDS, title="sql injection", confidence=0.9),
+            self.make_finding(AgentType.SECURITY, line=42),
+        ]
+
+        unique = dedupe_findings(findings)
+
+        assert len(unique) == 2
+        assert unique[0].agent == AgentType.STANDARDS
+        assert unique[1].line_number == 42
+
+    def test_keeps_most_severe_duplicate(self):
+        high = self.make_finding(AgentType.STANDARDS, title="  SQL injection ", confidence=0.9,
+                                 severity=Severity.HIGH)
+        findings = [high, self.make_finding(AgentType.SECURITY, confidence=0.5)]
+
+        unique = dedupe_findings(findings)
+
+        assert len(unique) == 1
+        assert unique[0].severity == Severity.CRITICAL
+
+    def test_titles_sharing_a_prefix_are_kept(self):
+        findings = [
+            self.make_finding(AgentType.STANDARDS, title=f"Missing type hints on parameter {name}",
+                              line=None, severity=Severity.LOW)
+            for name in ("user_id", "order_id")
+        ]
+
+        assert len(dedupe_findings(findings)) == 2
+
+    def test_distinct_spots_with_equal_hashes_are_kept(self):
+        # hash(-1) == hash(-2) in CPython: line numbers alone must not merge
+        findings = [self.make_finding(AgentType.SECURITY, line=-1),
+                    self.make_finding(AgentType.SECURITY, line=-2)]
+
+        assert len(dedupe_findings(findings)) == 2
+
+    def test_build_result_drops_cross_agent_duplicates(self):
+        orchestrator = PRReviewOrchestrator(ollama_client=MockOllamaClient())
+        security = AgentResult(agent=AgentType.SECURITY, status=AnalysisStatus.COMPLETED,
+                               findings=[self.make_finding(AgentType.SECURITY)])
+        standards = AgentResult(agent=AgentType.STANDARDS, status=AnalysisStatus.COMPLETED,
+                                findings=[self.make_finding(AgentType.STANDARDS, confidence=0.5),
+                                          self.make_finding(AgentType.STANDARDS, line=42)])
+
+        result = orchestrator._build_result([security, standards], "diff", None)
+
+        by_agent = {ar.agent: ar for ar in result.agent_results}
+        assert len(by_agent[AgentType.SECURITY].findings) == 1
+        assert [f.line_number for f in by_agent[AgentType.STANDARDS].findings] == [42]
+        assert result.agent_results[0] is security  # unchanged agents are not copied
+        assert result.total_findings == 2
+
+    def test_result_counts_are_derived_from_findings(self):
+        findings = [
+            self.make_finding(AgentType.SECURITY),
+            self.make_finding(AgentType.STANDARDS),  # duplicate
+            self.make_finding(AgentType.SECURITY, line=42),
+        ]
+        result = AnalysisResult(
+            id="x", pr_data=PRData(owner="o", repo="r", pr_number=1),
+            agent_results=[AgentResult(agent=f.agent, status=AnalysisStatus.COMPLETED, findings=[f])
+                           for f in findings],
+        )
+
+        assert result.total_findings == 2
+        assert result.model_dump()["critical_count"] == 2
+        with pytest.raises(pydantic.ValidationError):
+            result.status = AnalysisStatus.FAILED  # frozen
+
+    def test_copied_result_recounts_its_findings(self):
+        result = AnalysisResult(
+            id="x", pr_data=PRData(owner="o", repo="r", pr_number=1),
+            agent_results=[AgentResult(agent=AgentType.SECURITY, status=AnalysisStatus.COMPLETED,
+                                       findings=[self.make_finding(AgentType.SECURITY)])],
+        )
+        assert result.critical_count == 1
+
+        empty = result.model_copy(update={"agent_results": []})
+
+        assert empty.total_findings == 0
+        assert empty.model_dump()["critical_count"] == 0
+        assert result.critical_count == 1
+
+
+class TestModelBatching:
+    """Agents that share a model are submitted back to back."""
+
+    def test_groups_agents_by_model(self, monkeypatch):
+        orchestrator = PRReviewOrchestrator(ollama_client=MockOllamaClient())
+        # model is a class attribute (agents are slotted), so patch the classes
+        monkeypatch.setattr(type(orchestrator.agents["security"]), "model", "big")
+        monkeypatch.setattr(type(orchestrator.agents["performance"]), "model", "small")
+        monkeypatch.setattr(type(orchestrator.agents["testing"]), "model", "big")
+
+        agents = orchestrator._batch_by_model(["security", "performance", "testing"])
+
+        assert [a.model for a in agents] == ["big", "big", "small"]
+
+    def test_heaviest_model_goes_first(self):
+        orchestrator = PRReviewOrchestrator(ollama_client=MockOllamaClient())
+
+        agents = orchestrator._batch_by_model(["testing", "documentation", "security"])
+
+        assert agents[0].agent_type == AgentType.SECURITY
+        assert agents[0].cost_weight > agents[-1].cost_weight
+
+
+class RecordingClient(MockOllamaClient):
+    """Mock client that records plain generate() calls (used by warmup)."""
+
+    def __init__(self, failing_models=()):
+        super().__init__()
+        self.generated = []
+        self.failing_models = set(failing_models)
+
+    async def generate(self, model, prompt, system_prompt=None, temperature=0.1,
+                       format_json=False, options=None):
+        if model in self.failing_models:
+            raise ValueError(f"Model '{model}' not found")
+        self.generated.append((model, options))
+        return {"response": "", "elapsed_seconds": 0.0}
+
+
+class TestOrchestratorLifecycle:
+    """The orchestrator only closes clients it created itself."""
+
+    @pytest.mark.asyncio
+    async def test_warmup_loads_each_model_once(self):
+        client = RecordingClient()
+        orchestrator = PRReviewOrchestrator(ollama_client=client)
+
+        warmed = await orchestrator.warmup()
+
+        models = {agent.model for agent in orchestrator.agents.values()}
+        assert sorted(warmed) == sorted(models)
+        assert sorted(m for m, _ in client.generated) == sorted(models)
+        # Same num_ctx as real requests, so Ollama does not reload the model
+        assert all(options["num_predict"] == 1 and "num_ctx" in options
+                   for _, options in client.generated)
+
+    @pytest.mark.asyncio
+    async def test_warmup_failures_are_not_raised(self):
+        orchestrator = PRReviewOrchestrator(ollama_client=MockOllamaClient())
+        failing = orchestrator.agents["security"].model
+        orchestrator.client = RecordingClient(failing_models={failing})
+
+        warmed = await orchestrator.warmup()
+
+        assert failing not in warmed
+
+    @pytest.mark.asyncio
+    async def test_does_not_close_injected_client(self):
+        closed = []
+
+        class TrackingClient(MockOllamaClient):
+            def close(self):
+                closed.append(True)  # would fail if awaited
+
+        async with PRReviewOrchestrator(ollama_client=TrackingClient()):
+            pass
+
+        assert closed == []
+
+
+class TestTriage:
+    """The built-in pre-classifier picks agents from the diff headers."""
+
+    def setup_method(self):
+        self.orchestrator = PRReviewOrchestrator(ollama_client=MockOllamaClient())
+
+    @staticmethod
+    def make_diff(*paths: str, body: str = "+x = 1") -> str:
+        return "\n".join(f"--- a/{p}\n+++ b/{p}\n{body}" for p in paths)
+
+    def test_raw_code_runs_all_agents(self):
+        assert self.orchestrator._select_agents("def f(): pass") == list(self.orchestrator.agents)
+
+    def test_docs_only_diff(self):
+        selected = self.orchestrator._select_agents(self.make_diff("README.md", "docs/guide.rst"))
+        assert selected == ["documentation", "standards"]
+
+    def test_test_only_diff_skips_testing(self):
+        selected = self.orchestrator._select_agents(self.make_diff("tests/test_api.py"))
+        assert "testing" not in selected
+        assert "security" in selected
+
+    def test_sensitive_keywords_force_security(self):
+        diff = self.make_diff("README.md", body="+Set GITHUB_TOKEN before running")
+        assert self.orchestrator._select_agents(diff) == ["security", "documentation", "standards"]
+
+    @pytest.mark.asyncio
+    async def test_run_only_calls_selected_agents(self):
+        result = await self.orchestrator.run(self.make_diff("CHANGELOG.md"))
+
+        agents = {ar.agent for ar in result.agent_results}
+        assert agents == {AgentType.DOCUMENTATION, AgentType.STANDARDS}
@@ -0,0 +1,57 @@
+"""Unit tests for the in-memory result store."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+import backend.services.result_store as result_store_module
+from backend.models.schemas import AnalysisResult, PRData
+from backend.services.result_store import InMemoryResultStore
+
+PR = PRData(owner="o", repo="r", pr_number=1, title="t")
+START = datetime(2024, 1, 1)
+
+
+def make_result(n: int) -> AnalysisResult:
+    return AnalysisResult(
+        id=f"r{n}", pr_data=PR, agent_results=[], total_execution_time=0.0,
+        created_at=START + timedelta(seconds=n),
+    )
+
+
+class TestInMemoryResultStore:
+
+    @pytest.mark.asyncio
+    async def test_put_get_and_history(self):
+        store = InMemoryResultStore()
+        for n in range(3):
+            await store.put(make_result(n))
+
+        assert (await store.get("r1")).id == "r1"
+        assert await store.get("missing") is None
+        assert [r.id for r in await store.history(2)] == ["r2", "r1"]
+        assert await store.history(-1) == []
+
+    @pytest.mark.asyncio
+    async def test_oldest_results_are_dropped_past_max_size(self):
+        store = InMemoryResultStore(max_size=2)
+        for n in range(3):
+            await store.put(make_result(n))
+
+        assert len(store) == 2
+        assert await store.get("r0") is None
+        assert [r.id for r in await store.history(10)] == ["r2", "r1"]
+
+    @pytest.mark.asyncio
+    async def test_expired_results_are_gone(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(result_store_module.time, "monotonic", lambda: now[0])
+        store = InMemoryResultStore(ttl=60)
+        await store.put(make_result(0))
+        now[0] += 30
+        await store.put(make_result(1))
+
+        now[0] += 40  # r0 is 70s old, r1 40s
+        assert await store.get("r0") is None
+        assert [r.id for r in await store.history(10)] == ["r1"]
+        assert len(store) == 1
@@ -0,0 +1,109 @@
+"""
+Unit tests for the REST routes' JSON encoding.
+
+Results are stored directly in the shared AnalysisService, so no agent
+(and no Ollama) runs.
+"""
+
+import asyncio
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api.main import app
+from backend.api.routes import analysis_service, github_service
+from backend.config import settings
+from backend.models.schemas import (
+    AgentResult,
+    AgentType,
+    AnalysisResult,
+    AnalysisStatus,
+    Finding,
+    PRData,
+    Severity,
+)
+from backend.services.result_store import InMemoryResultStore
+
+
+@pytest.fixture
+def stored_result(monkeypatch):
+    finding = Finding(
+        agent=AgentType.SECURITY, severity=Severity.HIGH,
+        title="SQL Injection", description="test",
+    )
+    result = AnalysisResult(
+        id="abc12345",
+        pr_data=PRData(owner="o", repo="r", pr_number=1, title="t"),
+        agent_results=[AgentResult(
+            agent=AgentType.SECURITY, status=AnalysisStatus.COMPLETED,
+            findings=[finding], execution_time=1.5, model_used="m",
+        )],
+        total_execution_time=1.5,
+    )
+    store = InMemoryResultStore()
+    asyncio.run(store.put(result))
+    monkeypatch.setattr(analysis_service, "store", store)
+    return result
+
+
+class TestResultEncoding:
+
+    def test_analysis_matches_the_model_dump(self, stored_result):
+        response = TestClient(app).get(f"/api/analysis/{stored_result.id}")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == stored_result.model_dump(mode="json")
+        assert response.json()["high_count"] == 1
+
+    def test_history_wraps_the_results(self, stored_result):
+        body = TestClient(app).get("/api/history").json()
+
+        assert body["count"] == 1
+        assert body["results"] == [stored_result.model_dump(mode="json")]
+
+    def test_unknown_analysis_is_404(self, stored_result):
+        assert TestClient(app).get("/api/analysis/missing").status_code == 404
+
+
+class TestLifespan:
+
+    def test_startup_does_not_wait_for_warmup(self, monkeypatch):
+        warmup = {"started": False, "cancelled": False}
+
+        async def slow_warmup():
+            warmup["started"] = True
+            try:
+                await asyncio.sleep(3600)  # an Ollama that never answers
+            except asyncio.CancelledError:
+                warmup["cancelled"] = True
+                raise
+
+        async def noop():
+            pass
+
+        monkeypatch.setattr(settings, "warmup_on_startup", True)
+        monkeypatch.setattr(analysis_service, "warmup", slow_warmup)
+        monkeypatch.setattr(analysis_service, "aclose", noop)
+        monkeypatch.setattr(github_service, "close", noop)
+
+        with TestClient(app) as client:
+            assert client.get("/").status_code == 200
+            assert warmup["started"]
+
+        assert warmup["cancelled"]  # stopped on shutdown
+
+    def test_logging_lives_with_the_app(self, monkeypatch):
+        async def noop():
+            pass
+
+        monkeypatch.setattr(settings, "warmup_on_startup", False)
+        monkeypatch.setattr(analysis_service, "aclose", noop)
+        monkeypatch.setattr(github_service, "close", noop)
+        app_logger = logging.getLogger("prreview")
+
+        assert not app_logger.handlers  # importing the app configures nothing
+        with TestClient(app):
+            assert len(app_logger.handlers) == 1
+        assert not app_logger.handlers
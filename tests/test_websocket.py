@@ -0,0 +1,162 @@
+"""
+Unit tests for the /ws/analyze WebSocket endpoint.
+
+The orchestrator is swapped for one using MockOllamaClient, so the full
+event sequence can be checked without Ollama.
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.agents.orchestrator import PRReviewOrchestrator
+from backend.api.main import app
+from backend.api.routes import analysis_service
+from backend.api.websocket import ConnectionManager
+from tests.test_agents import MockOllamaClient
+
+
+MOCK_RESPONSE = {
+    "findings": [
+        {"title": "SQL Injection", "severity": "critical", "description": "test"},
+        {"title": "Magic number", "severity": "low", "description": "test"},
+    ]
+}
+
+
+@pytest.fixture
+def mock_orchestrator(monkeypatch):
+    """Swap the app's shared orchestrator for one around a mock client."""
+    orchestrator = PRReviewOrchestrator(ollama_client=MockOllamaClient(MOCK_RESPONSE))
+    monkeypatch.setattr(app.state, "orchestrator", orchestrator)
+    return orchestrator
+
+
+def run_session(payload: dict, mode: str = "text") -> list[dict]:
+    """Send one analysis request and collect every event until the end."""
+    events = []
+    with TestClient(app).websocket_connect("/ws/analyze") as ws:
+        ws.send_json(payload, mode=mode)
+        while True:
+            message = ws.receive_json()
+            events.extend(message if isinstance(message, list) else [message])
+            if events[-1]["event_type"] in ("analysis_completed", "error"):
+                return events
+
+
+class TestAnalyzeSession:
+
+    def test_findings_are_streamed_before_agent_completes(self, mock_orchestrator):
+        events = run_session({"diff_text": 'def f(uid): db.execute(f"SELECT * FROM u WHERE id={uid}")'})
+        security = [e["event_type"] for e in events if e["agent"] == "security"]
+
+        assert security == ["agent_started", "agent_finding", "agent_finding", "agent_completed"]
+        finding = next(e for e in events if e["event_type"] == "agent_finding")
+        assert finding["data"]["title"] == "SQL Injection"
+        assert events[-1]["event_type"] == "analysis_completed"
+
+    def test_final_counts_match_the_rest_aggregation(self, mock_orchestrator):
+        events = run_session({"diff_text": 'def f(uid): db.execute(f"SELECT * FROM u WHERE id={uid}")'})
+        result = events[-1]["data"]
+
+        # Every agent reports the same two findings; duplicates are merged
+        assert result["total_findings"] == 2
+        assert result["critical_count"] == 1
+        assert result["low_count"] == 1
+
+    def test_binary_frame_input_is_accepted(self, mock_orchestrator):
+        events = run_session({"diff_text": 'def f(uid): db.execute(f"SELECT * FROM u WHERE id={uid}")'}, mode="binary")
+
+        assert events[-1]["event_type"] == "analysis_completed"
+        assert events[-1]["data"]["total_findings"] == 2
+
+    def test_progress_is_reported_as_agents_finish(self, mock_orchestrator):
+        events = run_session({"diff_text": 'def f(uid): db.execute(f"SELECT * FROM u WHERE id={uid}")'})
+        progress = [e["data"] for e in events if e["event_type"] == "analysis_progress"]
+
+        assert progress
+        assert progress[-1]["completed"] == progress[-1]["total"] == 5
+        assert progress[-1]["findings"] == events[-1]["data"]["total_findings"]
+
+    def test_diff_without_changes_skips_the_agents(self, mock_orchestrator):
+        events = run_session({"diff_text": "--- a/app.py\n+++ b/app.py\n@@ -1 +1 @@\n-  \n+\t\n"})
+
+        assert [e["event_type"] for e in events] == ["analysis_completed"]
+        assert events[-1]["data"]["total_findings"] == 0
+        assert events[-1]["data"]["agent_results"] == []
+
+    def test_agents_are_triaged_like_rest(self, mock_orchestrator):
+        events = run_session({"diff_text": "--- a/README.md\n+++ b/README.md\n@@ -1 +1 @@\n+Install it\n"})
+
+        started = next(e for e in events if e["event_type"] == "analysis_started")
+        assert started["data"]["agents"] == ["documentation", "standards"]
+        assert {ar["agent"] for ar in events[-1]["data"]["agent_results"]} == {"documentation", "standards"}
+
+    def test_missing_input_is_an_error(self):
+        events = run_session({})
+
+        assert len(events) == 1
+        assert events[0]["event_type"] == "error"
+
+    def test_invalid_json_is_an_error(self):
+        with TestClient(app).websocket_connect("/ws/analyze") as ws:
+            ws.send_text("not json")
+            event = ws.receive_json()
+
+        assert event["event_type"] == "error"
+        assert event["message"] == "Invalid JSON input"
+
+    def test_sessions_share_the_rest_orchestrator(self):
+        # One cache and one max_concurrent_agents limit for the whole process
+        assert app.state.orchestrator is analysis_service.orchestrator
+
+    def test_agents_are_bounded_and_heaviest_first(self, mock_orchestrator, monkeypatch):
+        monkeypatch.setattr(mock_orchestrator, "_agent_slots", asyncio.Semaphore(1))
+
+        events = run_session({"diff_text": 'def f(uid): db.execute(f"SELECT * FROM u WHERE id={uid}")'})
+        lifecycle = [(e["event_type"], e["agent"]) for e in events
+                     if e["event_type"] in ("agent_started", "agent_completed")]
+
+        # One at a time: every agent completes before the next one starts
+        assert [t for t, _ in lifecycle] == ["agent_started", "agent_completed"] * 5
+        assert {lifecycle[0][1], lifecycle[2][1]} == {"security", "performance"}
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.frames = []
+
+    async def send_text(self, text):
+        self.frames.append(json.loads(text))
+
+
+class TestConnectionManager:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_events_share_one_frame(self):
+        manager = ConnectionManager()
+        ws = FakeWebSocket()
+        manager.active_connections["s"] = ws
+
+        await asyncio.gather(*(manager.send_event("s", {"n": n}) for n in range(3)))
+        await manager.send_event("s", {"n": 3})
+
+        assert ws.frames == [[{"n": 0}, {"n": 1}, {"n": 2}], {"n": 3}]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_burst_does_not_swallow_later_events(self):
+        manager = ConnectionManager()
+        ws = FakeWebSocket()
+        manager.active_connections["s"] = ws
+
+        sender = asyncio.create_task(manager.send_event("s", {"n": 0}))
+        await asyncio.sleep(0)  # the sender is now collecting its burst
+        sender.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await sender
+
+        await manager.send_event("s", {"event_type": "error"})
+
+        assert ws.frames == [{"event_type": "error"}]